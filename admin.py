@@ -1,63 +1,297 @@
-# accounts/admin.py
-from django.contrib import admin
-from .models import Konsultasi, Profile # Impor model Anda
-from django.contrib.auth.admin import UserAdmin
-from django.contrib.auth.models import User
-
-# Batalkan pendaftaran model User bawaan Django untuk sementara
-admin.site.unregister(User)
-
-# Daftarkan model Konsultasi
-@admin.register(Konsultasi)
-class KonsultasiAdmin(admin.ModelAdmin):
-    """
-    Konfigurasi untuk tampilan admin model Konsultasi.
-    """
-    list_display = ('nama', 'email', 'service_display', 'tanggal_janji', 'waktu_janji', 'status', 'user', 'tanggal_dibuat')
-    list_filter = ('status', 'tanggal_janji', 'user')
-    search_fields = ('nama', 'email', 'minat_karir', 'no_hp')
-    date_hierarchy = 'tanggal_dibuat' # Memungkinkan navigasi berdasarkan tanggal
-
-    def service_display(self, obj):
-        """
-        Mengekstrak dan menampilkan jenis layanan dari field minat_karir
-        untuk tampilan yang lebih rapi di admin.
-        """
-        if obj.minat_karir and "Jenis Layanan:" in obj.minat_karir:
-            return obj.minat_karir.split("Jenis Layanan:")[1].split("\n")[0].strip()
-        return obj.minat_karir if obj.minat_karir else "N/A"
-    service_display.short_description = "Jenis Layanan" # Nama kolom di admin
-
-# Definisikan inline admin untuk model Profile
-# Ini akan memungkinkan Anda mengedit profil pengguna langsung dari halaman admin User.
-class ProfileInline(admin.StackedInline):
-    model = Profile
-    can_delete = False # Tidak mengizinkan penghapusan profil tanpa menghapus pengguna
-    verbose_name_plural = 'Profile' # Nama yang ditampilkan di admin
-
-# Daftarkan ulang UserAdmin dengan inline Profile
-@admin.register(User)
-class CustomUserAdmin(UserAdmin):
-    """
-    Konfigurasi kustom untuk tampilan admin model User,
-    menambahkan field dari model Profile.
-    """
-    inlines = (ProfileInline,) # Menambahkan inline Profile ke admin User
-    list_display = ('username', 'email', 'first_name', 'last_name', 'is_staff', 'get_nomor_telepon', 'get_alamat')
-    list_filter = ('is_staff', 'is_superuser', 'is_active', 'groups')
-    search_fields = ('username', 'first_name', 'last_name', 'email')
-    ordering = ('username',)
-
-    # Metode untuk menampilkan field dari model Profile di list_display User
-    def get_nomor_telepon(self, obj):
-        return obj.profile.nomor_telepon
-    get_nomor_telepon.short_description = 'Nomor Telepon' # Nama kolom di admin
-
-    def get_alamat(self, obj):
-        return obj.profile.alamat
-    get_alamat.short_description = 'Alamat' # Nama kolom di admin
-
-    # Anda bisa menyesuaikan fieldsets jika ingin mengubah tata letak form admin User
-    fieldsets = UserAdmin.fieldsets + (
-        (('Informasi Profil Tambahan', {'fields': ('tanggal_lahir', 'jenis_kelamin')}),) # Contoh penambahan field dari Profile
-    )
+# accounts/admin.py
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import F, Q
+from django.http import QueryDict
+from django.utils.functional import cached_property
+from .models import Klien, Konsultasi, KonsultasiArsip, Profile, STATUS_CHOICES # Impor model Anda
+from .pencarian import cari_konsultasi
+from .ekspor import KOLOM_KLIEN, KOLOM_KONSULTASI, response_ekspor
+from .replika import pakai_replika
+from django.contrib.auth.admin import UserAdmin
+from django.contrib.auth.models import User
+
+# Batalkan pendaftaran model User bawaan Django untuk sementara
+admin.site.unregister(User)
+
+# Di atas jumlah ini, changelist tanpa filter memakai perkiraan jumlah baris
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator admin yang memakai perkiraan jumlah baris dari statistik database untuk tabel
+    besar tanpa filter, sehingga changelist tidak menjalankan COUNT(*) penuh di setiap halaman.
+    Tanpa statistik (misal SQLite yang belum pernah di-ANALYZE) COUNT(*) tetap dipakai.
+    """
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimate_row_count(self.object_list.model, self.object_list.db)
+            if estimate is not None and estimate > ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+def estimate_row_count(model, using='default'):
+    """
+    Perkiraan jumlah baris tabel dari statistik database, tanpa COUNT(*): reltuples di
+    PostgreSQL, TABLE_ROWS di MySQL, atau sqlite_stat1 di SQLite (hanya ada setelah ANALYZE).
+    Mengembalikan None jika statistik tidak tersedia; paginator lalu memakai COUNT(*) biasa.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+            rows = [row[0] for row in cursor.fetchall()]
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+                [table],
+            )
+            rows = [row[0] for row in cursor.fetchall()]
+        elif connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            # Angka pertama kolom stat adalah jumlah baris index (atau tabel jika idx NULL);
+            # index parsial lebih kecil, jadi diambil yang terbesar
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+            rows = [int(stat.split()[0]) for stat, in cursor.fetchall()]
+        else:
+            return None
+    estimate = max((row for row in rows if row is not None), default=0)
+    return estimate if estimate > 0 else None
+
+class ChangelistReplikaMixin:
+    """
+    Changelist (GET) dibaca dari replika jika dikonfigurasi, lihat replika.py. Halaman ubah
+    dan aksi (POST) tetap memakai primary.
+    """
+    def changelist_view(self, request, extra_context=None):
+        with pakai_replika(request):
+            response = super().changelist_view(request, extra_context)
+            # TemplateResponse dirender di sini agar query daftar juga berjalan di replika
+            if hasattr(response, 'render'):
+                response.render()
+        return response
+
+class StatusFilter(admin.SimpleListFilter):
+    """
+    Filter status dengan pilihan tetap, tanpa SELECT DISTINCT atas seluruh tabel.
+    """
+    title = 'status'
+    parameter_name = 'status'
+
+    def lookups(self, request, model_admin):
+        return STATUS_CHOICES
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(status=self.value())
+        return queryset
+
+class KonsultanFilter(admin.SimpleListFilter):
+    """
+    Filter konsultan berupa kotak isian username, bukan daftar semua pengguna di sidebar.
+    """
+    title = 'konsultan (username)'
+    parameter_name = 'konsultan'
+    template = 'accounts/admin_input_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(user__username=self.value())
+        return queryset
+
+    def choices(self, changelist):
+        # Parameter lain dipertahankan sebagai input tersembunyi di form filter
+        query_string = changelist.get_query_string(remove=[self.parameter_name, 'p'])
+        yield {
+            'value': self.value() or '',
+            'hidden_params': [
+                (key, value)
+                for key, values in QueryDict(query_string.lstrip('?')).lists()
+                for value in values
+            ],
+            'reset_query_string': query_string,
+        }
+
+# Daftarkan model Konsultasi
+@admin.register(Konsultasi)
+class KonsultasiAdmin(ChangelistReplikaMixin, admin.ModelAdmin):
+    """
+    Konfigurasi untuk tampilan admin model Konsultasi.
+    Changelist memakai jumlah query tetap: user di-join, filter tidak memuat daftar
+    pengguna, dan jumlah baris diperkirakan untuk tabel besar.
+    """
+    list_display = ('nama', 'email', 'service_display', 'tanggal_janji', 'waktu_janji', 'status', 'user', 'tanggal_dibuat')
+    list_select_related = ('user',)
+    # Filter tanggal bawaan hanya membuat rentang waktu tetap, tanpa query tambahan
+    list_filter = (StatusFilter, 'tanggal_janji', 'tanggal_dibuat', KonsultanFilter)
+    search_fields = ('nama', 'email', 'no_hp', 'minat_karir', 'jurusan') # Dicari lewat indeks full-text, lihat get_search_results
+    autocomplete_fields = ('user',) # Pilihan konsultan dicari lewat AJAX, bukan <select> berisi semua pengguna
+    readonly_fields = ('klien',) # Diisi otomatis dari konsultan dan email, lihat klien.py
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False # Hindari COUNT(*) kedua atas seluruh tabel saat memfilter
+    # Ekspor dialirkan langsung dari queryset; "pilih semua" mengekspor seluruh hasil filter
+    actions = ('export_csv', 'export_xlsx', 'export_klien_csv')
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Pencarian memakai indeks full-text (lihat pencarian.py), bukan LIKE '%...%'
+        atas setiap kolom di search_fields. Hasil diurutkan berdasarkan relevansi
+        kecuali admin memilih kolom urutan sendiri.
+        """
+        if not search_term.strip():
+            return queryset, False
+        return cari_konsultasi(queryset, search_term), False
+
+    def service_display(self, obj):
+        """
+        Menampilkan jenis layanan dari kolom jenis_layanan
+        untuk tampilan yang lebih rapi di admin.
+        """
+        return obj.jenis_layanan or "N/A"
+    service_display.short_description = "Jenis Layanan" # Nama kolom di admin
+    service_display.admin_order_field = 'jenis_layanan'
+
+    def export_csv(self, request, queryset):
+        return response_ekspor(queryset.order_by('pk'), KOLOM_KONSULTASI, 'konsultasi', 'csv')
+    export_csv.short_description = "Ekspor konsultasi terpilih (CSV)"
+
+    def export_xlsx(self, request, queryset):
+        return response_ekspor(queryset.order_by('pk'), KOLOM_KONSULTASI, 'konsultasi', 'xlsx')
+    export_xlsx.short_description = "Ekspor konsultasi terpilih (XLSX)"
+
+    def export_klien_csv(self, request, queryset):
+        """
+        Daftar klien tanpa duplikat: Klien dari konsultasi terpilih, satu baris per
+        (konsultan, email).
+        """
+        rows = Klien.objects.filter(pk__in=queryset.values('klien')).order_by('user_id', 'email')
+        return response_ekspor(rows, KOLOM_KLIEN, 'klien', 'csv')
+    export_klien_csv.short_description = "Ekspor daftar klien dari konsultasi terpilih (CSV)"
+
+# Daftarkan model Klien (hanya baca; dikelola otomatis dari Konsultasi)
+@admin.register(Klien)
+class KlienAdmin(ChangelistReplikaMixin, admin.ModelAdmin):
+    """
+    Tampilan admin model Klien. Semua field dihitung dari Konsultasi, jadi tidak bisa
+    ditambah atau diubah dari sini.
+    """
+    list_display = ('nama', 'email', 'user', 'jumlah_konsultasi', 'status_terakhir', 'kontak_pertama', 'kontak_terakhir')
+    list_select_related = ('user',)
+    list_filter = (KonsultanFilter, 'kontak_pertama', 'kontak_terakhir')
+    search_fields = ('email',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+# Daftarkan arsip konsultasi (hanya baca; diisi oleh perintah archive_konsultasi)
+@admin.register(KonsultasiArsip)
+class KonsultasiArsipAdmin(ChangelistReplikaMixin, admin.ModelAdmin):
+    """
+    Tampilan admin hanya-baca untuk konsultasi yang sudah diarsipkan.
+    Baris arsip tidak bisa ditambah, diubah, atau dihapus dari sini karena StatistikHarian
+    dan Klien ikut menghitungnya.
+    """
+    list_display = ('nama', 'email', 'jenis_layanan', 'tanggal_janji', 'status', 'user', 'tanggal_dibuat', 'tanggal_diarsipkan')
+    list_select_related = ('user',)
+    list_filter = (StatusFilter, 'tanggal_dibuat', 'tanggal_diarsipkan', KonsultanFilter)
+    # Tabel arsip besar: pencarian hanya lewat index, lihat get_search_results
+    search_fields = ('email',)
+    search_help_text = "Cari dengan alamat email lengkap atau ID konsultasi."
+    # Paginator biasa: arsip bertambah per batch besar, jadi jumlahnya selalu dihitung dengan COUNT(*)
+    show_full_result_count = False
+    actions = ('export_csv', 'export_xlsx')
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Email persis (index arsip_email) atau ID konsultasi (primary key), bukan LIKE '%...%'
+        atau iexact yang membaca seluruh tabel arsip. Email dicocokkan persis seperti diketik
+        dan dalam huruf kecil (bentuk yang disimpan oleh impor).
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        kondisi = Q(email__in={term, term.lower()})
+        if term.isdigit():
+            kondisi |= Q(pk=int(term))
+        return queryset.filter(kondisi), False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def export_csv(self, request, queryset):
+        return response_ekspor(queryset.order_by('pk'), KOLOM_KONSULTASI, 'arsip-konsultasi', 'csv')
+    export_csv.short_description = "Ekspor arsip terpilih (CSV)"
+
+    def export_xlsx(self, request, queryset):
+        return response_ekspor(queryset.order_by('pk'), KOLOM_KONSULTASI, 'arsip-konsultasi', 'xlsx')
+    export_xlsx.short_description = "Ekspor arsip terpilih (XLSX)"
+
+# Definisikan inline admin untuk model Profile
+# Ini akan memungkinkan Anda mengedit profil pengguna langsung dari halaman admin User.
+class ProfileInline(admin.StackedInline):
+    model = Profile
+    can_delete = False # Tidak mengizinkan penghapusan profil tanpa menghapus pengguna
+    verbose_name_plural = 'Profile' # Nama yang ditampilkan di admin
+
+# Daftarkan ulang UserAdmin dengan inline Profile
+@admin.register(User)
+class CustomUserAdmin(UserAdmin):
+    """
+    Konfigurasi kustom untuk tampilan admin model User,
+    menambahkan field dari model Profile.
+    """
+    inlines = (ProfileInline,) # Menambahkan inline Profile ke admin User
+    list_display = ('username', 'email', 'first_name', 'last_name', 'is_staff', 'get_nomor_telepon', 'get_alamat')
+    list_filter = ('is_staff', 'is_superuser', 'is_active', 'groups')
+    search_fields = ('username', 'first_name', 'last_name', 'email')
+    ordering = ('username',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        """
+        Field Profile diambil lewat LEFT JOIN dalam query yang sama,
+        bukan satu query per baris.
+        """
+        return super().get_queryset(request).annotate(
+            profile_nomor_telepon=F('profile__nomor_telepon'),
+            profile_alamat=F('profile__alamat'),
+        )
+
+    # Metode untuk menampilkan field dari model Profile di list_display User
+    def get_nomor_telepon(self, obj):
+        return obj.profile_nomor_telepon
+    get_nomor_telepon.short_description = 'Nomor Telepon' # Nama kolom di admin
+    get_nomor_telepon.admin_order_field = 'profile__nomor_telepon'
+
+    def get_alamat(self, obj):
+        return obj.profile_alamat
+    get_alamat.short_description = 'Alamat' # Nama kolom di admin
+    get_alamat.admin_order_field = 'profile__alamat'
+
+    # Tanggal lahir dan jenis kelamin ada di model Profile, jadi diedit lewat ProfileInline;
+    # fieldsets User hanya boleh berisi field milik User
+    fieldsets = UserAdmin.fieldsets
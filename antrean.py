@@ -0,0 +1,87 @@
+# accounts/antrean.py
+from django.db import connection, transaction
+
+from . import dashboard_cache
+from .ketersediaan import kunci_jadwal, saring_bentrok
+from .klien import tautkan_banyak
+from .models import Konsultasi
+from .statistik import perbarui_statistik_banyak
+
+# Batas jumlah konsultasi yang boleh diambil sekaligus lewat "ambil N berikutnya"
+MAKS_KLAIM_SEKALIGUS = 20
+
+
+def antrean_pending():
+    """
+    Konsultasi publik yang belum ditugaskan dan masih pending, urut dari yang terlama.
+    """
+    return Konsultasi.objects.filter(user__isnull=True, status='pending').order_by('tanggal_dibuat', 'pk')
+
+
+def klaim_konsultasi(user, pk):
+    """
+    Menugaskan satu konsultasi publik kepada `user` secara atomik.
+    UPDATE bersyarat hanya berhasil jika konsultasi masih belum ditugaskan dan pending,
+    sehingga dua konsultan tidak bisa mengambil konsultasi yang sama.
+    Mengembalikan objek Konsultasi yang berhasil diklaim, atau None (sudah diambil,
+    tidak lagi pending, atau bentrok dengan jadwal `user`).
+    """
+    klaim = klaim_banyak(user, [pk])
+    return klaim[0] if klaim else None
+
+
+def klaim_berikutnya(user, jumlah):
+    """
+    Mengambil sampai `jumlah` konsultasi terlama dari antrean pending untuk `user`.
+    Konsultasi yang keburu diambil konsultan lain dilewati, bukan ditimpa.
+    """
+    jumlah = max(0, min(jumlah, MAKS_KLAIM_SEKALIGUS))
+    if not jumlah:
+        return []
+
+    kandidat = antrean_pending()
+    if connection.features.has_select_for_update_skip_locked:
+        # Di backend server (misal PostgreSQL) lewati baris yang sedang dikunci transaksi lain
+        with transaction.atomic():
+            pks = list(kandidat.select_for_update(skip_locked=True).values_list('pk', flat=True)[:jumlah])
+            return klaim_banyak(user, pks)
+    pks = list(kandidat.values_list('pk', flat=True)[:jumlah])
+    return klaim_banyak(user, pks)
+
+
+def klaim_banyak(user, pks):
+    """
+    Menjalankan satu UPDATE bersyarat untuk semua `pks` lalu mengembalikan
+    konsultasi yang benar-benar berpindah ke `user` (diukur dari jumlah baris terdampak).
+    Konsultasi yang waktu janjinya bentrok dengan jadwal `user` dilewati.
+    """
+    if not pks:
+        return []
+
+    with transaction.atomic():
+        kunci_jadwal(user)
+        kandidat = Konsultasi.objects.filter(
+            pk__in=pks, user__isnull=True, status='pending'
+        ).order_by('tanggal_dibuat', 'pk').values('pk', 'tanggal_janji', 'waktu_janji')
+        pks, _ = saring_bentrok(user, kandidat)
+        if not pks:
+            return []
+
+        updated = Konsultasi.objects.filter(
+            pk__in=pks, user__isnull=True, status='pending'
+        ).update(user=user, status='terjadwal')
+        if not updated:
+            return []
+
+        # Baris kandidat yang kini milik user pasti diklaim oleh UPDATE di atas,
+        # karena sebelumnya belum ditugaskan kepada siapa pun
+        klaim = list(Konsultasi.objects.filter(pk__in=pks, user=user).order_by('tanggal_dibuat', 'pk'))
+        for konsultasi in klaim:
+            # Nilai sebelum UPDATE di atas: belum ditugaskan dan pending
+            konsultasi._nilai_awal = {**konsultasi._nilai_awal, 'user_id': None, 'status': 'pending'}
+
+        # QuerySet.update() tidak memicu sinyal, jadi klien, ringkasan dan cache diperbarui di sini
+        tautkan_banyak(klaim)
+        perbarui_statistik_banyak(klaim)
+        transaction.on_commit(lambda: dashboard_cache.invalidate(user.pk))
+    return klaim
@@ -0,0 +1,127 @@
+# accounts/api.py
+from functools import wraps
+
+from django.http import JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
+
+from . import dashboard_cache
+from .views import (
+    _appointments_context,
+    _compute_dashboard_summary,
+    _compute_reports,
+    _schedule_context,
+)
+
+
+def api_login_required(view_func):
+    """
+    Seperti login_required, tetapi mengembalikan 401 JSON alih-alih redirect ke halaman login.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': "Autentikasi diperlukan."}, status=401)
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def versi_etag(dataset):
+    """
+    Membuat etag_func untuk django.views.decorators.http.condition (lihat dashboard_cache.etag).
+    Permintaan dengan If-None-Match yang cocok langsung dijawab 304 tanpa menghitung data.
+    """
+    def etag_func(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return None
+        # Disimpan agar view tidak membaca versi data untuk kedua kalinya
+        request.versi_data = dashboard_cache.data_version(request.user.pk)
+        return dashboard_cache.etag(dataset, request.user.pk, request.GET, versi=request.versi_data)
+    return etag_func
+
+
+def api_view(dataset):
+    """
+    Dekorator gabungan untuk endpoint API baca-saja: GET saja, wajib login,
+    respons bersyarat dengan ETag, dan cache browser privat yang selalu divalidasi ulang.
+    """
+    def decorator(view_func):
+        view_func = condition(etag_func=versi_etag(dataset))(view_func)
+        view_func = cache_control(private=True, no_cache=True)(view_func)
+        view_func = api_login_required(view_func)
+        return require_GET(view_func)
+    return decorator
+
+
+def _janji(konsultasi):
+    return {
+        'pk': konsultasi.pk,
+        'nama': konsultasi.nama,
+        'tanggal_janji': konsultasi.tanggal_janji.isoformat() if konsultasi.tanggal_janji else None,
+        'waktu_janji': konsultasi.waktu_janji.strftime('%H:%M') if konsultasi.waktu_janji else None,
+        'status': konsultasi.status,
+    }
+
+
+def _halaman(page):
+    return {
+        'results': [_janji(konsultasi) for konsultasi in page],
+        'next_cursor': page.next_cursor,
+    }
+
+
+@api_view('dashboard')
+def dashboard_api(request):
+    """
+    Ringkasan dashboard konsultan (sama dengan halaman dashboard, lewat cache yang sama).
+    """
+    summary = dashboard_cache.get_dashboard_data(
+        request.user, lambda: _compute_dashboard_summary(request.user), versi=request.versi_data
+    )
+    return JsonResponse({
+        'client_count': summary['client_count'],
+        'today_appointments': summary['today_appointments'],
+        'new_consultations': summary['new_consultations'],
+        'upcoming_appointments': [_janji(konsultasi) for konsultasi in summary['upcoming_appointments']],
+    })
+
+
+@api_view('reports')
+def reports_api(request):
+    """
+    Angka laporan bulan ini dan data grafik distribusi status.
+    """
+    return JsonResponse(_compute_reports(request.user))
+
+
+@api_view('appointments')
+def appointments_api(request):
+    """
+    Satu halaman janji temu (parameter sama dengan halaman appointments: dari, sampai,
+    tanpa_tanggal, cursor).
+    """
+    context = _appointments_context(request)
+    return JsonResponse({
+        'dari': context['dari'].isoformat(),
+        'sampai': context['sampai'].isoformat(),
+        'tanpa_tanggal': context['tanpa_tanggal'],
+        **_halaman(context['page']),
+    })
+
+
+@api_view('schedule')
+def schedule_api(request):
+    """
+    Satu halaman janji terjadwal beserta slot kosong minggu ini
+    (parameter sama dengan halaman schedule: dari, sampai, cursor).
+    """
+    context = _schedule_context(request)
+    return JsonResponse({
+        'dari': context['dari'].isoformat(),
+        'sampai': context['sampai'].isoformat(),
+        **_halaman(context['page']),
+        'slot_kosong': [
+            {'tanggal': tanggal.isoformat(), 'slot': [mulai.strftime('%H:%M') for mulai in slot]}
+            for tanggal, slot in context['slot_kosong']
+        ],
+    })
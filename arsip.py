@@ -0,0 +1,76 @@
+# accounts/arsip.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from . import dashboard_cache
+from .models import STATUS_DITUTUP, Konsultasi, KonsultasiArsip
+from .pencarian import hapus_queryset_dari_indeks
+
+
+def kandidat_arsip(umur_hari=None, using='default'):
+    """
+    Konsultasi yang sudah ditutup (selesai/dibatalkan) dan dibuat lebih dari `umur_hari`
+    hari lalu (default: settings.ARSIP_UMUR_HARI), urut dari yang paling lama.
+    Disaring lagi per status, query ini membaca index konsultasi_status_dibuat sesuai urutannya.
+    """
+    if umur_hari is None:
+        umur_hari = settings.ARSIP_UMUR_HARI
+    batas = timezone.now() - timedelta(days=umur_hari)
+    return Konsultasi.objects.using(using).filter(
+        status__in=STATUS_DITUTUP, tanggal_dibuat__lt=batas,
+    ).order_by('tanggal_dibuat', 'pk')
+
+
+def arsipkan_batch(queryset, batch_size, using='default'):
+    """
+    Memindahkan paling banyak `batch_size` konsultasi pertama dari `queryset` ke tabel arsip
+    dalam satu transaksi: INSERT ... SELECT ke KonsultasiArsip (pk, klien_id, dan tanggal_dibuat
+    tetap sama), hapus dari indeks pencarian, lalu DELETE dari tabel Konsultasi.
+    Tanpa sinyal per baris: StatistikHarian dan Klien tidak perlu diubah karena keduanya
+    dihitung dari tabel aktif dan arsip sekaligus.
+    Mengembalikan jumlah konsultasi yang dipindahkan.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    kolom = ', '.join(qn(field.column) for field in Konsultasi._meta.concrete_fields)
+    with transaction.atomic(using=using):
+        baris = queryset.using(using)
+        if connection.features.has_select_for_update_skip_locked:
+            # Proses arsip lain yang berjalan bersamaan mengambil batch berikutnya
+            baris = baris.select_for_update(skip_locked=True)
+        rows = list(baris.values_list('pk', 'user_id')[:batch_size])
+        if not rows:
+            return 0
+        pks = [pk for pk, _ in rows]
+        placeholder = ', '.join(['%s'] * len(pks))
+        hapus_queryset_dari_indeks(Konsultasi.objects.using(using).filter(pk__in=pks))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {qn(KonsultasiArsip._meta.db_table)} ({kolom}, {qn("tanggal_diarsipkan")}) '
+                f'SELECT {kolom}, %s FROM {qn(Konsultasi._meta.db_table)} WHERE id IN ({placeholder})',
+                [connection.ops.adapt_datetimefield_value(timezone.now()), *pks],
+            )
+            cursor.execute(f'DELETE FROM {qn(Konsultasi._meta.db_table)} WHERE id IN ({placeholder})', pks)
+    dashboard_cache.invalidate(*{user_id for _, user_id in rows})
+    return len(rows)
+
+
+def arsipkan(umur_hari=None, batch_size=1000, setelah_batch=None, using='default'):
+    """
+    Memindahkan semua kandidat_arsip ke tabel arsip per status dan per batch_size baris;
+    setiap batch adalah transaksi tersendiri sehingga proses bisa dihentikan dan dilanjutkan
+    kapan saja.
+    `setelah_batch(jumlah_dipindahkan)` dipanggil setiap batch selesai.
+    Mengembalikan jumlah konsultasi yang dipindahkan.
+    """
+    total = 0
+    for status in STATUS_DITUTUP:
+        kandidat = kandidat_arsip(umur_hari, using).filter(status=status)
+        while dipindahkan := arsipkan_batch(kandidat, batch_size, using):
+            total += dipindahkan
+            if setelah_batch:
+                setelah_batch(total)
+    return total
@@ -0,0 +1,23 @@
+import os
+
+import django
+from django.core.handlers.asgi import ASGIHandler
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'konsultan_karir.settings')
+django.setup(set_prefix=False)
+
+
+class ASGIHandlerAsync(ASGIHandler):
+    """
+    Handler ASGI yang melayani URL lewat konsultan_karir.urls_asgi, sehingga dashboard,
+    reports, dan halaman publik dijalankan versi async-nya. Pilihan view ditentukan oleh
+    entrypoint ini, bukan oleh environment atau urutan impor.
+    """
+    urlconf = 'konsultan_karir.urls_asgi'
+
+    async def get_response_async(self, request):
+        request.urlconf = self.urlconf
+        return await super().get_response_async(request)
+
+
+application = ASGIHandlerAsync()
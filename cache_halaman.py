@@ -0,0 +1,80 @@
+# accounts/cache_halaman.py
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_cache_control, patch_response_headers, patch_vary_headers
+
+
+def get_cache():
+    return caches[getattr(settings, 'PUBLIC_PAGE_CACHE_ALIAS', 'default')]
+
+
+def cache_key(request):
+    """
+    Kunci cache satu halaman publik: host dan path lengkap (termasuk query string).
+    """
+    url = f'{request.get_host()}{request.get_full_path()}'
+    return f'halaman:{hashlib.md5(url.encode()).hexdigest()}'
+
+
+def cache_halaman_publik(view_func):
+    """
+    Meng-cache respons lengkap halaman publik untuk pengunjung anonim selama
+    PUBLIC_PAGE_CACHE_TIMEOUT detik (0 = nonaktif). Pengguna yang login selalu
+    dirender ulang karena navbar menampilkan nama mereka.
+    Semua respons diberi `Vary: Cookie` agar cache browser/proxy tidak menyajikan
+    versi anonim kepada pengguna yang login, atau sebaliknya.
+    Mendukung view async; cache hit dilayani tanpa thread sinkron.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            timeout = getattr(settings, 'PUBLIC_PAGE_CACHE_TIMEOUT', 0)
+            user = await request.auser()
+            if not timeout or request.method not in ('GET', 'HEAD') or user.is_authenticated:
+                return _tanpa_cache(await view_func(request, *args, **kwargs), user)
+
+            cache = get_cache()
+            key = cache_key(request)
+            response = await cache.aget(key)
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+                if _simpan_ke_cache(response, timeout):
+                    await cache.aset(key, response, timeout)
+            return response
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        timeout = getattr(settings, 'PUBLIC_PAGE_CACHE_TIMEOUT', 0)
+        if not timeout or request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+            return _tanpa_cache(view_func(request, *args, **kwargs), request.user)
+
+        cache = get_cache()
+        key = cache_key(request)
+        response = cache.get(key)
+        if response is None:
+            response = view_func(request, *args, **kwargs)
+            if _simpan_ke_cache(response, timeout):
+                cache.set(key, response, timeout)
+        return response
+    return wrapper
+
+
+def _tanpa_cache(response, user):
+    patch_vary_headers(response, ('Cookie',))
+    if user.is_authenticated:
+        patch_cache_control(response, private=True)
+    return response
+
+
+def _simpan_ke_cache(response, timeout):
+    """Menambahkan header cache dan mengembalikan True jika respons boleh disimpan di cache."""
+    patch_vary_headers(response, ('Cookie',))
+    if response.status_code == 200 and not response.streaming and not response.cookies:
+        patch_response_headers(response, timeout)
+        return True
+    return False
@@ -0,0 +1,144 @@
+# accounts/dashboard_cache.py
+import hashlib
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+from django.utils import timezone
+
+from .models import VersiData
+
+# Kunci counter hit/miss disimpan di backend cache yang sama agar terbagi antar proses
+HIT_KEY = 'dashboard:stats:hit'
+MISS_KEY = 'dashboard:stats:miss'
+
+
+def get_cache():
+    return caches[getattr(settings, 'DASHBOARD_CACHE_ALIAS', 'default')]
+
+
+def cache_key(user_id, versi, tanggal=None):
+    """
+    Kunci cache dashboard per user per versi data per hari; kunci lama otomatis tidak
+    terpakai saat data berubah (lihat invalidate) atau lewat tengah malam.
+    """
+    tanggal = tanggal or timezone.localdate()
+    return f'dashboard:{user_id}:{versi}:{tanggal.isoformat()}'
+
+
+def get_dashboard_data(user, compute, versi=None):
+    """
+    Mengambil data dashboard milik user dari cache, atau menghitungnya dengan
+    `compute()` lalu menyimpannya selama DASHBOARD_CACHE_TIMEOUT detik.
+    `versi` (hasil data_version) boleh diberikan agar versi tidak dibaca dua kali.
+    """
+    if versi is None:
+        versi = data_version(user.pk)
+    cache = get_cache()
+    key = cache_key(user.pk, versi)
+    data = cache.get(key)
+    if data is not None:
+        _incr(cache, HIT_KEY)
+        return data
+
+    _incr(cache, MISS_KEY)
+    data = compute()
+    cache.set(key, data, getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 300))
+    return data
+
+
+async def aget_dashboard_data(user, compute, versi=None):
+    """
+    Versi async get_dashboard_data untuk view async: `compute()` mengembalikan coroutine.
+    """
+    if versi is None:
+        versi = await adata_version(user.pk)
+    cache = get_cache()
+    key = cache_key(user.pk, versi)
+    data = await cache.aget(key)
+    if data is not None:
+        await sync_to_async(_incr)(cache, HIT_KEY)
+        return data
+
+    await sync_to_async(_incr)(cache, MISS_KEY)
+    data = await compute()
+    await cache.aset(key, data, getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 300))
+    return data
+
+
+def data_version(user_id):
+    """
+    Versi data milik user: angka yang naik setiap kali data konsultasinya berubah
+    (lihat invalidate). Dibaca dari tabel VersiData lewat primary key, sehingga semua
+    worker sepakat meskipun cache-nya per proses. User yang belum pernah berubah datanya
+    berada di versi 0.
+    Selalu dibaca dari primary, juga di dalam view @baca_dari_replika: versi dari replika
+    yang tertinggal menghasilkan ETag lama, sehingga klien terus polling dengan data lama.
+    """
+    versi = VersiData.objects.using(DEFAULT_DB_ALIAS).filter(user_id=user_id).values_list('versi', flat=True)
+    return versi[0] if versi else 0
+
+
+async def adata_version(user_id):
+    """Versi async data_version."""
+    versi = await VersiData.objects.using(DEFAULT_DB_ALIAS).filter(user_id=user_id).values_list('versi', flat=True).afirst()
+    return versi or 0
+
+
+def etag(dataset, user_id, params=None, versi=None):
+    """
+    ETag untuk satu dataset API milik user, dari versi data, tanggal hari ini (data harian
+    berganti lewat tengah malam), dan parameter query. Membutuhkan satu query primary key
+    untuk versi data, kecuali `versi` diberikan.
+    """
+    if versi is None:
+        versi = data_version(user_id)
+    bagian = [
+        dataset,
+        str(user_id),
+        str(versi),
+        timezone.localdate().isoformat(),
+        urlencode(sorted((params or {}).items())),
+    ]
+    return hashlib.sha1(':'.join(bagian).encode()).hexdigest()
+
+
+def invalidate(*user_ids):
+    """
+    Menaikkan versi data user yang diberikan. ETag API mereka berganti dan cache dashboard
+    versi lama tidak terpakai lagi di semua worker, lalu kedaluwarsa sendiri.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if user_ids:
+        VersiData.objects.bulk_create(
+            [VersiData(user_id=user_id) for user_id in user_ids], ignore_conflicts=True,
+        )
+        VersiData.objects.filter(user_id__in=user_ids).update(versi=F('versi') + 1)
+
+
+def cache_stats():
+    """
+    Mengembalikan jumlah hit, miss, dan rasio hit cache dashboard.
+    """
+    counts = get_cache().get_many([HIT_KEY, MISS_KEY])
+    hits = counts.get(HIT_KEY, 0)
+    misses = counts.get(MISS_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else None,
+    }
+
+
+def _incr(cache, key):
+    # add() lalu incr() agar counter aman dipakai bersama oleh banyak proses
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter sempat terhapus (eviction) di antara add() dan incr()
+        cache.set(key, 1, timeout=None)
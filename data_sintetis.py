@@ -0,0 +1,196 @@
+# accounts/data_sintetis.py
+import random
+from datetime import time, timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.utils import timezone
+
+from . import dashboard_cache
+from .klien import tautkan_banyak
+from .models import Klien, Konsultasi, KonsultasiArsip, Profile, StatistikHarian
+from .pencarian import hapus_queryset_dari_indeks, indeks_banyak
+from .periode import batas_hari
+from .statistik import hitung_ulang_sejak
+
+# Ukuran data siap pakai untuk --scale
+SKALA = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+
+# Penanda data sintetis: username konsultan dan domain email klien.
+# Semua data dengan penanda ini dihapus oleh hapus_data_sintetis().
+PREFIX_KONSULTAN = 'sintetis_'
+EMAIL_DOMAIN = 'sintetis.invalid'
+# Password semua konsultan sintetis (untuk mencoba halaman secara manual)
+PASSWORD_KONSULTAN = 'sintetis'
+
+# Bobot status konsultasi yang ditugaskan; sebagian kecil sisanya adalah antrean publik
+BOBOT_STATUS = {'pending': 30, 'terjadwal': 25, 'selesai': 37, 'dibatalkan': 8}
+PORSI_ANTREAN_PUBLIK = 0.05
+
+# Eksponen distribusi Zipf jumlah konsultasi per konsultan: konsultan pertama paling sibuk
+EKSPONEN_ZIPF = 1.1
+
+# Rentang tanggal_dibuat (hari ke belakang) dan rata-rata kunjungan per klien
+RENTANG_HARI = 730
+KUNJUNGAN_PER_KLIEN = 3
+
+NAMA_DEPAN = ['Andi', 'Budi', 'Citra', 'Dewi', 'Eka', 'Fajar', 'Gita', 'Hendra', 'Intan', 'Joko', 'Rina', 'Sari']
+NAMA_BELAKANG = ['Pratama', 'Wijaya', 'Kusuma', 'Saputra', 'Lestari', 'Santoso', 'Hidayat', 'Nugroho']
+JURUSAN = ['Informatika', 'Psikologi', 'Manajemen', 'Akuntansi', 'Hukum', 'Teknik Sipil', 'Desain Komunikasi Visual']
+LAYANAN = ['Konsultasi Cv Resume', 'Persiapan Wawancara', 'Pemetaan Karir', 'Pengembangan Diri', None]
+MINAT = ['data analyst', 'UI/UX designer', 'software engineer', 'HR generalist', 'auditor', 'content strategist']
+
+
+class GeneratorData:
+    """
+    Membuat konsultan (User + Profile) dan Konsultasi sintetis yang dapat direproduksi:
+    seed yang sama menghasilkan data yang sama (relatif terhadap tanggal hari ini).
+    Jumlah konsultasi per konsultan mengikuti distribusi Zipf, setiap klien rata-rata
+    datang KUNJUNGAN_PER_KLIEN kali, dan tanggal_dibuat condong ke waktu terbaru.
+    """
+    def __init__(self, jumlah, jumlah_konsultan=None, seed=42, batch_size=5000):
+        self.jumlah = jumlah
+        self.jumlah_konsultan = jumlah_konsultan or min(500, max(5, jumlah // 2000))
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        bobot = [1 / (i + 1) ** EKSPONEN_ZIPF for i in range(self.jumlah_konsultan)]
+        total = sum(bobot)
+        self.bobot_konsultan = [b / total for b in bobot]
+        # Bobot kumulatif dihitung sekali; random.choices(weights=...) menghitungnya ulang per panggilan
+        self._indeks_konsultan = range(self.jumlah_konsultan)
+        self._kumulatif_konsultan = list(accumulate(self.bobot_konsultan))
+        self._status = list(BOBOT_STATUS)
+        self._kumulatif_status = list(accumulate(BOBOT_STATUS.values()))
+
+    def buat_konsultan(self):
+        """
+        Membuat konsultan sintetis yang belum ada; mengembalikan list user_id
+        urut dari yang paling sibuk.
+        """
+        usernames = [nama_konsultan(i) for i in range(self.jumlah_konsultan)]
+        ada = dict(User.objects.filter(username__in=usernames).values_list('username', 'pk'))
+        # Hash password dihitung sekali saja; menghitungnya per user sangat lambat
+        password = make_password(PASSWORD_KONSULTAN)
+        with transaction.atomic():
+            User.objects.bulk_create([
+                User(username=username, email=f'{username}@{EMAIL_DOMAIN}', password=password)
+                for username in usernames if username not in ada
+            ])
+            ids = dict(User.objects.filter(username__in=usernames).values_list('username', 'pk'))
+            punya_profil = set(Profile.objects.filter(user_id__in=ids.values()).values_list('user_id', flat=True))
+            Profile.objects.bulk_create([
+                Profile(user_id=user_id) for user_id in ids.values() if user_id not in punya_profil
+            ])
+        return [ids[username] for username in usernames]
+
+    def buat_konsultasi(self, user_ids, setelah_batch=None):
+        """
+        Menulis self.jumlah Konsultasi dengan bulk_create per batch_size baris (beserta
+        indeks pencariannya), lalu membangun ulang StatistikHarian konsultan sintetis.
+        `setelah_batch(jumlah_ditulis)` dipanggil setiap batch selesai.
+        """
+        sekarang = timezone.now()
+        hari_ini = timezone.localdate()
+        ukuran_pool = [
+            max(1, int(self.jumlah * bobot / KUNJUNGAN_PER_KLIEN)) for bobot in self.bobot_konsultan
+        ]
+        ditulis = 0
+        while ditulis < self.jumlah:
+            objs = [
+                self._konsultasi(user_ids, ukuran_pool, sekarang, hari_ini)
+                for _ in range(min(self.batch_size, self.jumlah - ditulis))
+            ]
+            with transaction.atomic():
+                Konsultasi.objects.bulk_create(objs, batch_size=self.batch_size)
+                # bulk_create tidak memicu sinyal pre_save/post_save
+                indeks_banyak(objs)
+                tautkan_banyak(objs)
+            ditulis += len(objs)
+            if setelah_batch:
+                setelah_batch(ditulis)
+
+        awal = hari_ini - timedelta(days=RENTANG_HARI + 1)
+        for user_id in user_ids:
+            hitung_ulang_sejak(user_id, awal)
+        dashboard_cache.invalidate(*user_ids)
+        return ditulis
+
+    def _konsultasi(self, user_ids, ukuran_pool, sekarang, hari_ini):
+        r = self.random
+        # Hari dan detik dipilih terpisah dari tengah malam lokal hari ini, sehingga tanggal
+        # yang dihasilkan tidak bergantung pada jam saat generator dijalankan
+        hari_lalu = int(r.triangular(0, RENTANG_HARI, 0))
+        awal_hari, _ = batas_hari(hari_ini - timedelta(days=hari_lalu))
+        dibuat = min(awal_hari + timedelta(seconds=r.randrange(86400)), sekarang)
+
+        if r.random() < PORSI_ANTREAN_PUBLIK:
+            user_id, status = None, 'pending'
+            nomor_klien = r.randrange(self.jumlah)
+            email = f'publik{nomor_klien}@{EMAIL_DOMAIN}'
+        else:
+            i = r.choices(self._indeks_konsultan, cum_weights=self._kumulatif_konsultan)[0]
+            user_id = user_ids[i]
+            status = r.choices(self._status, cum_weights=self._kumulatif_status)[0]
+            nomor_klien = r.randrange(ukuran_pool[i])
+            email = f'klien{i}-{nomor_klien}@{EMAIL_DOMAIN}'
+
+        tanggal_janji = waktu_janji = None
+        if status == 'terjadwal':
+            tanggal_janji = hari_ini + timedelta(days=r.randint(-3, 60))
+        elif status in ('selesai', 'dibatalkan'):
+            tanggal_janji = hari_ini - timedelta(days=hari_lalu - r.randint(1, 14))
+        elif r.random() < 0.5:
+            tanggal_janji = hari_ini + timedelta(days=r.randint(1, 30))
+        if tanggal_janji:
+            waktu_janji = time(r.randint(9, 16), r.choice((0, 30)))
+
+        # Nama dan data diri ditentukan oleh nomor klien agar konsisten antar kunjungan
+        klien = random.Random(email)
+        obj = Konsultasi(
+            user_id=user_id,
+            nama=f'{klien.choice(NAMA_DEPAN)} {klien.choice(NAMA_BELAKANG)} {nomor_klien}',
+            email=email,
+            no_hp=f'0812{nomor_klien:08d}'[:20],
+            jurusan=klien.choice(JURUSAN),
+            jenis_layanan=r.choice(LAYANAN),
+            minat_karir=f'Tertarik menjadi {r.choice(MINAT)}',
+            tanggal_janji=tanggal_janji,
+            waktu_janji=waktu_janji,
+            status=status,
+            tanggal_dibuat=dibuat,
+        )
+        return obj
+
+
+def nama_konsultan(i):
+    """Username konsultan sintetis ke-i (0 = yang paling sibuk)."""
+    return f'{PREFIX_KONSULTAN}{i + 1:03d}'
+
+
+def hapus_data_sintetis(using='default'):
+    """
+    Menghapus semua data sintetis. Konsultasi (aktif dan arsip), Klien, dan baris indeks
+    pencariannya dihapus dengan DELETE SQL langsung, tanpa sinyal per baris.
+    Mengembalikan jumlah konsultasi yang dihapus.
+    """
+    connection = connections[using]
+    tabel = connection.ops.quote_name(Konsultasi._meta.db_table)
+    tabel_arsip = connection.ops.quote_name(KonsultasiArsip._meta.db_table)
+    tabel_klien = connection.ops.quote_name(Klien._meta.db_table)
+    user_ids = list(User.objects.using(using).filter(username__startswith=PREFIX_KONSULTAN).values_list('pk', flat=True))
+    with transaction.atomic(using=using):
+        hapus_queryset_dari_indeks(
+            Konsultasi.objects.using(using).filter(email__endswith=f'@{EMAIL_DOMAIN}')
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {tabel} WHERE email LIKE %s', [f'%@{EMAIL_DOMAIN}'])
+            jumlah = cursor.rowcount
+            cursor.execute(f'DELETE FROM {tabel_arsip} WHERE email LIKE %s', [f'%@{EMAIL_DOMAIN}'])
+            jumlah += cursor.rowcount
+            cursor.execute(f'DELETE FROM {tabel_klien} WHERE email LIKE %s', [f'%@{EMAIL_DOMAIN}'])
+        StatistikHarian.objects.using(using).filter(user_id__in=user_ids).delete()
+        User.objects.using(using).filter(pk__in=user_ids).delete()
+    dashboard_cache.invalidate(*user_ids)
+    return jumlah
@@ -0,0 +1,226 @@
+# accounts/ekspor.py
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime, time
+from itertools import chain
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+# Jumlah baris yang diambil per fetch dari database dan ditulis per potongan respons
+CHUNK_SIZE = 2000
+
+# (lookup kolom, judul kolom) untuk ekspor konsultasi
+KOLOM_KONSULTASI = [
+    ('pk', 'ID'),
+    ('nama', 'Nama'),
+    ('email', 'Email'),
+    ('no_hp', 'No HP'),
+    ('jurusan', 'Jurusan'),
+    ('jenis_layanan', 'Jenis Layanan'),
+    ('minat_karir', 'Minat Karir'),
+    ('tanggal_janji', 'Tanggal Janji'),
+    ('waktu_janji', 'Waktu Janji'),
+    ('status', 'Status'),
+    ('user__username', 'Konsultan'),
+    ('tanggal_dibuat', 'Tanggal Dibuat'),
+]
+
+# Daftar klien dari tabel Klien: satu baris per (konsultan, email), termasuk klien yang
+# konsultasinya sudah diarsipkan
+KOLOM_KLIEN = [
+    ('nama', 'Nama'),
+    ('email', 'Email'),
+    ('user__username', 'Konsultan'),
+    ('jumlah_konsultasi', 'Jumlah Konsultasi'),
+    ('kontak_pertama', 'Kontak Pertama'),
+    ('kontak_terakhir', 'Kontak Terakhir'),
+    ('status_terakhir', 'Status Terakhir'),
+]
+
+FORMAT_EKSPOR = ('csv', 'xlsx')
+
+# Awalan yang membuat spreadsheet menafsirkan isi sel CSV sebagai formula
+_AWALAN_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+# Karakter kontrol yang tidak boleh ada di XML
+_KARAKTER_ILEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def baris_ekspor(queryset, kolom):
+    """
+    Mengiterasi nilai kolom yang diproyeksikan saja (values_list), per CHUNK_SIZE baris,
+    tanpa membuat objek model dan tanpa memuat seluruh hasil ke memori.
+    `queryset` boleh berupa list beberapa queryset (misal konsultasi aktif lalu arsip),
+    yang dibaca berurutan.
+    """
+    lookups = [lookup for lookup, _ in kolom]
+    daftar = queryset if isinstance(queryset, (list, tuple)) else [queryset]
+    return chain.from_iterable(qs.values_list(*lookups).iterator(chunk_size=CHUNK_SIZE) for qs in daftar)
+
+
+def format_nilai(nilai):
+    """Nilai sel: kosong untuk None, tanggal/waktu dalam format ISO waktu lokal."""
+    if nilai is None:
+        return ''
+    if isinstance(nilai, datetime):
+        if timezone.is_aware(nilai):
+            nilai = timezone.localtime(nilai)
+        return nilai.strftime('%Y-%m-%d %H:%M')
+    if isinstance(nilai, time):
+        return nilai.strftime('%H:%M')
+    if isinstance(nilai, date):
+        return nilai.isoformat()
+    return nilai
+
+
+def stream_csv(judul, rows):
+    """
+    Menghasilkan potongan teks CSV: BOM UTF-8 (agar Excel membaca UTF-8), baris judul,
+    lalu data per CHUNK_SIZE baris.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(judul)
+    yield '\ufeff' + buffer.getvalue()
+
+    jumlah = 0
+    buffer.seek(0)
+    buffer.truncate()
+    for row in rows:
+        writer.writerow([_aman_csv(format_nilai(nilai)) for nilai in row])
+        jumlah += 1
+        if jumlah % CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _aman_csv(nilai):
+    # Cegah injeksi formula saat file CSV dibuka di spreadsheet
+    if isinstance(nilai, str) and nilai.startswith(_AWALAN_FORMULA):
+        return "'" + nilai
+    return nilai
+
+
+class _PenampungZip:
+    """
+    Objek file tulis-saja untuk zipfile. Tanpa seek/tell, zipfile menulis secara berurutan
+    (dengan data descriptor), sehingga byte yang sudah ditulis bisa langsung dikirim.
+    """
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def ambil(self):
+        data = bytes(self.data)
+        self.data.clear()
+        return data
+
+
+_XLSX_STATIS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Data" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def stream_xlsx(judul, rows):
+    """
+    Menghasilkan potongan byte file XLSX minimal (satu sheet, string inline) tanpa
+    dependensi tambahan. Sheet ditulis baris demi baris ke entri zip yang dikompresi,
+    jadi memori tetap konstan dan byte pertama terkirim sebelum query selesai.
+    """
+    penampung = _PenampungZip()
+    with zipfile.ZipFile(penampung, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for nama, isi in _XLSX_STATIS.items():
+            zf.writestr(nama, isi)
+        yield penampung.ambil()
+
+        with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_baris_xlsx(judul))
+            jumlah = 0
+            for row in rows:
+                sheet.write(_baris_xlsx(format_nilai(nilai) for nilai in row))
+                jumlah += 1
+                if jumlah % CHUNK_SIZE == 0:
+                    yield penampung.ambil()
+            sheet.write(b'</sheetData></worksheet>')
+    yield penampung.ambil()
+
+
+def _baris_xlsx(nilai_baris):
+    sel = []
+    for nilai in nilai_baris:
+        if isinstance(nilai, bool) or not isinstance(nilai, (int, float)):
+            teks = escape(_KARAKTER_ILEGAL_XML.sub('', str(nilai)))
+            sel.append(f'<c t="inlineStr"><is><t xml:space="preserve">{teks}</t></is></c>')
+        else:
+            sel.append(f'<c><v>{nilai}</v></c>')
+    return ('<row>' + ''.join(sel) + '</row>').encode('utf-8')
+
+
+def response_ekspor(queryset, kolom, nama_file, format_ekspor='csv'):
+    """
+    StreamingHttpResponse berisi ekspor `queryset` (atau list queryset, lihat baris_ekspor)
+    dengan `kolom` dalam format 'csv' atau 'xlsx'.
+    """
+    judul = [label for _, label in kolom]
+    rows = baris_ekspor(queryset, kolom)
+    stempel = timezone.localtime().strftime('%Y%m%d-%H%M')
+    if format_ekspor == 'xlsx':
+        response = StreamingHttpResponse(
+            stream_xlsx(judul, rows),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+    else:
+        format_ekspor = 'csv'
+        response = StreamingHttpResponse(stream_csv(judul, rows), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{nama_file}-{stempel}.{format_ekspor}"'
+    return response
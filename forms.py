@@ -1,7 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.models import User 
-from .models import Konsultasi, Profile 
+from .models import HARI_CHOICES, Konsultasi, Profile 
 
 class KonsultasiForm(forms.ModelForm):
     """
@@ -10,7 +10,7 @@ class KonsultasiForm(forms.ModelForm):
     """
     class Meta:
         model = Konsultasi
-        fields = ['nama', 'email', 'no_hp', 'jurusan', 'minat_karir', 'tanggal_janji', 'waktu_janji', 'status'] 
+        fields = ['nama', 'email', 'no_hp', 'jurusan', 'jenis_layanan', 'minat_karir', 'tanggal_janji', 'waktu_janji', 'status'] 
         widgets = {
             'tanggal_janji': forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}),
             'waktu_janji': forms.TimeInput(attrs={'type': 'time', 'class': 'form-control'}),
@@ -19,6 +19,7 @@ class KonsultasiForm(forms.ModelForm):
             'email': forms.EmailInput(attrs={'class': 'form-control', 'placeholder': 'Email Anda'}),
             'no_hp': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Nomor Telepon (opsional)'}),
             'jurusan': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Jurusan/Bidang Studi Anda'}),
+            'jenis_layanan': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Contoh: Konsultasi Cv Resume'}),
             'minat_karir': forms.Textarea(attrs={'class': 'form-control', 'rows': 4, 'placeholder': 'Jelaskan minat karir atau tujuan Anda'}),
         }
         labels = {
@@ -26,6 +27,7 @@ class KonsultasiForm(forms.ModelForm):
             'email': 'Alamat Email',
             'no_hp': 'Nomor Telepon',
             'jurusan': 'Jurusan/Bidang Studi',
+            'jenis_layanan': 'Jenis Layanan',
             'minat_karir': 'Minat Karir / Tujuan',
             'tanggal_janji': 'Tanggal Janji Temu',
             'waktu_janji': 'Waktu Janji Temu',
@@ -70,6 +72,7 @@ class ConsultationForm(forms.Form):
         widget=forms.TimeInput(attrs={'type': 'time', 'class': 'form-control'})
     )
     service_type = forms.CharField(
+        max_length=100,
         widget=forms.HiddenInput(),
         required=False
     )
@@ -81,17 +84,29 @@ class ConsultationForm(forms.Form):
 
 class ProfileForm(forms.ModelForm):
     """
-    Formulir ini digunakan untuk mengedit informasi profil tambahan pengguna.
+    Formulir ini digunakan untuk mengedit informasi profil tambahan pengguna,
+    termasuk jam kerja yang dipakai untuk menghitung slot janji temu.
     """
+    hari_kerja = forms.TypedMultipleChoiceField(
+        choices=HARI_CHOICES,
+        coerce=int,
+        widget=forms.CheckboxSelectMultiple,
+        label="Hari Kerja",
+    )
+
     class Meta:
         model = Profile
-        fields = ['alamat', 'nomor_telepon', 'bio', 'tanggal_lahir', 'jenis_kelamin']
+        fields = ['alamat', 'nomor_telepon', 'bio', 'tanggal_lahir', 'jenis_kelamin',
+                  'jam_mulai_kerja', 'jam_selesai_kerja', 'durasi_slot', 'hari_kerja']
         widgets = {
             'alamat': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Alamat Lengkap Anda'}),
             'nomor_telepon': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Nomor Telepon Anda'}),
             'bio': forms.Textarea(attrs={'class': 'form-control', 'rows': 3, 'placeholder': 'Tulis bio singkat tentang diri Anda'}),
             'tanggal_lahir': forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}),
             'jenis_kelamin': forms.Select(attrs={'class': 'form-control'}),
+            'jam_mulai_kerja': forms.TimeInput(attrs={'type': 'time', 'class': 'form-control'}, format='%H:%M'),
+            'jam_selesai_kerja': forms.TimeInput(attrs={'type': 'time', 'class': 'form-control'}, format='%H:%M'),
+            'durasi_slot': forms.NumberInput(attrs={'class': 'form-control', 'min': 15, 'max': 240, 'step': 5}),
         }
         labels = {
             'alamat': 'Alamat',
@@ -99,8 +114,33 @@ class ProfileForm(forms.ModelForm):
             'bio': 'Bio',
             'tanggal_lahir': 'Tanggal Lahir',
             'jenis_kelamin': 'Jenis Kelamin',
+            'jam_mulai_kerja': 'Jam Mulai Kerja',
+            'jam_selesai_kerja': 'Jam Selesai Kerja',
+            'durasi_slot': 'Durasi Slot (menit)',
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.initial['hari_kerja'] = self.instance.daftar_hari_kerja()
+
+    def clean_hari_kerja(self):
+        # Disimpan sebagai teks '0,1,2' di Profile.hari_kerja
+        return ','.join(str(hari) for hari in sorted(self.cleaned_data['hari_kerja']))
+
+    def clean_durasi_slot(self):
+        durasi = self.cleaned_data['durasi_slot']
+        if not 15 <= durasi <= 240:
+            raise forms.ValidationError("Durasi slot harus antara 15 dan 240 menit.")
+        return durasi
+
+    def clean(self):
+        cleaned_data = super().clean()
+        mulai = cleaned_data.get('jam_mulai_kerja')
+        selesai = cleaned_data.get('jam_selesai_kerja')
+        if mulai and selesai and selesai <= mulai:
+            self.add_error('jam_selesai_kerja', "Jam selesai kerja harus setelah jam mulai kerja.")
+        return cleaned_data
+
 class UserUpdateForm(forms.ModelForm):
     """
     Formulir ini digunakan untuk mengedit field dasar model User (misalnya nama depan, nama belakang, email).
@@ -0,0 +1,263 @@
+# accounts/impor_konsultasi.py
+import csv
+import json
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from django import forms
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+
+from . import dashboard_cache
+from .forms import KonsultasiForm
+from .klien import tautkan_banyak
+from .models import Konsultasi
+from .pencarian import indeks_banyak
+from .statistik import SUMBER, hitung_ulang_sejak
+
+# Kolom tambahan di luar KonsultasiForm: username konsultan (kosong = antrean publik)
+# dan waktu konsultasi dibuat (YYYY-MM-DD atau YYYY-MM-DD HH:MM[:SS], waktu lokal)
+KOLOM_TAMBAHAN = ('konsultan', 'tanggal_dibuat')
+
+# Satu konsultasi dianggap sudah ada jika kombinasi ini sama; karena itu impor
+# yang diulang (atau dilanjutkan setelah gagal) tidak membuat baris ganda
+KUNCI_DUPLIKAT = ('user_id', 'email', 'tanggal_janji', 'waktu_janji', 'jenis_layanan')
+
+
+def baca_csv(f):
+    """
+    Mengiterasi (nomor_baris, dict) dari file CSV dengan baris header.
+    """
+    reader = csv.DictReader(f)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def baca_jsonl(f):
+    """
+    Mengiterasi (nomor_baris, dict) dari file JSON Lines; baris JSON rusak menghasilkan None.
+    """
+    for nomor, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield nomor, row if isinstance(row, dict) else None
+
+
+def bersihkan_baris(row):
+    """
+    Menjalankan aturan field KonsultasiForm (wajib isi, panjang maksimal, format email,
+    tanggal, waktu) pada satu dict baris. Mengembalikan (cleaned_data, errors).
+    Field form dipakai langsung alih-alih membuat KonsultasiForm per baris, yang
+    menyalin (deepcopy) semua field dan widget setiap kali dibuat.
+    """
+    cleaned, errors = {}, {}
+    for name, field in KonsultasiForm.base_fields.items():
+        value = row.get(name)
+        # Format ISO diurai langsung; format lain tetap lewat input_formats field form
+        if isinstance(value, str) and isinstance(field, (forms.DateField, forms.TimeField)):
+            try:
+                value = (parse_date if isinstance(field, forms.DateField) else parse_time)(value.strip()) or value
+            except ValueError:
+                pass
+        try:
+            cleaned[name] = field.clean(value)
+        except ValidationError as e:
+            errors[name] = e.messages
+    return cleaned, errors
+
+
+class HasilImpor:
+    """
+    Penghitung hasil impor. Disimpan ke file checkpoint setelah setiap batch
+    sehingga impor bisa dilanjutkan dari baris terakhir yang sudah di-commit.
+    """
+    def __init__(self, baris=0, dibuat=0, duplikat=0, tidak_valid=0, sejak_per_user=None):
+        self.baris = baris
+        self.dibuat = dibuat
+        self.duplikat = duplikat
+        self.tidak_valid = tidak_valid
+        # {user_id: tanggal paling awal yang diimpor}, untuk menghitung ulang StatistikHarian
+        self.sejak_per_user = sejak_per_user or {}
+        # Jumlah baris dan durasi per tahap untuk sesi ini saja (tidak disimpan di checkpoint)
+        self.diproses = 0
+        self.detik = defaultdict(float)
+
+    @classmethod
+    def dari_checkpoint(cls, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        sejak = {int(user_id): parse_date(tanggal) for user_id, tanggal in data.pop('sejak_per_user').items()}
+        return cls(sejak_per_user=sejak, **data)
+
+    def simpan_checkpoint(self, path):
+        data = {
+            'baris': self.baris,
+            'dibuat': self.dibuat,
+            'duplikat': self.duplikat,
+            'tidak_valid': self.tidak_valid,
+            'sejak_per_user': {str(k): v.isoformat() for k, v in self.sejak_per_user.items()},
+        }
+        # Tulis ke file sementara lalu ganti, agar checkpoint tidak pernah setengah tertulis
+        sementara = f'{path}.tmp'
+        with open(sementara, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(sementara, path)
+
+
+class ImporKonsultasi:
+    """
+    Mengimpor konsultasi historis dari iterable (nomor_baris, dict).
+    Setiap baris divalidasi dengan aturan KonsultasiForm (bersihkan_baris), email
+    dinormalisasi (huruf kecil) agar satu klien tidak tercatat dengan beberapa variasi
+    email, baris yang sudah ada dilewati (lihat KUNCI_DUPLIKAT), lalu ditulis dengan
+    bulk_create per batch dalam satu transaksi.
+    """
+    def __init__(self, batch_size=1000, checkpoint_path=None, penolakan=None, hasil=None):
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path
+        # File teks (opsional) untuk mencatat baris yang ditolak sebagai JSON Lines
+        self.penolakan = penolakan
+        self.hasil = hasil or HasilImpor()
+        self._konsultan = {}
+
+    def jalankan(self, records, setelah_batch=None):
+        """
+        Memproses semua record; record dengan nomor baris <= hasil.baris (dari checkpoint)
+        dilewati. `setelah_batch(hasil)` dipanggil setiap kali satu batch di-commit.
+        """
+        mulai = time.perf_counter()
+        batch = []
+        nomor_terakhir = self.hasil.baris
+        for nomor, row in records:
+            if nomor <= self.hasil.baris:
+                continue
+            nomor_terakhir = nomor
+            self.hasil.diproses += 1
+            obj = self._validasi(nomor, row)
+            if obj is not None:
+                batch.append(obj)
+            if len(batch) >= self.batch_size:
+                self._tulis_batch(batch, nomor)
+                batch = []
+                if setelah_batch:
+                    setelah_batch(self.hasil)
+        self._tulis_batch(batch, nomor_terakhir)
+
+        waktu = time.perf_counter()
+        for user_id, sejak in sorted(self.hasil.sejak_per_user.items()):
+            hitung_ulang_sejak(user_id, sejak)
+        dashboard_cache.invalidate(*self.hasil.sejak_per_user)
+        self.hasil.detik['statistik'] += time.perf_counter() - waktu
+        self.hasil.detik['total'] = time.perf_counter() - mulai
+        return self.hasil
+
+    def _validasi(self, nomor, row):
+        waktu = time.perf_counter()
+        try:
+            if row is None:
+                return self._tolak(nomor, row, {'__all__': ["Baris bukan objek JSON yang valid."]})
+
+            cleaned, errors = bersihkan_baris(row)
+            user_id = self._user_id((row.get('konsultan') or '').strip(), errors)
+            tanggal_dibuat = self._tanggal_dibuat((row.get('tanggal_dibuat') or '').strip(), errors)
+            if errors:
+                return self._tolak(nomor, row, errors)
+
+            cleaned['email'] = cleaned['email'].lower()
+            # Tanpa tanggal_dibuat di file: waktu impor
+            return Konsultasi(user_id=user_id, tanggal_dibuat=tanggal_dibuat or timezone.now(), **cleaned)
+        finally:
+            self.hasil.detik['validasi'] += time.perf_counter() - waktu
+
+    def _user_id(self, username, errors):
+        if not username:
+            return None
+        if username not in self._konsultan:
+            self._konsultan[username] = User.objects.filter(username=username).values_list('pk', flat=True).first()
+        if self._konsultan[username] is None:
+            errors['konsultan'] = [f"Konsultan '{username}' tidak ditemukan."]
+        return self._konsultan[username]
+
+    def _tanggal_dibuat(self, teks, errors):
+        if not teks:
+            return None
+        try:
+            nilai = parse_datetime(teks)
+            if nilai is None:
+                tanggal = parse_date(teks)
+                nilai = datetime.combine(tanggal, datetime.min.time()) if tanggal else None
+        except ValueError:
+            nilai = None
+        if nilai is None:
+            errors['tanggal_dibuat'] = ["Format tanggal_dibuat tidak valid."]
+            return None
+        return timezone.make_aware(nilai) if timezone.is_naive(nilai) else nilai
+
+    def _tolak(self, nomor, row, errors):
+        self.hasil.tidak_valid += 1
+        if self.penolakan is not None:
+            self.penolakan.write(json.dumps(
+                {'baris': nomor, 'data': row, 'errors': {k: list(v) for k, v in errors.items()}},
+                ensure_ascii=False,
+            ) + '\n')
+        return None
+
+    def _tulis_batch(self, batch, nomor_terakhir):
+        waktu = time.perf_counter()
+        baru = self._saring_duplikat(batch)
+        if baru:
+            with transaction.atomic():
+                Konsultasi.objects.bulk_create(baru, batch_size=self.batch_size)
+                # bulk_create tidak memicu sinyal pre_save/post_save
+                indeks_banyak(baru)
+                tautkan_banyak(baru)
+            dashboard_cache.invalidate(*{obj.user_id for obj in baru})
+
+        for obj in baru:
+            if obj.user_id is not None:
+                tanggal = timezone.localdate(obj.tanggal_dibuat)
+                sejak = self.hasil.sejak_per_user.get(obj.user_id)
+                self.hasil.sejak_per_user[obj.user_id] = min(sejak, tanggal) if sejak else tanggal
+        self.hasil.dibuat += len(baru)
+        self.hasil.duplikat += len(batch) - len(baru)
+        self.hasil.baris = nomor_terakhir
+        if self.checkpoint_path:
+            self.hasil.simpan_checkpoint(self.checkpoint_path)
+        self.hasil.detik['tulis'] += time.perf_counter() - waktu
+
+    def _saring_duplikat(self, batch):
+        """
+        Membuang konsultasi yang sudah ada di database (aktif maupun arsip) atau muncul lebih
+        dulu di batch yang sama. Satu query per tabel per batch, memakai index (user, email, ...).
+        """
+        if not batch:
+            return []
+        email_per_user = defaultdict(set)
+        for obj in batch:
+            email_per_user[obj.user_id].add(obj.email)
+        kondisi = Q()
+        for user_id, emails in email_per_user.items():
+            kondisi |= Q(user_id=user_id, email__in=emails) if user_id else Q(user__isnull=True, email__in=emails)
+        # File yang diimpor ulang bisa berisi konsultasi yang sejak impor pertama sudah diarsipkan
+        sudah_ada = set()
+        for model in SUMBER:
+            sudah_ada.update(model.objects.filter(kondisi).values_list(*KUNCI_DUPLIKAT))
+
+        baru = []
+        for obj in batch:
+            kunci = tuple(getattr(obj, kolom) for kolom in KUNCI_DUPLIKAT)
+            if kunci in sudah_ada:
+                continue
+            sudah_ada.add(kunci)
+            baru.append(obj)
+        return baru
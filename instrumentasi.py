@@ -0,0 +1,253 @@
+# accounts/instrumentasi.py
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates, Template as DjangoTemplate
+
+logger = logging.getLogger('accounts.instrumentasi')
+
+# Pengukuran request yang sedang berjalan di thread/task ini (None di luar middleware)
+_pengukuran = ContextVar('pengukuran_request', default=None)
+
+_buffer_lock = threading.Lock()
+_buffer = None
+
+
+class AnggaranQueryTerlampaui(AssertionError):
+    """
+    Sebuah view menjalankan lebih banyak query daripada anggarannya di settings.QUERY_BUDGETS.
+    Turunan AssertionError agar test langsung gagal.
+    """
+
+
+class Pengukuran:
+    """Angka yang dikumpulkan selama satu request."""
+    __slots__ = ('query_count', 'query_detik', 'template_detik', '_kedalaman_template')
+
+    def __init__(self):
+        self.query_count = 0
+        self.query_detik = 0.0
+        self.template_detik = 0.0
+        self._kedalaman_template = 0
+
+
+def anggaran(nama_view):
+    """Batas jumlah query untuk view (nama URL, misal 'dashboard'), atau None jika tidak diatur."""
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(nama_view)
+
+
+def get_buffer():
+    """
+    Ring buffer berisi catatan request terakhir (paling banyak PERF_BUFFER_SIZE),
+    per proses; catatan lama otomatis terbuang.
+    """
+    global _buffer
+    ukuran = getattr(settings, 'PERF_BUFFER_SIZE', 500)
+    with _buffer_lock:
+        if _buffer is None or _buffer.maxlen != ukuran:
+            _buffer = deque(_buffer or (), maxlen=ukuran)
+        return _buffer
+
+
+def _catat_query(execute, sql, params, many, context):
+    pengukuran = _pengukuran.get()
+    if pengukuran is None:
+        return execute(sql, params, many, context)
+    mulai = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        pengukuran.query_count += 1
+        pengukuran.query_detik += time.perf_counter() - mulai
+
+
+def _pasang_pada_koneksi(sender, connection, **kwargs):
+    # Di posisi pertama agar pop() dari connection.execute_wrapper() lain tidak membuangnya
+    if _catat_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _catat_query)
+
+
+def pasang_pengukur_query():
+    """
+    Memasang pengukur query secara permanen pada setiap koneksi database, di thread mana pun:
+    koneksi yang sudah ada di thread ini sekarang, koneksi lain saat dibuka (connection_created).
+    Di luar request (_pengukuran kosong) pengukur langsung meneruskan query. Koneksi di thread
+    lain perlu ikut diukur karena di bawah ASGI query dijalankan di thread sinkron per request.
+    """
+    connection_created.connect(_pasang_pada_koneksi, dispatch_uid='instrumentasi_pengukur_query')
+    for connection in connections.all(initialized_only=True):
+        _pasang_pada_koneksi(None, connection)
+
+
+class TemplateTerukur(DjangoTemplate):
+    """Template backend Django yang menambahkan waktu render ke pengukuran request."""
+
+    def render(self, context=None, request=None):
+        # Hanya render paling luar yang dihitung; render bersarang (render_to_string di dalam
+        # template tag) sudah termasuk di dalamnya. Query selama render ikut terhitung di sini.
+        pengukuran = _pengukuran.get()
+        if pengukuran is None or pengukuran._kedalaman_template:
+            return super().render(context, request)
+        pengukuran._kedalaman_template += 1
+        mulai = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            pengukuran._kedalaman_template -= 1
+            pengukuran.template_detik += time.perf_counter() - mulai
+
+
+class DjangoTemplatesTerukur(DjangoTemplates):
+    """
+    Backend template DjangoTemplates yang waktu render-nya bisa diukur per request
+    (settings.TEMPLATES). Django hanya mengirim sinyal template_rendered saat test,
+    jadi dipakai subclass backend; di luar InstrumentasiMiddleware perilakunya sama persis.
+    """
+
+    def from_string(self, template_code):
+        return TemplateTerukur(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        # TemplateDoesNotExist dan debug info tetap ditangani oleh DjangoTemplates
+        return TemplateTerukur(super().get_template(template_name).template, self)
+
+
+class InstrumentasiMiddleware:
+    """
+    Mengukur setiap request per nama view: waktu total, jumlah dan durasi query database,
+    waktu render template, dan ukuran respons. Hasilnya ditulis ke ring buffer yang
+    ditampilkan di halaman performa untuk staf dan ke log 'accounts.instrumentasi' (satu
+    baris JSON per request di level DEBUG, agar tidak membanjiri output dev dan test).
+    View yang melebihi anggaran query di settings.QUERY_BUDGETS dicatat sebagai warning,
+    atau menggagalkan request jika settings.QUERY_BUDGET_STRICT aktif (misal saat test).
+    Letakkan paling atas di MIDDLEWARE agar query session dan autentikasi ikut terhitung.
+    Untuk respons streaming, waktu diukur sampai respons dikembalikan, bukan sampai
+    seluruh isi terkirim, dan ukurannya tidak diketahui. Waktu template hanya terukur jika
+    backend di settings.TEMPLATES adalah DjangoTemplatesTerukur.
+    Mendukung WSGI dan ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        pasang_pengukur_query()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        pengukuran = Pengukuran()
+        token = _pengukuran.set(pengukuran)
+        mulai = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _pengukuran.reset(token)
+        return self._catat(request, response, pengukuran, time.perf_counter() - mulai)
+
+    async def __acall__(self, request):
+        pengukuran = Pengukuran()
+        token = _pengukuran.set(pengukuran)
+        mulai = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _pengukuran.reset(token)
+        return self._catat(request, response, pengukuran, time.perf_counter() - mulai)
+
+    def _catat(self, request, response, pengukuran, durasi):
+        match = getattr(request, 'resolver_match', None)
+        catatan = {
+            'view': match.view_name if match else None,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'durasi_ms': round(durasi * 1000, 2),
+            'query': pengukuran.query_count,
+            'query_ms': round(pengukuran.query_detik * 1000, 2),
+            'template_ms': round(pengukuran.template_detik * 1000, 2),
+            'ukuran': None if response.streaming else len(response.content),
+        }
+        get_buffer().append(catatan)
+        logger.debug(json.dumps(catatan), extra={'performa': catatan})
+        self._cek_anggaran(catatan)
+        return response
+
+    def _cek_anggaran(self, catatan):
+        batas = anggaran(catatan['view'])
+        if batas is None or catatan['query'] <= batas:
+            return
+        pesan = f"View '{catatan['view']}' menjalankan {catatan['query']} query (anggaran {batas})."
+        if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise AnggaranQueryTerlampaui(pesan)
+        logger.warning(pesan, extra={'performa': catatan})
+
+
+def ringkasan():
+    """
+    Ringkasan isi ring buffer per view: jumlah request, rata-rata dan p95 waktu,
+    rata-rata/maksimum query, serta berapa kali anggaran query terlampaui.
+    Diurutkan dari total waktu terbesar.
+    """
+    with _buffer_lock:
+        catatan = list(_buffer or ())
+
+    per_view = {}
+    for c in catatan:
+        per_view.setdefault(c['view'] or '(tidak terpetakan)', []).append(c)
+
+    hasil = []
+    for nama, daftar in per_view.items():
+        durasi = sorted(c['durasi_ms'] for c in daftar)
+        ukuran = [c['ukuran'] for c in daftar if c['ukuran'] is not None]
+        batas = anggaran(nama)
+        hasil.append({
+            'view': nama,
+            'jumlah': len(daftar),
+            'durasi_rata_ms': round(sum(durasi) / len(durasi), 2),
+            'durasi_p95_ms': durasi[min(len(durasi) - 1, int(len(durasi) * 0.95))],
+            'query_rata': round(sum(c['query'] for c in daftar) / len(daftar), 1),
+            'query_maks': max(c['query'] for c in daftar),
+            'query_ms_rata': round(sum(c['query_ms'] for c in daftar) / len(daftar), 2),
+            'template_ms_rata': round(sum(c['template_ms'] for c in daftar) / len(daftar), 2),
+            'ukuran_rata': round(sum(ukuran) / len(ukuran)) if ukuran else None,
+            'anggaran': batas,
+            'melebihi_anggaran': sum(1 for c in daftar if batas is not None and c['query'] > batas),
+            'total_ms': round(sum(durasi), 2),
+        })
+    hasil.sort(key=lambda r: r['total_ms'], reverse=True)
+    return hasil
+
+
+@contextmanager
+def anggaran_query(nama_view, batas=None, using='default'):
+    """
+    Helper untuk test: gagal dengan AnggaranQueryTerlampaui jika blok di dalamnya
+    menjalankan lebih banyak query daripada anggaran view (atau `batas` jika diberikan).
+
+        with anggaran_query('dashboard'):
+            self.client.get(reverse('dashboard'))
+    """
+    # Hanya dipakai test; django.test tidak diimpor oleh kode produksi
+    from django.test.utils import CaptureQueriesContext
+
+    batas = anggaran(nama_view) if batas is None else batas
+    with CaptureQueriesContext(connections[using]) as queries:
+        yield queries
+    if batas is not None and len(queries) > batas:
+        daftar = '\n'.join(f"{i}. {q['sql']}" for i, q in enumerate(queries.captured_queries, 1))
+        raise AnggaranQueryTerlampaui(
+            f"View '{nama_view}' menjalankan {len(queries)} query (anggaran {batas}):\n{daftar}"
+        )
@@ -0,0 +1,187 @@
+# accounts/ketersediaan.py
+from bisect import bisect_right, insort
+from datetime import datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.utils import timezone
+
+from .models import Konsultasi, Profile
+
+# Status janji yang menempati slot di kalender konsultan
+STATUS_MENEMPATI_SLOT = 'terjadwal'
+
+# Batas panjang rentang pencarian slot kosong (hari)
+MAKS_HARI_SLOT = 31
+
+
+class JamKerja:
+    """
+    Jam kerja satu konsultan: hari kerja (0 = Senin), jam mulai/selesai, dan durasi satu slot.
+    Setiap janji terjadwal dianggap menempati satu slot mulai dari waktu_janji.
+    """
+    def __init__(self, jam_mulai, jam_selesai, durasi_menit, hari_kerja):
+        self.jam_mulai = jam_mulai
+        self.jam_selesai = jam_selesai
+        self.durasi = timedelta(minutes=durasi_menit)
+        self.hari_kerja = frozenset(hari_kerja)
+
+    @classmethod
+    def untuk(cls, user):
+        """
+        Jam kerja dari Profile user; tanpa Profile dipakai nilai default model
+        (tidak membuat baris Profile baru).
+        """
+        profile = Profile.objects.filter(user=user).only(
+            'jam_mulai_kerja', 'jam_selesai_kerja', 'durasi_slot', 'hari_kerja'
+        ).first() or Profile(user=user)
+        return cls(
+            profile.jam_mulai_kerja,
+            profile.jam_selesai_kerja,
+            profile.durasi_slot,
+            profile.daftar_hari_kerja(),
+        )
+
+    def slot_hari(self, tanggal):
+        """Waktu mulai semua slot pada satu tanggal (kosong jika bukan hari kerja)."""
+        if tanggal.weekday() not in self.hari_kerja:
+            return []
+        mulai = datetime.combine(tanggal, self.jam_mulai)
+        selesai = datetime.combine(tanggal, self.jam_selesai)
+        slot = []
+        while mulai + self.durasi <= selesai:
+            slot.append(mulai)
+            mulai += self.durasi
+        return slot
+
+
+class IndeksJadwal:
+    """
+    Index interval janji terjadwal. Karena semua janji memiliki durasi yang sama,
+    cukup menyimpan waktu mulai terurut; pengecekan bentrok memakai bisect, O(log n).
+    """
+    def __init__(self, daftar_mulai, durasi):
+        self.mulai = sorted(daftar_mulai)
+        self.durasi = durasi
+
+    def bentrok(self, mulai):
+        """
+        Mengembalikan waktu mulai janji yang tumpang tindih dengan slot [mulai, mulai + durasi),
+        atau None jika slot kosong.
+        """
+        i = bisect_right(self.mulai, mulai - self.durasi)
+        if i < len(self.mulai) and self.mulai[i] < mulai + self.durasi:
+            return self.mulai[i]
+        return None
+
+    def tambah(self, mulai):
+        insort(self.mulai, mulai)
+
+
+def _janji_terjadwal(user, tanggal, kecuali=()):
+    """
+    Waktu mulai (datetime naif) janji terjadwal milik user pada tanggal-tanggal yang diberikan
+    (iterable tanggal, atau tuple (dari, sampai) inklusif).
+    Memakai index (user, status, tanggal_janji, waktu_janji), sehingga biayanya sebanding dengan
+    jumlah janji di rentang tersebut, bukan dengan seluruh riwayat konsultan.
+    """
+    rows = Konsultasi.objects.filter(
+        user=user, status=STATUS_MENEMPATI_SLOT, waktu_janji__isnull=False
+    )
+    if isinstance(tanggal, tuple):
+        rows = rows.filter(tanggal_janji__gte=tanggal[0], tanggal_janji__lte=tanggal[1])
+    else:
+        rows = rows.filter(tanggal_janji__in=tanggal)
+    if kecuali:
+        rows = rows.exclude(pk__in=kecuali)
+    return [datetime.combine(t, w) for t, w in rows.values_list('tanggal_janji', 'waktu_janji')]
+
+
+def _hari_sekitar(daftar_tanggal):
+    # Slot bisa melewati tengah malam, jadi hari sebelum dan sesudahnya ikut diperiksa
+    return {t + timedelta(days=selisih) for t in daftar_tanggal for selisih in (-1, 0, 1)}
+
+
+def kunci_jadwal(user):
+    """
+    Mengunci kalender konsultan (baris User) sampai akhir transaksi, agar dua permintaan
+    bersamaan tidak sama-sama lolos pengecekan bentrok. Harus dipanggil di dalam
+    transaction.atomic(). Di SQLite, transaksi IMMEDIATE sudah menyerialkan penulisan.
+    """
+    if connection.features.has_select_for_update:
+        list(User.objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True))
+
+
+def cek_bentrok(user, tanggal, waktu, kecuali_pk=None, jam_kerja=None):
+    """
+    Mengembalikan waktu mulai janji terjadwal user yang bentrok dengan janji pada
+    tanggal/waktu tersebut, atau None. Janji tanpa tanggal atau waktu tidak pernah bentrok.
+    """
+    if tanggal is None or waktu is None:
+        return None
+    jam_kerja = jam_kerja or JamKerja.untuk(user)
+    kecuali = (kecuali_pk,) if kecuali_pk else ()
+    indeks = IndeksJadwal(_janji_terjadwal(user, _hari_sekitar([tanggal]), kecuali), jam_kerja.durasi)
+    return indeks.bentrok(datetime.combine(tanggal, waktu))
+
+
+def saring_bentrok(user, kandidat):
+    """
+    Memisahkan kandidat janji (dict dengan 'pk', 'tanggal_janji', 'waktu_janji') yang akan
+    dijadwalkan untuk user menjadi (pk_diterima, pk_bentrok). Kandidat dicek terhadap jadwal
+    yang ada dan terhadap kandidat lain yang sudah diterima lebih dulu (sesuai urutan).
+    """
+    kandidat = list(kandidat)
+    berjadwal = [k for k in kandidat if k['tanggal_janji'] is not None and k['waktu_janji'] is not None]
+    if not berjadwal:
+        return [k['pk'] for k in kandidat], []
+
+    jam_kerja = JamKerja.untuk(user)
+    indeks = IndeksJadwal(
+        _janji_terjadwal(
+            user,
+            _hari_sekitar({k['tanggal_janji'] for k in berjadwal}),
+            kecuali=[k['pk'] for k in kandidat],
+        ),
+        jam_kerja.durasi,
+    )
+
+    diterima, bentrok = [], []
+    for k in kandidat:
+        if k['tanggal_janji'] is None or k['waktu_janji'] is None:
+            diterima.append(k['pk'])
+            continue
+        mulai = datetime.combine(k['tanggal_janji'], k['waktu_janji'])
+        if indeks.bentrok(mulai) is not None:
+            bentrok.append(k['pk'])
+        else:
+            indeks.tambah(mulai)
+            diterima.append(k['pk'])
+    return diterima, bentrok
+
+
+def slot_kosong(user, dari, sampai, sekarang=None):
+    """
+    Slot kosong user dari tanggal `dari` sampai `sampai` (inklusif, paling banyak
+    MAKS_HARI_SLOT hari), dalam jam kerjanya dan setelah waktu sekarang.
+    Mengembalikan list of (tanggal, [datetime mulai slot, ...]) untuk setiap hari kerja.
+    """
+    sampai = min(sampai, dari + timedelta(days=MAKS_HARI_SLOT - 1))
+    sekarang = sekarang or timezone.localtime().replace(tzinfo=None)
+    jam_kerja = JamKerja.untuk(user)
+    indeks = IndeksJadwal(
+        _janji_terjadwal(user, (dari - timedelta(days=1), sampai + timedelta(days=1))),
+        jam_kerja.durasi,
+    )
+
+    hasil = []
+    tanggal = dari
+    while tanggal <= sampai:
+        slot = [
+            mulai for mulai in jam_kerja.slot_hari(tanggal)
+            if mulai >= sekarang and indeks.bentrok(mulai) is None
+        ]
+        if tanggal.weekday() in jam_kerja.hari_kerja:
+            hasil.append((tanggal, slot))
+        tanggal += timedelta(days=1)
+    return hasil
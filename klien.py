@@ -0,0 +1,198 @@
+# accounts/klien.py
+from collections import defaultdict
+from itertools import islice
+
+from django.db import connections
+from django.db.models import Case, Count, Exists, F, OuterRef, Q, Subquery, Value, When
+from django.utils import timezone
+
+from .models import Klien
+from .statistik import SUMBER
+
+# Jumlah id Klien per UPDATE hitung ulang, di bawah batas parameter SQLite
+UKURAN_POTONGAN = 500
+
+
+def normalisasi_email(email):
+    """
+    Kunci klien: email tanpa spasi di tepi dan dalam huruf kecil, sehingga variasi
+    penulisan email yang sama tetap dianggap satu klien.
+    """
+    return (email or '').strip().lower()
+
+
+def tautkan_konsultasi(konsultasi, using='default'):
+    """
+    Dipanggil sebelum Konsultasi disimpan (sinyal pre_save): mengisi konsultasi.klien
+    dengan Klien milik pasangan (user, email ternormalisasi), membuatnya lebih dulu jika
+    belum ada. Tanpa query jika user dan email tidak berubah sejak dimuat.
+    Klien yang baru dibuat berisi penghitung kosong (jumlah_konsultasi 0) sampai
+    catat_konsultasi_baru atau hitung_ulang_klien dijalankan setelah penyimpanan.
+    """
+    awal = getattr(konsultasi, '_nilai_awal', None) or {}
+    user_id, email = konsultasi.user_id, normalisasi_email(konsultasi.email)
+    if (konsultasi.klien_id is not None and awal.get('klien_id') == konsultasi.klien_id
+            and (awal.get('user_id'), normalisasi_email(awal.get('email'))) == (user_id, email)):
+        return
+    sekarang = timezone.now()
+    konsultasi.klien, _ = Klien.objects.using(using).get_or_create(
+        user_id=user_id,
+        email=email,
+        defaults={
+            'nama': konsultasi.nama,
+            'status_terakhir': konsultasi.status,
+            'kontak_pertama': sekarang,
+            'kontak_terakhir': sekarang,
+        },
+    )
+
+
+def catat_konsultasi_baru(konsultasi, using='default'):
+    """
+    Menambahkan satu Konsultasi yang baru dibuat ke penghitung Kliennya dengan satu UPDATE
+    (jumlah + 1, kontak pertama/terakhir, nama dan status terakhir), tanpa membaca
+    konsultasi lain milik klien tersebut.
+    """
+    dibuat = konsultasi.tanggal_dibuat
+    # jumlah_konsultasi 0: Klien baru saja dibuat oleh tautkan_konsultasi
+    kosong = Q(jumlah_konsultasi=0)
+    terbaru = kosong | Q(kontak_terakhir__lte=dibuat)
+    Klien.objects.using(using).filter(pk=konsultasi.klien_id).update(
+        jumlah_konsultasi=F('jumlah_konsultasi') + 1,
+        kontak_pertama=Case(
+            When(kosong | Q(kontak_pertama__gt=dibuat), then=Value(dibuat)), default=F('kontak_pertama')
+        ),
+        kontak_terakhir=Case(When(terbaru, then=Value(dibuat)), default=F('kontak_terakhir')),
+        nama=Case(When(terbaru, then=Value(konsultasi.nama)), default=F('nama')),
+        status_terakhir=Case(When(terbaru, then=Value(konsultasi.status)), default=F('status_terakhir')),
+    )
+
+
+def hitung_ulang_klien(klien_ids, using='default'):
+    """
+    Menghitung ulang penghitung Klien dari konsultasinya di tabel aktif maupun arsip, lalu
+    menghapus Klien yang tidak lagi memiliki konsultasi. Dipakai saat konsultasi diubah,
+    dipindahkan ke klien lain, atau dihapus, dan setelah penulisan massal yang tidak memicu sinyal.
+    Per UKURAN_POTONGAN klien: satu SELECT dengan subquery per tabel (index klien+tanggal_dibuat)
+    lalu satu UPDATE yang dieksekusi berulang (executemany).
+    """
+    klien_ids = sorted({pk for pk in klien_ids if pk is not None})
+    anotasi = {}
+    for i, model in enumerate(SUMBER):
+        baris = model.objects.filter(klien=OuterRef('pk')).order_by()
+        terbaru = baris.order_by('-tanggal_dibuat', '-pk')
+        anotasi.update({
+            f'jumlah_{i}': Subquery(baris.values('klien').annotate(n=Count('pk')).values('n')),
+            f'pertama_{i}': Subquery(baris.order_by('tanggal_dibuat', 'pk').values('tanggal_dibuat')[:1]),
+            f'terakhir_{i}': Subquery(terbaru.values('tanggal_dibuat')[:1]),
+            f'id_terakhir_{i}': Subquery(terbaru.values('pk')[:1]),
+            f'nama_{i}': Subquery(terbaru.values('nama')[:1]),
+            f'status_{i}': Subquery(terbaru.values('status')[:1]),
+        })
+
+    connection = connections[using]
+    adapt = connection.ops.adapt_datetimefield_value
+    for i in range(0, len(klien_ids), UKURAN_POTONGAN):
+        potongan = klien_ids[i:i + UKURAN_POTONGAN]
+        rows = []
+        kosong = []
+        for data in Klien.objects.using(using).filter(pk__in=potongan).annotate(**anotasi).values('pk', *anotasi):
+            ada = [j for j in range(len(SUMBER)) if data[f'jumlah_{j}']]
+            if not ada:
+                kosong.append(data['pk'])
+                continue
+            # Tabel yang memuat konsultasi terakhir klien (urutan tanggal_dibuat lalu id, sama
+            # seperti di dalam satu tabel) menentukan nama dan status terakhir
+            terakhir = max(ada, key=lambda j: (data[f'terakhir_{j}'], data[f'id_terakhir_{j}']))
+            rows.append([
+                sum(data[f'jumlah_{j}'] for j in ada),
+                adapt(min(data[f'pertama_{j}'] for j in ada)),
+                adapt(data[f'terakhir_{terakhir}']),
+                data[f'nama_{terakhir}'],
+                data[f'status_{terakhir}'],
+                data['pk'],
+            ])
+        if rows:
+            tabel = connection.ops.quote_name(Klien._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'UPDATE {tabel} SET jumlah_konsultasi = %s, kontak_pertama = %s, kontak_terakhir = %s, '
+                    f'nama = %s, status_terakhir = %s WHERE id = %s',
+                    rows,
+                )
+        if kosong:
+            Klien.objects.using(using).filter(pk__in=kosong).delete()
+
+
+def tautkan_banyak(daftar_konsultasi, using='default'):
+    """
+    Seperti tautkan_konsultasi lalu hitung_ulang_klien, tetapi untuk banyak Konsultasi (atau
+    KonsultasiArsip) yang sudah tersimpan tanpa sinyal (bulk_create, QuerySet.update()).
+    Klien yang belum ada dibuat dengan bulk_create, klien_id ditulis dengan satu UPDATE yang
+    dieksekusi berulang (executemany), lalu penghitung Klien lama dan baru dihitung ulang.
+    """
+    daftar = [konsultasi for konsultasi in daftar_konsultasi if konsultasi.pk is not None]
+    if not daftar:
+        return
+    kunci = {konsultasi.pk: (konsultasi.user_id, normalisasi_email(konsultasi.email)) for konsultasi in daftar}
+    klien = _klien_per_kunci(set(kunci.values()), using)
+    belum_ada = set(kunci.values()) - set(klien)
+    if belum_ada:
+        sekarang = timezone.now()
+        # ignore_conflicts: Klien yang sama mungkin baru dibuat oleh proses lain
+        Klien.objects.using(using).bulk_create([
+            Klien(user_id=user_id, email=email, nama='', kontak_pertama=sekarang, kontak_terakhir=sekarang)
+            for user_id, email in belum_ada
+        ], batch_size=UKURAN_POTONGAN, ignore_conflicts=True)
+        klien.update(_klien_per_kunci(belum_ada, using))
+
+    terdampak = set()
+    rows_per_tabel = defaultdict(list)
+    for konsultasi in daftar:
+        klien_id = klien[kunci[konsultasi.pk]]
+        terdampak.add(klien_id)
+        if konsultasi.klien_id != klien_id:
+            terdampak.add(konsultasi.klien_id)
+            konsultasi.klien_id = klien_id
+            rows_per_tabel[konsultasi._meta.db_table].append([klien_id, konsultasi.pk])
+    connection = connections[using]
+    for tabel, rows in rows_per_tabel.items():
+        with connection.cursor() as cursor:
+            cursor.executemany(f'UPDATE {connection.ops.quote_name(tabel)} SET klien_id = %s WHERE id = %s', rows)
+    hitung_ulang_klien(terdampak, using)
+
+
+def _klien_per_kunci(kunci, using):
+    """Mengembalikan {(user_id, email): pk Klien} untuk kunci yang sudah ada."""
+    email_per_user = defaultdict(set)
+    for user_id, email in kunci:
+        email_per_user[user_id].add(email)
+    kondisi = Q()
+    for user_id, emails in email_per_user.items():
+        kondisi |= Q(user_id=user_id, email__in=emails) if user_id else Q(user__isnull=True, email__in=emails)
+    rows = Klien.objects.using(using).filter(kondisi).values_list('user_id', 'email', 'pk')
+    return {(user_id, email): pk for user_id, email, pk in rows}
+
+
+def bangun_ulang_klien(user_id=None, batch_size=5000, using='default'):
+    """
+    Menautkan ulang semua konsultasi aktif dan arsip (atau milik satu user) ke Klien-nya dan
+    menghitung ulang penghitungnya per batch, lalu menghapus Klien yang tidak memiliki konsultasi.
+    Untuk perbaikan jika data Klien tidak sinkron. Mengembalikan jumlah konsultasi diproses.
+    """
+    klien = Klien.objects.using(using)
+    if user_id is not None:
+        klien = klien.filter(user_id=user_id)
+
+    total = 0
+    for model in SUMBER:
+        konsultasi = model.objects.using(using).only('pk', 'user_id', 'email', 'klien_id').order_by('pk')
+        if user_id is not None:
+            konsultasi = konsultasi.filter(user_id=user_id)
+        baris = konsultasi.iterator(chunk_size=batch_size)
+        while batch := list(islice(baris, batch_size)):
+            tautkan_banyak(batch, using)
+            total += len(batch)
+        klien = klien.exclude(Exists(model.objects.filter(klien=OuterRef('pk'))))
+    klien.delete()
+    return total
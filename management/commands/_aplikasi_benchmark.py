@@ -0,0 +1,37 @@
+# accounts/management/commands/_aplikasi_benchmark.py
+# Aplikasi WSGI/ASGI untuk server uvicorn yang dijalankan `benchmark_asgi` (uvicorn --factory).
+# Jika BENCHMARK_LATENSI_QUERY_MS diisi, setiap query database ditunda sekian milidetik untuk
+# meniru round trip ke server database di jaringan: SQLite lokal hampir tanpa latensi, sehingga
+# perbedaan cara kedua deployment menunggu database tidak terlihat.
+# Modul berawalan garis bawah tidak dianggap management command oleh Django.
+import os
+import time
+
+from django.db.backends.signals import connection_created
+
+
+def _tunda(execute, sql, params, many, context):
+    time.sleep(int(os.environ['BENCHMARK_LATENSI_QUERY_MS']) / 1000)
+    return execute(sql, params, many, context)
+
+
+def _pasang_tunda(sender, connection, **kwargs):
+    # Objek koneksi per thread dipakai ulang setiap kali koneksi dibuka kembali
+    if _tunda not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_tunda)
+
+
+def _siapkan(application):
+    if os.environ.get('BENCHMARK_LATENSI_QUERY_MS'):
+        connection_created.connect(_pasang_tunda, dispatch_uid='benchmark_latensi_query')
+    return application
+
+
+def wsgi():
+    from konsultan_karir.wsgi import application
+    return _siapkan(application)
+
+
+def asgi():
+    from konsultan_karir.asgi import application
+    return _siapkan(application)
@@ -0,0 +1,45 @@
+# accounts/management/commands/archive_konsultasi.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.arsip import arsipkan, kandidat_arsip
+
+
+class Command(BaseCommand):
+    help = (
+        "Memindahkan konsultasi yang sudah ditutup (selesai/dibatalkan) dan lebih tua dari "
+        "--older-than hari ke tabel arsip per batch. Laporan dan ekspor tetap mencakup data arsip. "
+        "Aman dihentikan dan dijalankan ulang; setiap batch adalah transaksi tersendiri."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, dest='umur_hari', default=settings.ARSIP_UMUR_HARI,
+            help=f"Umur minimal konsultasi dalam hari (default: ARSIP_UMUR_HARI = {settings.ARSIP_UMUR_HARI}).",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Jumlah konsultasi per batch (default: 1000).",
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Hanya tampilkan jumlah konsultasi yang akan diarsipkan.",
+        )
+
+    def handle(self, *args, **options):
+        if options['umur_hari'] < 0:
+            raise CommandError("--older-than tidak boleh negatif.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size harus lebih dari 0.")
+
+        if options['dry_run']:
+            jumlah = kandidat_arsip(options['umur_hari']).count()
+            self.stdout.write(f"{jumlah} konsultasi akan diarsipkan.")
+            return
+
+        def setelah_batch(total):
+            if options['verbosity'] >= 2:
+                self.stdout.write(f"{total} konsultasi diarsipkan...")
+
+        total = arsipkan(options['umur_hari'], options['batch_size'], setelah_batch)
+        self.stdout.write(self.style.SUCCESS(f"Selesai: {total} konsultasi dipindahkan ke arsip."))
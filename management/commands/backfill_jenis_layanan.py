@@ -0,0 +1,49 @@
+# accounts/management/commands/backfill_jenis_layanan.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import Konsultasi, parse_jenis_layanan
+
+
+class Command(BaseCommand):
+    help = (
+        "Mengisi kolom jenis_layanan untuk konsultasi lama dengan mem-parsing "
+        "minat_karir, diproses per batch berdasarkan primary key."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Jumlah baris yang dibaca dan diperbarui per batch (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        candidates = Konsultasi.objects.filter(
+            jenis_layanan__isnull=True,
+            minat_karir__contains="Jenis Layanan:",
+        ).order_by('pk').only('pk', 'minat_karir')
+
+        last_pk = 0
+        scanned = updated = 0
+        while True:
+            batch = list(candidates.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            scanned += len(batch)
+
+            changed = []
+            for konsultasi in batch:
+                konsultasi.jenis_layanan = parse_jenis_layanan(konsultasi.minat_karir)
+                if konsultasi.jenis_layanan:
+                    changed.append(konsultasi)
+
+            with transaction.atomic():
+                Konsultasi.objects.bulk_update(changed, ['jenis_layanan'])
+            updated += len(changed)
+            self.stdout.write(f"Batch sampai pk={last_pk}: {len(changed)}/{len(batch)} diperbarui")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Selesai: {updated} dari {scanned} konsultasi diisi jenis_layanan."
+        ))
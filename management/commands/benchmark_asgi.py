@@ -0,0 +1,207 @@
+# accounts/management/commands/benchmark_asgi.py
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from accounts.data_sintetis import nama_konsultan
+
+from .benchmark_views import persentil
+
+# (nama URL, butuh login): view async agregat dan halaman publik
+SKENARIO = (
+    ('dashboard', True),
+    ('reports', True),
+    ('home', False),
+    ('about', False),
+)
+
+# Server lokal: (label, factory aplikasi, --interface uvicorn)
+DEPLOYMENT = (
+    ('WSGI', 'accounts.management.commands._aplikasi_benchmark:wsgi', 'wsgi'),
+    ('ASGI', 'accounts.management.commands._aplikasi_benchmark:asgi', 'asgi3'),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Membandingkan latensi (p50/p95) dan throughput (request/detik) dashboard, reports, dan "
+        "halaman publik antara deployment WSGI dan ASGI pada beberapa tingkat konkurensi. "
+        "Secara default kedua server dijalankan sebagai proses uvicorn lokal dengan satu worker "
+        "(butuh `pip install uvicorn`; mode WSGI uvicorn memakai 10 thread, mode ASGI satu thread "
+        "per request); atau arahkan ke server yang sudah berjalan dengan --wsgi-url dan --asgi-url. "
+        "--latensi-query meniru database di jaringan, tempat ASGI bisa unggul. "
+        "Siapkan data dengan `generate_synthetic_data` terlebih dahulu."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help=f"Username konsultan yang dipakai (default: {nama_konsultan(0)}, konsultan sintetis tersibuk).",
+        )
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help="Jumlah request yang diukur per view per tingkat konkurensi (default: 200).",
+        )
+        parser.add_argument(
+            '--concurrency', default='1,8,32',
+            help="Tingkat konkurensi (jumlah koneksi klien bersamaan), dipisah koma (default: 1,8,32).",
+        )
+        parser.add_argument(
+            '--cold', action='store_true',
+            help="Jalankan server dengan DASHBOARD_CACHE_TIMEOUT=0 agar dashboard selalu menjalankan query.",
+        )
+        parser.add_argument(
+            '--latensi-query', type=int, default=0,
+            help="Tunda setiap query di server lokal sekian milidetik, meniru round trip ke "
+                 "database di jaringan (default: 0).",
+        )
+        parser.add_argument(
+            '--port', type=int, default=8701,
+            help="Port pertama untuk server lokal; server kedua memakai port berikutnya (default: 8701).",
+        )
+        parser.add_argument('--wsgi-url', help="URL server WSGI yang sudah berjalan (tidak menjalankan server lokal).")
+        parser.add_argument('--asgi-url', help="URL server ASGI yang sudah berjalan (tidak menjalankan server lokal).")
+
+    def handle(self, *args, **options):
+        username = options['user'] or nama_konsultan(0)
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            raise CommandError(
+                f"User '{username}' tidak ditemukan. Jalankan `manage.py generate_synthetic_data` dulu."
+            )
+        try:
+            konkurensi = [int(n) for n in options['concurrency'].split(',')]
+        except ValueError:
+            raise CommandError("--concurrency harus berupa angka dipisah koma, misal 1,8,32.")
+        if options['requests'] < 1 or min(konkurensi) < 1:
+            raise CommandError("--requests dan --concurrency harus lebih dari 0.")
+        if bool(options['wsgi_url']) != bool(options['asgi_url']):
+            raise CommandError("--wsgi-url dan --asgi-url harus diisi bersamaan.")
+
+        session = self._buat_session(user)
+        cookie = f'{settings.SESSION_COOKIE_NAME}={session.session_key}'
+        server = []
+        try:
+            if options['wsgi_url']:
+                urls = {'WSGI': options['wsgi_url'], 'ASGI': options['asgi_url']}
+            else:
+                urls = {}
+                for i, (label, target, interface) in enumerate(DEPLOYMENT):
+                    port = options['port'] + i
+                    server.append(self._jalankan_server(
+                        target, interface, port, options['cold'], options['latensi_query'],
+                    ))
+                    urls[label] = f'http://127.0.0.1:{port}'
+                for label in urls:
+                    self._tunggu_siap(urls[label])
+
+            self.stdout.write(
+                f"{'view':<12}{'konk':>6}" + ''.join(
+                    f"{label + ' p50':>12}{label + ' p95':>12}{label + ' req/s':>13}" for label in urls
+                )
+            )
+            for nama, butuh_login in SKENARIO:
+                path = reverse(nama)
+                header = {'Cookie': cookie} if butuh_login else {}
+                for n in konkurensi:
+                    baris = f"{nama:<12}{n:>6}"
+                    for label, url in urls.items():
+                        h = self._ukur(url, path, header, n, options['requests'])
+                        baris += f"{h['p50_ms']:>12.2f}{h['p95_ms']:>12.2f}{h['rps']:>13.1f}"
+                    self.stdout.write(baris)
+        finally:
+            for proses in server:
+                proses.terminate()
+                proses.wait(timeout=10)
+            session.delete()
+
+    def _buat_session(self, user):
+        # Session login langsung di session store, sama seperti Client.force_login
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        return session
+
+    def _jalankan_server(self, target, interface, port, cold, latensi_query):
+        env = dict(os.environ)
+        if cold:
+            env['DASHBOARD_CACHE_TIMEOUT'] = '0'
+        if latensi_query:
+            env['BENCHMARK_LATENSI_QUERY_MS'] = str(latensi_query)
+        return subprocess.Popen(
+            [
+                sys.executable, '-m', 'uvicorn', target, '--factory', '--interface', interface,
+                '--host', '127.0.0.1', '--port', str(port), '--workers', '1',
+                '--no-access-log', '--log-level', 'warning',
+            ],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def _tunggu_siap(self, url, batas_detik=30):
+        bagian = urlsplit(url)
+        akhir = time.monotonic() + batas_detik
+        while time.monotonic() < akhir:
+            try:
+                with socket.create_connection((bagian.hostname, bagian.port or 80), timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"Server {url} tidak bisa dihubungi; apakah uvicorn sudah terpasang?")
+
+    def _ukur(self, url, path, header, konkurensi, jumlah):
+        """
+        Mengirim `jumlah` GET dari `konkurensi` thread klien, masing-masing dengan satu koneksi
+        keep-alive. Mengembalikan p50/p95 latensi dan throughput.
+        """
+        bagian = urlsplit(url)
+        lokal = threading.local()
+        # Sebelum diukur: setiap thread membuka koneksi dan mengisi cache server
+        jumlah_pemanasan = konkurensi * 2
+
+        def kirim():
+            if not hasattr(lokal, 'koneksi'):
+                lokal.koneksi = http.client.HTTPConnection(bagian.hostname, bagian.port, timeout=60)
+            lokal.koneksi.request('GET', path, headers=header)
+            response = lokal.koneksi.getresponse()
+            response.read()
+            return response
+
+        def get(_):
+            mulai = time.perf_counter()
+            try:
+                response = kirim()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                # Server boleh menutup koneksi keep-alive yang menganggur; GET aman diulang
+                lokal.koneksi.close()
+                del lokal.koneksi
+                response = kirim()
+            selesai = time.perf_counter()
+            if response.status != 200:
+                raise CommandError(f"GET {url}{path} gagal dengan status {response.status}")
+            return (selesai - mulai) * 1000
+
+        with ThreadPoolExecutor(max_workers=konkurensi) as executor:
+            list(executor.map(get, range(jumlah_pemanasan)))
+            mulai = time.perf_counter()
+            durasi = sorted(executor.map(get, range(jumlah)))
+            total = time.perf_counter() - mulai
+        return {
+            'p50_ms': persentil(durasi, 50),
+            'p95_ms': persentil(durasi, 95),
+            'rps': jumlah / total,
+        }
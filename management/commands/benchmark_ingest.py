@@ -0,0 +1,67 @@
+# accounts/management/commands/benchmark_ingest.py
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, teardown_databases
+from django.urls import reverse
+
+from accounts import spool_konsultasi
+
+# Domain email data benchmark
+BENCHMARK_DOMAIN = 'benchmark.invalid'
+
+
+class Command(BaseCommand):
+    help = (
+        "Membandingkan throughput formulir konsultasi publik (request/detik) antara mode "
+        "'langsung' dan mode 'spool'. Berjalan di database test sementara (seperti "
+        "`manage.py test`), sehingga database yang dikonfigurasi tidak ditulis."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=500,
+            help="Jumlah POST formulir per mode (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        jumlah = options['requests']
+        client = Client(SERVER_NAME='localhost')
+        url = reverse('consultation_form')
+
+        database_lama = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            with override_settings(KONSULTASI_INGEST_MODE='langsung'):
+                langsung = self._post_many(client, url, jumlah, 'langsung')
+
+            with tempfile.TemporaryDirectory() as tmp:
+                path = str(Path(tmp) / 'spool.sqlite3')
+                with override_settings(KONSULTASI_INGEST_MODE='spool', KONSULTASI_SPOOL_PATH=path):
+                    spool = self._post_many(client, url, jumlah, 'spool')
+                    start = time.perf_counter()
+                    while spool_konsultasi.drain(batch_size=500, path=path):
+                        pass
+                    drain_seconds = time.perf_counter() - start
+        finally:
+            teardown_databases(database_lama, verbosity=0)
+
+        self.stdout.write(f"langsung : {langsung:8.1f} req/s")
+        self.stdout.write(f"spool    : {spool:8.1f} req/s")
+        self.stdout.write(f"drain    : {jumlah / drain_seconds:8.1f} baris/s ({drain_seconds:.2f} s)")
+        self.stdout.write(self.style.SUCCESS(f"Percepatan request: {spool / langsung:.1f}x"))
+
+    def _post_many(self, client, url, jumlah, mode):
+        start = time.perf_counter()
+        for i in range(jumlah):
+            response = client.post(url, {
+                'name': f'Benchmark {i}',
+                'email': f'{mode}{i}@{BENCHMARK_DOMAIN}',
+                'message': 'Permintaan konsultasi benchmark.',
+                'service_type': 'Persiapan Wawancara',
+            })
+            if response.status_code != 302:
+                raise RuntimeError(f"POST gagal dengan status {response.status_code}")
+        return jumlah / (time.perf_counter() - start)
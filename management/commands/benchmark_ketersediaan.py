@@ -0,0 +1,87 @@
+# accounts/management/commands/benchmark_ketersediaan.py
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.ketersediaan import JamKerja, cek_bentrok, slot_kosong
+from accounts.models import Konsultasi
+
+
+class Command(BaseCommand):
+    help = (
+        "Mengukur waktu pengecekan bentrok dan pencarian slot kosong untuk satu konsultan "
+        "dengan puluhan ribu janji temu historis, dibandingkan dengan pemindaian seluruh jadwal. "
+        "Semua data benchmark dibuat di dalam transaksi yang di-rollback."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--janji', type=int, default=50000,
+            help="Jumlah janji temu historis milik konsultan benchmark (default: 50000).",
+        )
+        parser.add_argument(
+            '--ulang', type=int, default=500,
+            help="Jumlah pengecekan bentrok yang diukur (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create(username='benchmark_ketersediaan')
+            jam_kerja = JamKerja.untuk(user)
+            self._buat_riwayat(user, jam_kerja, options['janji'])
+
+            hari_ini = timezone.localdate()
+            acak = random.Random(0)
+            titik = [
+                (hari_ini - timedelta(days=acak.randrange(0, 3 * 365)),
+                 jam_kerja.jam_mulai.replace(hour=acak.randrange(8, 18), minute=acak.choice((0, 15, 30, 45))))
+                for _ in range(options['ulang'])
+            ]
+
+            indeks_ms = self._ukur(lambda t, w: cek_bentrok(user, t, w, jam_kerja=jam_kerja), titik)
+            pindai_ms = self._ukur(lambda t, w: self._bentrok_pindai(user, t, w, jam_kerja), titik[:50])
+
+            start = time.perf_counter()
+            slot_kosong(user, hari_ini, hari_ini + timedelta(days=6))
+            slot_ms = (time.perf_counter() - start) * 1000
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"janji historis          : {options['janji']}")
+        self.stdout.write(f"cek bentrok (index)     : {indeks_ms:8.3f} ms/cek")
+        self.stdout.write(f"cek bentrok (pindai)    : {pindai_ms:8.3f} ms/cek")
+        self.stdout.write(f"slot kosong minggu ini  : {slot_ms:8.3f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Percepatan cek bentrok: {pindai_ms / indeks_ms:.0f}x"))
+
+    def _buat_riwayat(self, user, jam_kerja, jumlah):
+        # Janji terjadwal di setiap slot hari kerja, mundur dari hari ini
+        objs = []
+        tanggal = timezone.localdate()
+        while len(objs) < jumlah:
+            tanggal -= timedelta(days=1)
+            for mulai in jam_kerja.slot_hari(tanggal):
+                objs.append(Konsultasi(
+                    user=user, nama=f'Riwayat {len(objs)}', email=f'riwayat{len(objs)}@benchmark.invalid',
+                    no_hp='-', minat_karir='-', status='terjadwal',
+                    tanggal_janji=mulai.date(), waktu_janji=mulai.time(),
+                ))
+        Konsultasi.objects.bulk_create(objs[:jumlah], batch_size=2000)
+
+    def _bentrok_pindai(self, user, tanggal, waktu, jam_kerja):
+        # Pembanding: memuat seluruh jadwal konsultan lalu memeriksa satu per satu
+        mulai = datetime.combine(tanggal, waktu)
+        for t, w in Konsultasi.objects.filter(user=user, status='terjadwal').values_list('tanggal_janji', 'waktu_janji'):
+            if t is not None and w is not None and abs(datetime.combine(t, w) - mulai) < jam_kerja.durasi:
+                return datetime.combine(t, w)
+        return None
+
+    def _ukur(self, fungsi, titik):
+        start = time.perf_counter()
+        for tanggal, waktu in titik:
+            fungsi(tanggal, waktu)
+        return (time.perf_counter() - start) * 1000 / len(titik)
@@ -0,0 +1,69 @@
+# accounts/management/commands/benchmark_public_pages.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+# Halaman publik yang diukur (nama URL)
+HALAMAN = ('home', 'about', 'contact', 'career_services')
+
+
+def _tanpa_cached_loader(templates):
+    # Salinan TEMPLATES dengan loader biasa: setiap render membaca dan mem-parse ulang file
+    hasil = []
+    for engine in templates:
+        engine = {**engine, 'OPTIONS': {**engine.get('OPTIONS', {})}}
+        engine['OPTIONS']['loaders'] = [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]
+        hasil.append(engine)
+    return hasil
+
+
+class Command(BaseCommand):
+    help = (
+        "Mengukur request/detik halaman publik untuk pengunjung anonim dalam tiga konfigurasi: "
+        "tanpa cache, dengan cached template loader, dan dengan cached loader + cache halaman."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=500,
+            help="Jumlah GET per halaman per konfigurasi (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        jumlah = options['requests']
+        timeout = settings.PUBLIC_PAGE_CACHE_TIMEOUT or 600
+        konfigurasi = [
+            ('tanpa cache', {'TEMPLATES': _tanpa_cached_loader(settings.TEMPLATES), 'PUBLIC_PAGE_CACHE_TIMEOUT': 0}),
+            ('cached loader', {'PUBLIC_PAGE_CACHE_TIMEOUT': 0}),
+            ('cached loader + cache halaman', {'PUBLIC_PAGE_CACHE_TIMEOUT': timeout}),
+        ]
+
+        hasil = {}
+        for label, overrides in konfigurasi:
+            with override_settings(**overrides):
+                hasil[label] = {nama: self._ukur(reverse(nama), jumlah) for nama in HALAMAN}
+
+        self.stdout.write(f"{'halaman':<18}" + ''.join(f"{label:>32}" for label, _ in konfigurasi))
+        for nama in HALAMAN:
+            self.stdout.write(f"{nama:<18}" + ''.join(
+                f"{hasil[label][nama]:>26.1f} req/s" for label, _ in konfigurasi
+            ))
+        dasar = sum(hasil['tanpa cache'].values())
+        akhir = sum(hasil['cached loader + cache halaman'].values())
+        self.stdout.write(self.style.SUCCESS(f"Percepatan rata-rata: {akhir / dasar:.1f}x"))
+
+    def _ukur(self, url, jumlah):
+        client = Client(SERVER_NAME='localhost')
+        client.get(url) # Pemanasan: isi cache template/halaman
+        start = time.perf_counter()
+        for _ in range(jumlah):
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {url} gagal dengan status {response.status_code}")
+        return jumlah / (time.perf_counter() - start)
@@ -0,0 +1,214 @@
+# accounts/management/commands/benchmark_views.py
+import json
+import logging
+import math
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts import dashboard_cache
+from accounts.data_sintetis import EMAIL_DOMAIN, nama_konsultan
+from accounts.models import Konsultasi
+
+# (nama URL, method, butuh login); formulir publik dikirim sebagai pengunjung anonim
+SKENARIO = (
+    ('dashboard', 'get', True),
+    ('clients', 'get', True),
+    ('appointments', 'get', True),
+    ('schedule', 'get', True),
+    ('reports', 'get', True),
+    ('pending_consultations', 'get', True),
+    ('consultation_form', 'post', False),
+)
+
+# Awalan email konsultasi yang dibuat oleh POST formulir; dihapus setelah benchmark
+EMAIL_FORMULIR = 'benchmark-formulir'
+
+# Selisih latensi di bawah ini (ms) tidak dianggap regresi, agar noise pada view cepat tidak gagal
+MIN_SELISIH_MS = 1.0
+
+
+def persentil(nilai_terurut, p):
+    """Persentil nearest-rank dari list yang sudah terurut."""
+    return nilai_terurut[max(0, math.ceil(p / 100 * len(nilai_terurut)) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mengukur latensi (p50/p95/p99) dan jumlah query view konsultan serta formulir publik "
+        "lewat test client, lalu membandingkannya dengan baseline yang tersimpan. "
+        "Gagal (exit code 1) jika ada view yang lebih lambat atau menjalankan lebih banyak query. "
+        "Siapkan data dengan `generate_synthetic_data` terlebih dahulu."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help=f"Username konsultan yang dipakai (default: {nama_konsultan(0)}, konsultan sintetis tersibuk).",
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=50,
+            help="Jumlah request yang diukur per view (default: 50).",
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=3,
+            help="Jumlah request pemanasan per view yang tidak diukur (default: 3).",
+        )
+        parser.add_argument(
+            '--cold', action='store_true',
+            help="Kosongkan cache dashboard sebelum setiap request (mengukur jalur tanpa cache).",
+        )
+        parser.add_argument(
+            '--baseline',
+            help="Path file baseline JSON (default: benchmark_baseline.json di BASE_DIR).",
+        )
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help="Simpan hasil run ini sebagai baseline baru alih-alih membandingkan.",
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.25,
+            help="Kenaikan latensi relatif yang masih diterima (default: 0.25 = 25%%).",
+        )
+
+    def handle(self, *args, **options):
+        username = options['user'] or nama_konsultan(0)
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            raise CommandError(
+                f"User '{username}' tidak ditemukan. Jalankan `manage.py generate_synthetic_data` dulu."
+            )
+        if options['iterations'] < 1:
+            raise CommandError("--iterations harus lebih dari 0.")
+        baseline_path = Path(options['baseline'] or Path(settings.BASE_DIR) / 'benchmark_baseline.json')
+
+        login = Client(SERVER_NAME='localhost')
+        login.force_login(user)
+        publik = Client(SERVER_NAME='localhost')
+
+        # Satu baris log per request dari InstrumentasiMiddleware hanya mengganggu di sini
+        logger = logging.getLogger('accounts.instrumentasi')
+        level_lama = logger.level
+        logger.setLevel(logging.WARNING)
+        hasil = {}
+        try:
+            for nama, method, butuh_login in SKENARIO:
+                client = login if butuh_login else publik
+                hasil[nama] = self._ukur(client, nama, method, user, options)
+        finally:
+            logger.setLevel(level_lama)
+            Konsultasi.objects.filter(email__startswith=EMAIL_FORMULIR, email__endswith=f'@{EMAIL_DOMAIN}').delete()
+
+        meta = {
+            'konsultasi': Konsultasi.objects.count(),
+            'user': username,
+            'iterasi': options['iterations'],
+            'cold': options['cold'],
+            'waktu': timezone.now().isoformat(),
+        }
+        if options['save_baseline']:
+            self._tampilkan(hasil, {})
+            baseline_path.write_text(json.dumps({'meta': meta, 'views': hasil}, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Baseline disimpan ke {baseline_path}."))
+            return
+
+        baseline = {}
+        if baseline_path.exists():
+            data = json.loads(baseline_path.read_text())
+            baseline = data['views']
+            if data['meta'].get('konsultasi') != meta['konsultasi'] or data['meta'].get('user') != username:
+                self.stdout.write(self.style.WARNING(
+                    f"Baseline dibuat dengan {data['meta'].get('konsultasi')} konsultasi untuk "
+                    f"{data['meta'].get('user')}; sekarang {meta['konsultasi']} untuk {username}. "
+                    "Perbandingan mungkin tidak sebanding."
+                ))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"Baseline {baseline_path} belum ada; jalankan dengan --save-baseline untuk membuatnya."
+            ))
+
+        regresi = self._tampilkan(hasil, baseline, options['tolerance'])
+        if regresi:
+            raise CommandError("Regresi performa terdeteksi:\n" + '\n'.join(regresi))
+        if baseline:
+            self.stdout.write(self.style.SUCCESS("Tidak ada regresi dibanding baseline."))
+
+    def _ukur(self, client, nama, method, user, options):
+        url = reverse(nama)
+        durasi, query = [], []
+        for i in range(-options['warmup'], options['iterations']):
+            if options['cold']:
+                dashboard_cache.invalidate(user.pk)
+            with ExitStack() as stack:
+                # Semua alias ikut dihitung, termasuk replika baca jika dikonfigurasi
+                queries = [stack.enter_context(CaptureQueriesContext(c)) for c in connections.all()]
+                mulai = time.perf_counter()
+                if method == 'post':
+                    response = client.post(url, {
+                        'name': f'Benchmark {i}',
+                        'email': f'{EMAIL_FORMULIR}{i}@{EMAIL_DOMAIN}',
+                        'message': 'Permintaan konsultasi benchmark.',
+                        'service_type': 'Persiapan Wawancara',
+                    })
+                else:
+                    response = client.get(url)
+                selesai = time.perf_counter()
+            if response.status_code not in (200, 302):
+                raise CommandError(f"{method.upper()} {url} gagal dengan status {response.status_code}")
+            if i >= 0:
+                durasi.append((selesai - mulai) * 1000)
+                query.append(sum(len(q) for q in queries))
+
+        durasi.sort()
+        return {
+            'p50_ms': round(persentil(durasi, 50), 2),
+            'p95_ms': round(persentil(durasi, 95), 2),
+            'p99_ms': round(persentil(durasi, 99), 2),
+            'rata_ms': round(sum(durasi) / len(durasi), 2),
+            'query': max(query),
+        }
+
+    def _tampilkan(self, hasil, baseline, toleransi=0.0):
+        """
+        Mencetak tabel hasil (dan selisih terhadap baseline jika ada).
+        Mengembalikan daftar pesan regresi.
+        """
+        regresi = []
+        self.stdout.write(
+            f"{'view':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rata ms':>10}{'query':>7}"
+            + (f"{'Δp50':>9}{'Δp95':>9}{'query dulu':>12}" if baseline else '')
+        )
+        for nama, h in hasil.items():
+            baris = (
+                f"{nama:<24}{h['p50_ms']:>10.2f}{h['p95_ms']:>10.2f}{h['p99_ms']:>10.2f}"
+                f"{h['rata_ms']:>10.2f}{h['query']:>7}"
+            )
+            dulu = baseline.get(nama)
+            if dulu:
+                baris += (
+                    f"{_persen(h['p50_ms'], dulu['p50_ms']):>9}{_persen(h['p95_ms'], dulu['p95_ms']):>9}"
+                    f"{dulu['query']:>12}"
+                )
+                for kunci in ('p50_ms', 'p95_ms'):
+                    if (h[kunci] > dulu[kunci] * (1 + toleransi)
+                            and h[kunci] - dulu[kunci] > MIN_SELISIH_MS):
+                        regresi.append(f"{nama}: {kunci} {dulu[kunci]} -> {h[kunci]}")
+                if h['query'] > dulu['query']:
+                    regresi.append(f"{nama}: query {dulu['query']} -> {h['query']}")
+            self.stdout.write(baris)
+        return regresi
+
+
+def _persen(sekarang, dulu):
+    if not dulu:
+        return '-'
+    return f"{(sekarang - dulu) / dulu * 100:+.0f}%"
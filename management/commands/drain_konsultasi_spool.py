@@ -0,0 +1,41 @@
+# accounts/management/commands/drain_konsultasi_spool.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts import spool_konsultasi
+
+
+class Command(BaseCommand):
+    help = (
+        "Memindahkan permintaan konsultasi publik dari spool lokal ke tabel Konsultasi "
+        "dengan bulk_create per batch. Gunakan --loop untuk berjalan terus sebagai proses latar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Jumlah permintaan per bulk_create (default: 500).",
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help="Terus berjalan dan memeriksa spool secara berkala.",
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help="Jeda (detik) saat spool kosong dalam mode --loop (default: 1).",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            created = spool_konsultasi.drain(batch_size=options['batch_size'])
+            total += created
+            if created:
+                self.stdout.write(f"{created} konsultasi dipindahkan dari spool (total {total}).")
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f"Selesai: {total} konsultasi dipindahkan dari spool."))
@@ -0,0 +1,67 @@
+# accounts/management/commands/generate_synthetic_data.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.data_sintetis import SKALA, GeneratorData, hapus_data_sintetis, nama_konsultan
+
+
+class Command(BaseCommand):
+    help = (
+        "Mengisi database dengan konsultan dan konsultasi sintetis yang dapat direproduksi "
+        "(seed tetap) untuk benchmark. Jumlah konsultasi per konsultan dan per status "
+        "sengaja tidak merata. Data sintetis lama dihapus terlebih dahulu."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', choices=sorted(SKALA), default='1k',
+            help="Jumlah konsultasi: 1k, 100k, atau 1m (default: 1k).",
+        )
+        parser.add_argument(
+            '--rows', type=int,
+            help="Jumlah konsultasi eksplisit (menggantikan --scale).",
+        )
+        parser.add_argument(
+            '--consultants', type=int,
+            help="Jumlah konsultan (default: rows / 2000, minimal 5, maksimal 500).",
+        )
+        parser.add_argument('--seed', type=int, default=42, help="Seed generator acak (default: 42).")
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help="Jumlah konsultasi per bulk_create (default: 5000).",
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help="Hanya hapus data sintetis, tanpa membuat data baru.",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        mulai = time.perf_counter()
+        dihapus = hapus_data_sintetis()
+        if dihapus:
+            self.stdout.write(f"{dihapus} konsultasi sintetis lama dihapus.")
+        if options['clear']:
+            return
+
+        jumlah = options['rows'] or SKALA[options['scale']]
+        if jumlah < 1:
+            raise CommandError("--rows harus lebih dari 0.")
+        generator = GeneratorData(
+            jumlah,
+            jumlah_konsultan=options['consultants'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+        )
+        user_ids = generator.buat_konsultan()
+        generator.buat_konsultasi(user_ids, setelah_batch=self._laporkan_batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Selesai dalam {time.perf_counter() - mulai:.1f} s: {jumlah} konsultasi untuk "
+            f"{len(user_ids)} konsultan (seed {options['seed']}). Konsultan tersibuk: {nama_konsultan(0)}."
+        ))
+
+    def _laporkan_batch(self, ditulis):
+        if self.verbosity >= 2:
+            self.stdout.write(f"{ditulis} konsultasi ditulis.")
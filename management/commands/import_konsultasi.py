@@ -0,0 +1,91 @@
+# accounts/management/commands/import_konsultasi.py
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.forms import KonsultasiForm
+from accounts.impor_konsultasi import KOLOM_TAMBAHAN, HasilImpor, ImporKonsultasi, baca_csv, baca_jsonl
+
+
+class Command(BaseCommand):
+    help = (
+        "Mengimpor konsultasi historis dari file CSV atau JSON Lines dengan bulk_create per batch. "
+        "Kolom: %s, serta %s (opsional). Baris divalidasi dengan aturan KonsultasiForm, "
+        "baris yang sudah ada dilewati, dan impor yang terhenti dilanjutkan dari checkpoint."
+    ) % (', '.join(KonsultasiForm._meta.fields), ', '.join(KOLOM_TAMBAHAN))
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path file CSV (dengan header) atau JSON Lines.")
+        parser.add_argument(
+            '--format', choices=('csv', 'jsonl'),
+            help="Format file (default: dari ekstensi; .jsonl/.ndjson = jsonl, selain itu csv).",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Jumlah konsultasi per bulk_create dan per transaksi (default: 1000).",
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help="Path file checkpoint (default: <path>.checkpoint).",
+        )
+        parser.add_argument(
+            '--restart', action='store_true',
+            help="Abaikan checkpoint yang ada dan mulai dari baris pertama.",
+        )
+        parser.add_argument(
+            '--reject-file',
+            help="Tulis baris yang ditolak beserta pesan kesalahannya ke file JSON Lines ini.",
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        self.verbosity = options['verbosity']
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size harus lebih dari 0.")
+        format_file = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+        checkpoint = options['checkpoint'] or f'{path}.checkpoint'
+
+        hasil = None
+        if os.path.exists(checkpoint) and not options['restart']:
+            hasil = HasilImpor.dari_checkpoint(checkpoint)
+            self.stdout.write(f"Melanjutkan dari checkpoint: baris {hasil.baris} sudah diproses.")
+
+        penolakan = open(options['reject_file'], 'a', encoding='utf-8') if options['reject_file'] else None
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                records = baca_jsonl(f) if format_file == 'jsonl' else baca_csv(f)
+                importir = ImporKonsultasi(
+                    batch_size=options['batch_size'],
+                    checkpoint_path=checkpoint,
+                    penolakan=penolakan,
+                    hasil=hasil,
+                )
+                hasil = importir.jalankan(records, setelah_batch=self._laporkan_batch)
+        except FileNotFoundError:
+            raise CommandError(f"File tidak ditemukan: {path}")
+        finally:
+            if penolakan is not None:
+                penolakan.close()
+
+        # Impor selesai; checkpoint tidak diperlukan lagi
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        detik = hasil.detik
+        self.stdout.write(
+            f"Waktu: total {detik['total']:.1f} s (validasi {detik['validasi']:.1f} s, "
+            f"tulis {detik['tulis']:.1f} s, statistik {detik['statistik']:.1f} s)"
+        )
+        if detik['total']:
+            self.stdout.write(f"Throughput: {hasil.diproses / detik['total']:.0f} baris/s")
+        self.stdout.write(self.style.SUCCESS(
+            f"Selesai: {hasil.dibuat} konsultasi dibuat, {hasil.duplikat} duplikat dilewati, "
+            f"{hasil.tidak_valid} baris tidak valid."
+        ))
+
+    def _laporkan_batch(self, hasil):
+        if self.verbosity >= 2:
+            self.stdout.write(
+                f"Baris {hasil.baris}: {hasil.dibuat} dibuat, {hasil.duplikat} duplikat, "
+                f"{hasil.tidak_valid} tidak valid."
+            )
@@ -0,0 +1,86 @@
+# accounts/management/commands/import_users.py
+import csv
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import Profile
+
+USER_FIELDS = ('username', 'email', 'first_name', 'last_name')
+PROFILE_FIELDS = ('alamat', 'nomor_telepon', 'bio', 'tanggal_lahir', 'jenis_kelamin')
+
+
+def bulk_import_users(rows, batch_size=1000):
+    """
+    Membuat User dan Profile dari iterable dict dengan bulk_create per batch.
+    Username yang sudah ada dilewati. Mengembalikan (jumlah_dibuat, jumlah_dilewati).
+    """
+    created = skipped = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            c, s = _import_batch(batch)
+            created, skipped = created + c, skipped + s
+            batch = []
+    if batch:
+        c, s = _import_batch(batch)
+        created, skipped = created + c, skipped + s
+    return created, skipped
+
+
+def _import_batch(rows):
+    usernames = [row['username'] for row in rows]
+    existing = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+
+    users = []
+    profiles = {}
+    for row in rows:
+        username = row['username']
+        if not username or username in existing or username in profiles:
+            continue
+        user = User(**{field: row.get(field) or '' for field in USER_FIELDS})
+        # Tanpa kolom password, akun dibuat dengan password yang tidak bisa dipakai login
+        user.password = make_password(row.get('password') or None)
+        users.append(user)
+        profiles[username] = {field: row.get(field) or None for field in PROFILE_FIELDS}
+
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        # bulk_create tidak selalu mengisi pk, jadi ambil ulang berdasarkan username
+        user_ids = dict(User.objects.filter(username__in=profiles).values_list('username', 'pk'))
+        Profile.objects.bulk_create([
+            Profile(user_id=user_ids[username], **fields) for username, fields in profiles.items()
+        ])
+    return len(users), len(rows) - len(users)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mengimpor pengguna beserta profilnya dari file CSV dengan bulk_create. "
+        "Kolom: username, email, first_name, last_name, password (opsional), "
+        "alamat, nomor_telepon, bio, tanggal_lahir (YYYY-MM-DD), jenis_kelamin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help="Path file CSV dengan baris header.")
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Jumlah pengguna per bulk_create (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                if not reader.fieldnames or 'username' not in reader.fieldnames:
+                    raise CommandError("File CSV harus memiliki kolom 'username'.")
+                created, skipped = bulk_import_users(reader, batch_size=options['batch_size'])
+        except FileNotFoundError:
+            raise CommandError(f"File tidak ditemukan: {options['csv_path']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Selesai: {created} pengguna dibuat, {skipped} dilewati (username kosong atau sudah ada)."
+        ))
@@ -0,0 +1,26 @@
+# accounts/management/commands/rebuild_klien.py
+from django.core.management.base import BaseCommand
+
+from accounts.klien import bangun_ulang_klien
+
+
+class Command(BaseCommand):
+    help = (
+        "Menautkan ulang Konsultasi ke Klien dan menghitung ulang penghitung Klien "
+        "(kontak pertama/terakhir, jumlah konsultasi, status terakhir). "
+        "Gunakan untuk perbaikan jika data Klien tidak sinkron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', type=int, dest='user_id',
+            help="Hanya bangun ulang klien untuk user dengan ID ini.",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help="Jumlah konsultasi per batch (default: 5000).",
+        )
+
+    def handle(self, *args, **options):
+        total = bangun_ulang_klien(user_id=options['user_id'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Selesai: {total} konsultasi ditautkan ulang ke klien."))
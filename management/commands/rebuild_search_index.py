@@ -0,0 +1,22 @@
+# accounts/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.pencarian import bangun_ulang_indeks
+
+
+class Command(BaseCommand):
+    help = (
+        "Membangun ulang indeks pencarian full-text (FTS5) konsultasi dari tabel Konsultasi. "
+        "Gunakan jika indeks tidak sinkron, misal setelah impor langsung ke database."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = bangun_ulang_indeks()
+        if total is None:
+            self.stdout.write(self.style.WARNING(
+                "Indeks FTS5 tidak tersedia di database ini; pencarian memakai fallback icontains."
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Selesai: {total} konsultasi diindeks ulang."))
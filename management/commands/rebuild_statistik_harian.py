@@ -0,0 +1,48 @@
+# accounts/management/commands/rebuild_statistik_harian.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models.functions import TruncDate
+
+from accounts.models import StatistikHarian
+from accounts.statistik import SUMBER, hitung_ulang_hari
+
+
+class Command(BaseCommand):
+    help = (
+        "Membangun ulang tabel StatistikHarian dari data Konsultasi mentah (aktif dan arsip). "
+        "Gunakan untuk perbaikan jika ringkasan tidak sinkron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', type=int, dest='user_id',
+            help="Hanya bangun ulang statistik untuk user dengan ID ini.",
+        )
+
+    def handle(self, *args, **options):
+        statistik = StatistikHarian.objects.all()
+        if options['user_id']:
+            statistik = statistik.filter(user_id=options['user_id'])
+
+        # Pasangan (user, tanggal lokal) yang memiliki konsultasi di tabel aktif atau arsip
+        hari = set()
+        for model in SUMBER:
+            konsultasi = model.objects.filter(user__isnull=False)
+            if options['user_id']:
+                konsultasi = konsultasi.filter(user_id=options['user_id'])
+            hari.update(
+                konsultasi.annotate(tanggal=TruncDate('tanggal_dibuat'))
+                .values_list('user_id', 'tanggal')
+                .distinct()
+                .order_by()
+                .iterator()
+            )
+
+        with transaction.atomic():
+            statistik.delete()
+            total = 0
+            for user_id, tanggal in sorted(hari):
+                hitung_ulang_hari(user_id, tanggal)
+                total += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Selesai: {total} baris statistik harian dibangun ulang."))
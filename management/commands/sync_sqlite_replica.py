@@ -0,0 +1,19 @@
+# accounts/management/commands/sync_sqlite_replica.py
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.replika import alias_replika, salin_sqlite_ke_replika
+
+
+class Command(BaseCommand):
+    help = (
+        "Menyalin database SQLite primary ke file replika (DJANGO_DB_REPLICA_NAME), untuk menguji "
+        "router replika secara lokal dengan dua file SQLite. Jalankan ulang untuk 'menyusulkan' "
+        "replika; di antara dua salinan, replika tertinggal dari primary seperti replika sungguhan."
+    )
+
+    def handle(self, *args, **options):
+        try:
+            salin_sqlite_ke_replika()
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Selesai: database primary disalin ke replika '{alias_replika()}'."))
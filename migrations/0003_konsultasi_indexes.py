@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_konsultasi_options_alter_konsultasi_jurusan_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='konsultasi',
+            index=models.Index(fields=['user', 'status', 'tanggal_janji', 'waktu_janji'], name='konsultasi_user_status_janji'),
+        ),
+        migrations.AddIndex(
+            model_name='konsultasi',
+            index=models.Index(fields=['user', 'tanggal_janji', 'waktu_janji'], name='konsultasi_user_janji'),
+        ),
+        migrations.AddIndex(
+            model_name='konsultasi',
+            index=models.Index(fields=['user', 'tanggal_dibuat'], name='konsultasi_user_dibuat'),
+        ),
+        migrations.AddIndex(
+            model_name='konsultasi',
+            index=models.Index(fields=['user', 'email', 'tanggal_dibuat'], name='konsultasi_user_email'),
+        ),
+        migrations.AddIndex(
+            model_name='konsultasi',
+            index=models.Index(condition=models.Q(('status', 'pending'), ('user__isnull', True)), fields=['tanggal_dibuat'], name='konsultasi_antrean_pending'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_konsultasi_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='konsultasi',
+            name='jenis_layanan',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='konsultasi',
+            index=models.Index(fields=['user', 'jenis_layanan', 'tanggal_dibuat'], name='konsultasi_user_layanan'),
+        ),
+    ]
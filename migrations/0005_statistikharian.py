@@ -0,0 +1,94 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:56
+
+from collections import Counter
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+# Salinan aturan di accounts/statistik.py; migrasi tidak mengimpor kode aplikasi
+STATUS_KOLOM = {
+    'pending': 'jumlah_pending',
+    'terjadwal': 'jumlah_terjadwal',
+    'selesai': 'jumlah_selesai',
+    'dibatalkan': 'jumlah_dibatalkan',
+}
+
+
+def isi_statistik(apps, schema_editor):
+    """
+    Mengisi StatistikHarian dari semua Konsultasi yang sudah ada, seperti
+    `rebuild_statistik_harian`, tetapi dengan beberapa query GROUP BY untuk semua user
+    sekaligus (seperti statistik.hitung_ulang_sejak) alih-alih satu hitungan per hari.
+    """
+    Konsultasi = apps.get_model('accounts', 'Konsultasi')
+    StatistikHarian = apps.get_model('accounts', 'StatistikHarian')
+    db = schema_editor.connection.alias
+    konsultasi = Konsultasi.objects.using(db).filter(user__isnull=False)
+    rows = konsultasi.annotate(tanggal=TruncDate('tanggal_dibuat'))
+
+    per_hari = {}
+    for data in rows.values('user_id', 'tanggal').annotate(
+        total_dibuat=Count('pk'),
+        **{kolom: Count('pk', filter=Q(status=status)) for status, kolom in STATUS_KOLOM.items()}
+    ).order_by():
+        per_hari[(data.pop('user_id'), data.pop('tanggal'))] = data
+
+    per_layanan = {}
+    for user_id, tanggal, layanan, jumlah in (
+        rows.filter(jenis_layanan__gt='').values_list('user_id', 'tanggal', 'jenis_layanan')
+        .annotate(Count('pk')).order_by()
+    ):
+        per_layanan.setdefault((user_id, tanggal), {})[layanan] = jumlah
+
+    # Klien baru dihitung pada hari kontak pertamanya dengan konsultan tersebut
+    klien_baru = Counter(
+        (user_id, timezone.localdate(pertama))
+        for user_id, pertama in konsultasi.values('user_id', 'email').annotate(pertama=Min('tanggal_dibuat'))
+        .values_list('user_id', 'pertama').order_by()
+    )
+
+    StatistikHarian.objects.using(db).bulk_create([
+        StatistikHarian(
+            user_id=user_id,
+            tanggal=tanggal,
+            klien_baru=klien_baru[(user_id, tanggal)],
+            per_layanan=per_layanan.get((user_id, tanggal), {}),
+            **counts,
+        )
+        for (user_id, tanggal), counts in sorted(per_hari.items())
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_konsultasi_jenis_layanan'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatistikHarian',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tanggal', models.DateField()),
+                ('total_dibuat', models.PositiveIntegerField(default=0)),
+                ('klien_baru', models.PositiveIntegerField(default=0)),
+                ('jumlah_pending', models.PositiveIntegerField(default=0)),
+                ('jumlah_terjadwal', models.PositiveIntegerField(default=0)),
+                ('jumlah_selesai', models.PositiveIntegerField(default=0)),
+                ('jumlah_dibatalkan', models.PositiveIntegerField(default=0)),
+                ('per_layanan', models.JSONField(blank=True, default=dict)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statistik_harian', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Statistik Harian',
+                'constraints': [models.UniqueConstraint(fields=('user', 'tanggal'), name='statistik_harian_unik')],
+            },
+        ),
+        migrations.RunPython(isi_statistik, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations, OperationalError
+
+# Salinan definisi di accounts/pencarian.py; migrasi tidak mengimpor kode aplikasi
+FTS_TABLE = 'accounts_konsultasi_fts'
+KOLOM = ('nama', 'email', 'no_hp', 'minat_karir', 'jurusan')
+
+
+def buat_indeks_pencarian(apps, schema_editor):
+    """
+    Membuat tabel FTS5 untuk pencarian konsultasi dan mengisinya dari data yang ada.
+    Hanya untuk SQLite dengan FTS5; backend lain memakai fallback icontains.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    kolom = ', '.join(KOLOM)
+    sumber = ', '.join(f"COALESCE({k}, '')" for k in KOLOM)
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{kolom}, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+    except OperationalError:
+        # SQLite tanpa FTS5
+        return
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, {kolom}) SELECT id, {sumber} FROM accounts_konsultasi"
+    )
+
+
+def hapus_indeks_pencarian(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_statistikharian'),
+    ]
+
+    operations = [
+        migrations.RunPython(buat_indeks_pencarian, hapus_indeks_pencarian),
+    ]
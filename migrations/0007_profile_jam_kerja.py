@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:10
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_konsultasi_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='durasi_slot',
+            field=models.PositiveSmallIntegerField(default=60, help_text='Durasi satu janji temu dalam menit.'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='hari_kerja',
+            field=models.CharField(default='0,1,2,3,4', help_text='Nomor hari kerja dipisah koma (0 = Senin).', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='jam_mulai_kerja',
+            field=models.TimeField(default=datetime.time(9, 0)),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='jam_selesai_kerja',
+            field=models.TimeField(default=datetime.time(17, 0)),
+        ),
+    ]
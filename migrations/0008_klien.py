@@ -0,0 +1,118 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# Salinan aturan di accounts/klien.py; migrasi tidak mengimpor kode aplikasi
+BATCH_SIZE = 5000
+
+
+def normalisasi_email(email):
+    return (email or '').strip().lower()
+
+
+def isi_klien(apps, schema_editor):
+    """
+    Membuat Klien untuk setiap pasangan (user, email ternormalisasi) yang sudah ada,
+    menautkan Konsultasi ke Klien-nya, lalu menghitung penghitung Klien sekaligus.
+    """
+    Konsultasi = apps.get_model('accounts', 'Konsultasi')
+    Klien = apps.get_model('accounts', 'Klien')
+    db = schema_editor.connection.alias
+    connection = schema_editor.connection
+    tabel = connection.ops.quote_name(Konsultasi._meta.db_table)
+    sekarang = timezone.now()
+
+    klien = {}
+    rows = Konsultasi.objects.using(db).order_by('pk').values_list('pk', 'user_id', 'email')
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            _tautkan(Klien, db, connection, tabel, klien, batch, sekarang)
+            batch = []
+    _tautkan(Klien, db, connection, tabel, klien, batch, sekarang)
+
+    baris = Konsultasi.objects.using(db).filter(klien=OuterRef('pk')).order_by()
+    terbaru = baris.order_by('-tanggal_dibuat', '-pk')
+    Klien.objects.using(db).update(
+        jumlah_konsultasi=Coalesce(Subquery(baris.values('klien').annotate(n=Count('pk')).values('n')), 0),
+        kontak_pertama=Coalesce(
+            Subquery(baris.order_by('tanggal_dibuat', 'pk').values('tanggal_dibuat')[:1]), F('kontak_pertama')
+        ),
+        kontak_terakhir=Coalesce(Subquery(terbaru.values('tanggal_dibuat')[:1]), F('kontak_terakhir')),
+        nama=Coalesce(Subquery(terbaru.values('nama')[:1]), F('nama')),
+        status_terakhir=Coalesce(Subquery(terbaru.values('status')[:1]), F('status_terakhir')),
+    )
+
+
+def _tautkan(Klien, db, connection, tabel, klien, batch, sekarang):
+    kunci = {(user_id, normalisasi_email(email)) for _, user_id, email in batch}
+    baru = [
+        Klien(user_id=user_id, email=email, nama='', kontak_pertama=sekarang, kontak_terakhir=sekarang)
+        for user_id, email in kunci if (user_id, email) not in klien
+    ]
+    Klien.objects.using(db).bulk_create(baru, batch_size=500)
+    for obj in baru:
+        if obj.pk is None:
+            # Backend yang tidak mengembalikan primary key dari bulk_create
+            obj.pk = Klien.objects.using(db).get(user_id=obj.user_id, email=obj.email).pk
+        klien[(obj.user_id, obj.email)] = obj.pk
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'UPDATE {tabel} SET klien_id = %s WHERE id = %s',
+            [[klien[(user_id, normalisasi_email(email))], pk] for pk, user_id, email in batch],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_profile_jam_kerja'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Klien',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(max_length=254)),
+                ('nama', models.CharField(max_length=100)),
+                ('status_terakhir', models.CharField(default='pending', max_length=50)),
+                ('kontak_pertama', models.DateTimeField()),
+                ('kontak_terakhir', models.DateTimeField()),
+                ('jumlah_konsultasi', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='klien', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Klien',
+            },
+        ),
+        migrations.AddField(
+            model_name='konsultasi',
+            name='klien',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='konsultasi', to='accounts.klien'),
+        ),
+        migrations.AddIndex(
+            model_name='konsultasi',
+            index=models.Index(fields=['klien', 'tanggal_dibuat'], name='konsultasi_klien_dibuat'),
+        ),
+        migrations.AddIndex(
+            model_name='klien',
+            index=models.Index(fields=['user', 'kontak_pertama'], name='klien_user_kontak_pertama'),
+        ),
+        migrations.AddConstraint(
+            model_name='klien',
+            constraint=models.UniqueConstraint(fields=('user', 'email'), name='klien_user_email_unik'),
+        ),
+        migrations.AddConstraint(
+            model_name='klien',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('email',), name='klien_publik_email_unik'),
+        ),
+        migrations.RunPython(isi_klien, migrations.RunPython.noop),
+    ]
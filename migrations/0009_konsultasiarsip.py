@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_klien'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KonsultasiArsip',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('nama', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('no_hp', models.CharField(blank=True, max_length=20, null=True)),
+                ('jurusan', models.CharField(blank=True, max_length=100, null=True)),
+                ('minat_karir', models.TextField(blank=True, null=True)),
+                ('jenis_layanan', models.CharField(blank=True, max_length=100, null=True)),
+                ('tanggal_janji', models.DateField(blank=True, null=True)),
+                ('waktu_janji', models.TimeField(blank=True, null=True)),
+                ('status', models.CharField(max_length=50)),
+                ('tanggal_dibuat', models.DateTimeField()),
+                ('tanggal_diarsipkan', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Konsultasi (arsip)',
+                'verbose_name_plural': 'Konsultasi (arsip)',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='konsultasi',
+            index=models.Index(fields=['status', 'tanggal_dibuat'], name='konsultasi_status_dibuat'),
+        ),
+        migrations.AddField(
+            model_name='konsultasiarsip',
+            name='klien',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='konsultasi_arsip', to='accounts.klien'),
+        ),
+        migrations.AddField(
+            model_name='konsultasiarsip',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='konsultasi_arsip', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='konsultasiarsip',
+            index=models.Index(fields=['user', 'tanggal_dibuat'], name='arsip_user_dibuat'),
+        ),
+        migrations.AddIndex(
+            model_name='konsultasiarsip',
+            index=models.Index(fields=['user', 'email', 'tanggal_dibuat'], name='arsip_user_email'),
+        ),
+        migrations.AddIndex(
+            model_name='konsultasiarsip',
+            index=models.Index(fields=['klien', 'tanggal_dibuat'], name='arsip_klien_dibuat'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_versidata'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='klien',
+            index=models.Index(fields=['user', 'kontak_terakhir'], name='klien_user_kontak_terakhir'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_klien_kontak_terakhir'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='statistikharian',
+            name='klien_baru',
+        ),
+    ]
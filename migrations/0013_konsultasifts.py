@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_remove_statistikharian_klien_baru'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KonsultasiFTS',
+            fields=[
+                ('konsultasi', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='fts', serialize=False, to='accounts.konsultasi')),
+            ],
+            options={
+                'db_table': 'accounts_konsultasi_fts',
+                'managed': False,
+            },
+        ),
+    ]
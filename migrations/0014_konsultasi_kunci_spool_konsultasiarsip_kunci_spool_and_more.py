@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:17
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_konsultasifts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='konsultasi',
+            name='kunci_spool',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='konsultasiarsip',
+            name='kunci_spool',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='konsultasi',
+            name='tanggal_dibuat',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_konsultasi_kunci_spool_konsultasiarsip_kunci_spool_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='konsultasiarsip',
+            index=models.Index(fields=['email'], name='arsip_email'),
+        ),
+    ]
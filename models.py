@@ -1,8 +1,60 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.backends.signals import connection_created
 from django.contrib.auth.models import User
 from datetime import date, time
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
+from django.utils import timezone
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    Menerapkan settings.SQLITE_PRAGMAS (WAL, synchronous, busy_timeout, cache, mmap)
+    pada setiap koneksi SQLite baru.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+# Status konsultasi yang dipakai di seluruh aplikasi
+STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('terjadwal', 'Terjadwal'),
+    ('selesai', 'Selesai'),
+    ('dibatalkan', 'Dibatalkan'),
+]
+
+# Status konsultasi yang sudah selesai diproses; hanya ini yang dipindahkan ke arsip
+STATUS_DITUTUP = ('selesai', 'dibatalkan')
+
+# Hari dalam seminggu sesuai date.weekday() (0 = Senin)
+HARI_CHOICES = [
+    (0, 'Senin'),
+    (1, 'Selasa'),
+    (2, 'Rabu'),
+    (3, 'Kamis'),
+    (4, 'Jumat'),
+    (5, 'Sabtu'),
+    (6, 'Minggu'),
+]
+
+# Nilai yang disimpan formulir publik lama ketika jenis layanan tidak dipilih
+LAYANAN_TIDAK_DITENTUKAN = 'Tidak Specified'
+
+def parse_jenis_layanan(minat_karir):
+    """
+    Mengekstrak jenis layanan dari format minat_karir formulir publik
+    ("Jenis Layanan: ...\nPesan: ..."). Mengembalikan None jika tidak ada.
+    """
+    if not minat_karir or "Jenis Layanan:" not in minat_karir:
+        return None
+    service_name = minat_karir.split("Jenis Layanan:")[1].split("\n")[0].strip()
+    if not service_name or service_name == LAYANAN_TIDAK_DITENTUKAN:
+        return None
+    return service_name[:100]
 
 class Konsultasi(models.Model):
     """
@@ -15,16 +67,196 @@ class Konsultasi(models.Model):
     no_hp = models.CharField(max_length=20, blank=True, null=True)
     jurusan = models.CharField(max_length=100, blank=True, null=True) 
     minat_karir = models.TextField(blank=True, null=True)
+    jenis_layanan = models.CharField(max_length=100, blank=True, null=True)
     tanggal_janji = models.DateField(null=True, blank=True)
     waktu_janji = models.TimeField(null=True, blank=True)
     status = models.CharField(max_length=50, default='pending') 
-    tanggal_dibuat = models.DateTimeField(auto_now_add=True)
+    # Bukan auto_now_add: impor, spool, dan data sintetis mengisi waktu asli langsung di bulk_create
+    tanggal_dibuat = models.DateTimeField(default=timezone.now, editable=False)
+    # Diisi otomatis dari (user, email) saat disimpan, lihat klien.py
+    klien = models.ForeignKey(
+        'Klien', on_delete=models.SET_NULL, null=True, blank=True, related_name='konsultasi', db_index=False
+    )
+    # Kunci idempotensi permintaan dari spool formulir publik (lihat spool_konsultasi.py)
+    kunci_spool = models.UUIDField(null=True, blank=True, unique=True, editable=False)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Simpan nilai awal agar klien dan statistik harian lama ikut diperbarui saat field ini
+        # berubah; field yang ditunda (.only/.defer) tidak dicatat
+        instance._nilai_awal = {
+            name: instance.__dict__[name]
+            for name in ('user_id', 'email', 'tanggal_dibuat', 'klien_id', 'status', 'jenis_layanan')
+            if name in instance.__dict__
+        }
+        return instance
 
     def __str__(self):
         return f"Konsultasi {self.nama} pada {self.tanggal_janji} {self.waktu_janji}"
 
     class Meta:
         verbose_name_plural = "Konsultasi" 
+        indexes = [
+            # schedule & dashboard: janji terjadwal milik konsultan, urut tanggal/waktu
+            models.Index(fields=['user', 'status', 'tanggal_janji', 'waktu_janji'], name='konsultasi_user_status_janji'),
+            # appointments: semua janji milik konsultan, urut tanggal/waktu
+            models.Index(fields=['user', 'tanggal_janji', 'waktu_janji'], name='konsultasi_user_janji'),
+            # reports: konsultasi milik konsultan per periode tanggal_dibuat
+            models.Index(fields=['user', 'tanggal_dibuat'], name='konsultasi_user_dibuat'),
+            # impor_konsultasi: cek duplikat per (user, email)
+            models.Index(fields=['user', 'email', 'tanggal_dibuat'], name='konsultasi_user_email'),
+            # reports: layanan paling populer (GROUP BY) tanpa membaca minat_karir
+            models.Index(fields=['user', 'jenis_layanan', 'tanggal_dibuat'], name='konsultasi_user_layanan'),
+            # Klien: menghitung ulang penghitung dan mencari konsultasi terakhir per klien
+            models.Index(fields=['klien', 'tanggal_dibuat'], name='konsultasi_klien_dibuat'),
+            # pending_consultations: antrean publik yang belum ditugaskan
+            models.Index(
+                fields=['tanggal_dibuat'],
+                name='konsultasi_antrean_pending',
+                condition=models.Q(user__isnull=True, status='pending'),
+            ),
+            # archive_konsultasi: konsultasi per status yang sudah ditutup, urut dari yang terlama.
+            # Bukan partial index status IN (...): SQLite tidak memakainya untuk query berparameter
+            models.Index(fields=['status', 'tanggal_dibuat'], name='konsultasi_status_dibuat'),
+        ]
+
+class KonsultasiFTS(models.Model):
+    """
+    Tabel virtual FTS5 untuk pencarian konsultasi (dibuat oleh migrasi 0006, hanya di SQLite
+    dengan FTS5), dipetakan agar pencarian bisa di-join lewat ORM; rowid = pk Konsultasi.
+    Isinya ditulis dengan SQL langsung oleh pencarian.py, tidak lewat model ini.
+    """
+    konsultasi = models.OneToOneField(
+        Konsultasi, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid',
+        db_constraint=False, related_name='fts',
+    )
+
+    class Meta:
+        managed = False
+        db_table = 'accounts_konsultasi_fts'
+
+class KonsultasiArsip(models.Model):
+    """
+    Konsultasi ditutup (STATUS_DITUTUP) yang dipindahkan dari tabel Konsultasi oleh perintah
+    `archive_konsultasi` (lihat arsip.py), agar tabel yang dibaca view konsultan tetap kecil.
+    Kolomnya sama dengan Konsultasi dan id aslinya dipertahankan. Baris arsip tidak diubah
+    lagi. StatistikHarian dan Klien tetap menghitungnya, jadi laporan mencakup data aktif
+    maupun arsip.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='konsultasi_arsip')
+    nama = models.CharField(max_length=100)
+    email = models.EmailField()
+    no_hp = models.CharField(max_length=20, blank=True, null=True)
+    jurusan = models.CharField(max_length=100, blank=True, null=True)
+    minat_karir = models.TextField(blank=True, null=True)
+    jenis_layanan = models.CharField(max_length=100, blank=True, null=True)
+    tanggal_janji = models.DateField(null=True, blank=True)
+    waktu_janji = models.TimeField(null=True, blank=True)
+    status = models.CharField(max_length=50)
+    tanggal_dibuat = models.DateTimeField()
+    klien = models.ForeignKey(
+        'Klien', on_delete=models.SET_NULL, null=True, blank=True, related_name='konsultasi_arsip', db_index=False
+    )
+    kunci_spool = models.UUIDField(null=True, blank=True, editable=False)
+    tanggal_diarsipkan = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Arsip konsultasi {self.nama} pada {self.tanggal_janji} {self.waktu_janji}"
+
+    class Meta:
+        verbose_name = "Konsultasi (arsip)"
+        verbose_name_plural = "Konsultasi (arsip)"
+        indexes = [
+            # StatistikHarian: konsultasi milik konsultan per hari tanggal_dibuat
+            models.Index(fields=['user', 'tanggal_dibuat'], name='arsip_user_dibuat'),
+            # impor_konsultasi: cek duplikat per (user, email), termasuk yang sudah diarsipkan
+            models.Index(fields=['user', 'email', 'tanggal_dibuat'], name='arsip_user_email'),
+            # Admin: pencarian arsip dengan email persis, tanpa filter konsultan
+            models.Index(fields=['email'], name='arsip_email'),
+            # Klien: menghitung ulang penghitung per klien
+            models.Index(fields=['klien', 'tanggal_dibuat'], name='arsip_klien_dibuat'),
+        ]
+
+class StatistikHarian(models.Model):
+    """
+    Ringkasan konsultasi per konsultan per hari (kalender lokal) berdasarkan tanggal_dibuat.
+    Diperbarui oleh sinyal Konsultasi dan dapat dibangun ulang dengan
+    perintah `rebuild_statistik_harian`.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='statistik_harian')
+    tanggal = models.DateField()
+    total_dibuat = models.PositiveIntegerField(default=0)
+    jumlah_pending = models.PositiveIntegerField(default=0)
+    jumlah_terjadwal = models.PositiveIntegerField(default=0)
+    jumlah_selesai = models.PositiveIntegerField(default=0)
+    jumlah_dibatalkan = models.PositiveIntegerField(default=0)
+    # {jenis_layanan: jumlah}
+    per_layanan = models.JSONField(default=dict, blank=True)
+
+    def __str__(self):
+        return f"Statistik {self.user} {self.tanggal}"
+
+    class Meta:
+        verbose_name_plural = "Statistik Harian"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'tanggal'], name='statistik_harian_unik'),
+        ]
+
+class Klien(models.Model):
+    """
+    Klien seorang konsultan: satu baris per pasangan (user, email ternormalisasi), ditautkan
+    dari Konsultasi.klien. Kontak pertama/terakhir, jumlah konsultasi, dan status terakhir
+    diperbarui saat Konsultasi ditulis (lihat klien.py), sehingga jumlah klien dan klien
+    baru per periode cukup dibaca lewat index. Klien tanpa user adalah pengirim formulir
+    publik yang konsultasinya belum ditugaskan.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='klien')
+    # Email dalam huruf kecil tanpa spasi di tepi (klien.normalisasi_email)
+    email = models.EmailField()
+    # Nama dan status dari konsultasi terakhir klien
+    nama = models.CharField(max_length=100)
+    status_terakhir = models.CharField(max_length=50, default='pending')
+    kontak_pertama = models.DateTimeField()
+    kontak_terakhir = models.DateTimeField()
+    jumlah_konsultasi = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.nama} <{self.email}>"
+
+    class Meta:
+        verbose_name_plural = "Klien"
+        constraints = [
+            # Index unik ini juga melayani jumlah klien per konsultan
+            models.UniqueConstraint(fields=['user', 'email'], name='klien_user_email_unik'),
+            # NULL tidak dianggap sama oleh constraint di atas
+            models.UniqueConstraint(fields=['email'], condition=models.Q(user__isnull=True), name='klien_publik_email_unik'),
+        ]
+        indexes = [
+            # dashboard & reports: klien baru per periode
+            models.Index(fields=['user', 'kontak_pertama'], name='klien_user_kontak_pertama'),
+            # daftar & ekspor klien: urut kontak terakhir (keyset)
+            models.Index(fields=['user', 'kontak_terakhir'], name='klien_user_kontak_terakhir'),
+        ]
+
+class VersiData(models.Model):
+    """
+    Penghitung versi data konsultasi per konsultan, dinaikkan oleh dashboard_cache.invalidate
+    setiap kali data konsultasinya berubah. Disimpan di database, bukan di cache, agar semua
+    worker melihat versi yang sama untuk ETag API dan kunci cache dashboard.
+    """
+    # Tanpa constraint FK: invalidate tetap dipanggil setelah user (dan konsultasinya) dihapus
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, db_constraint=False, related_name='versi_data',
+    )
+    versi = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Versi data {self.user_id}: {self.versi}"
+
+    class Meta:
+        verbose_name_plural = "Versi Data"
 
 class Profile(models.Model):
     """
@@ -39,21 +271,82 @@ class Profile(models.Model):
     tanggal_lahir = models.DateField(blank=True, null=True)
     jenis_kelamin = models.CharField(max_length=10, blank=True, null=True, choices=[('Pria', 'Pria'), ('Wanita', 'Wanita'), ('Lainnya', 'Lainnya')])
 
+    # Ketersediaan konsultan untuk janji temu (lihat ketersediaan.py)
+    jam_mulai_kerja = models.TimeField(default=time(9, 0))
+    jam_selesai_kerja = models.TimeField(default=time(17, 0))
+    durasi_slot = models.PositiveSmallIntegerField(default=60, help_text="Durasi satu janji temu dalam menit.")
+    hari_kerja = models.CharField(max_length=20, default='0,1,2,3,4', help_text="Nomor hari kerja dipisah koma (0 = Senin).")
+
 
     def __str__(self):
         return self.user.username
 
-@receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
+    def daftar_hari_kerja(self):
+        """
+        Mengembalikan hari kerja sebagai list angka weekday (0 = Senin).
+        """
+        return [int(hari) for hari in (self.hari_kerja or '').split(',') if hari.strip().isdigit()]
+
+def get_profile(user):
     """
-    Membuat objek Profile baru saat objek User baru dibuat.
+    Satu-satunya tempat Profile dibuat: mengembalikan profil user, membuatnya
+    terlebih dahulu jika belum ada. Menyimpan User tidak lagi menulis ke Profile.
+    """
+    try:
+        return user.profile
+    except Profile.DoesNotExist:
+        profile, _ = Profile.objects.get_or_create(user=user)
+        user.profile = profile
+        return profile
+
+@receiver(pre_save, sender=Konsultasi)
+def konsultasi_pre_save(sender, instance, raw=False, using=None, **kwargs):
     """
+    Menautkan Konsultasi ke Klien milik pasangan (user, email) sebelum disimpan.
+    """
+    if raw:
+        return
+    from .klien import tautkan_konsultasi
+
+    tautkan_konsultasi(instance, using=using or 'default')
+
+@receiver(post_save, sender=Konsultasi)
+def konsultasi_post_save(sender, instance, created=False, raw=False, using=None, **kwargs):
+    """
+    Memperbarui penghitung Klien, StatistikHarian dan indeks pencarian yang terdampak,
+    lalu membuang cache dashboard konsultan lama maupun baru saat Konsultasi disimpan.
+    """
+    if raw:
+        return
+    from . import dashboard_cache
+    from .klien import catat_konsultasi_baru, hitung_ulang_klien
+    from .pencarian import indeks_konsultasi
+    from .statistik import perbarui_statistik_konsultasi
+
+    awal = getattr(instance, '_nilai_awal', None) or {}
+    user_ids = (awal.get('user_id'), instance.user_id)
     if created:
-        Profile.objects.create(user=instance)
+        catat_konsultasi_baru(instance, using=using or 'default')
+    else:
+        hitung_ulang_klien((awal.get('klien_id'), instance.klien_id), using=using or 'default')
+    perbarui_statistik_konsultasi(instance)
+    indeks_konsultasi(instance)
+    transaction.on_commit(lambda: dashboard_cache.invalidate(*user_ids))
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+@receiver(post_delete, sender=Konsultasi)
+def konsultasi_post_delete(sender, instance, using=None, **kwargs):
     """
-    Memastikan objek Profile disimpan saat objek User disimpan.
+    Memperbarui penghitung Klien, StatistikHarian dan indeks pencarian yang terdampak,
+    lalu membuang cache dashboard konsultan saat Konsultasi dihapus.
     """
-    instance.profile.save()
+    from . import dashboard_cache
+    from .klien import hitung_ulang_klien
+    from .pencarian import hapus_dari_indeks
+    from .statistik import perbarui_statistik_konsultasi
+
+    awal = getattr(instance, '_nilai_awal', None) or {}
+    user_ids = (awal.get('user_id'), instance.user_id)
+    hitung_ulang_klien((instance.klien_id,), using=using or 'default')
+    perbarui_statistik_konsultasi(instance, dihapus=True)
+    hapus_dari_indeks(instance.pk, using=instance._state.db or 'default')
+    transaction.on_commit(lambda: dashboard_cache.invalidate(*user_ids))
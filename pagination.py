@@ -0,0 +1,131 @@
+# accounts/pagination.py
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+
+class KeysetPage:
+    """
+    Satu halaman hasil keyset pagination.
+    Menyimpan objek di halaman ini beserta cursor untuk halaman berikutnya.
+    """
+    def __init__(self, object_list, next_cursor, cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.cursor = cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+def encode_cursor(values):
+    """
+    Mengubah nilai kolom urutan menjadi string cursor yang aman untuk URL.
+    """
+    raw = json.dumps([None if v is None else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(model, fields, cursor):
+    """
+    Mengubah string cursor kembali menjadi nilai Python sesuai tipe field.
+    Mengembalikan None jika cursor kosong atau tidak valid.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(raw, list) or len(raw) != len(fields):
+            return None
+        return [
+            None if value is None else _get_field(model, name).to_python(value)
+            for name, value in zip(fields, raw)
+        ]
+    except (ValueError, TypeError, ValidationError):
+        return None
+
+
+def keyset_filter(fields, values):
+    """
+    Membangun kondisi "baris sesudah cursor" untuk urutan multi-kolom:
+    (a > va) OR (a = va AND b > vb) OR ...
+    Field dengan awalan '-' diurutkan menurun sehingga memakai '<'.
+    NULL dianggap paling awal pada urutan naik dan paling akhir pada urutan turun,
+    sesuai urutan yang dipakai paginate_keyset.
+    """
+    condition = Q()
+    equal_so_far = Q()
+    for name, value in zip(fields, values):
+        column = name.lstrip('-')
+        descending = name.startswith('-')
+        if value is None:
+            after = Q(pk__in=[]) if descending else Q(**{f'{column}__isnull': False})
+            equal = Q(**{f'{column}__isnull': True})
+        else:
+            after = Q(**{f'{column}__{"lt" if descending else "gt"}': value})
+            if descending:
+                after |= Q(**{f'{column}__isnull': True})
+            equal = Q(**{column: value})
+        condition |= equal_so_far & after
+        equal_so_far &= equal
+    return condition
+
+
+def keyset_queryset(queryset, fields, cursor=None):
+    """
+    Mengurutkan queryset menurut `fields` dan memfilter baris sesudah cursor.
+    """
+    queryset = queryset.order_by(*[_ordering(name) for name in fields])
+    values = decode_cursor(queryset.model, fields, cursor)
+    if values is not None:
+        queryset = queryset.filter(keyset_filter(fields, values))
+    return queryset
+
+
+def paginate_keyset(queryset, fields, cursor=None, page_size=50):
+    """
+    Mengambil satu halaman dari queryset dengan keyset pagination.
+    `fields` adalah urutan kolom (kolom terakhir harus unik, biasanya 'pk').
+    Biaya query tetap sebanding dengan page_size, bukan posisi halaman.
+    """
+    queryset = keyset_queryset(queryset, fields, cursor)
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor([_key_value(last, name) for name in fields])
+    return KeysetPage(rows, next_cursor, cursor)
+
+
+def _ordering(name):
+    if name.startswith('-'):
+        return F(name[1:]).desc(nulls_last=True)
+    return F(name).asc(nulls_first=True)
+
+
+def _get_field(model, name):
+    column = name.lstrip('-')
+    if column == 'pk':
+        return model._meta.pk
+    return model._meta.get_field(column)
+
+
+def _key_value(obj, name):
+    column = name.lstrip('-')
+    if isinstance(obj, dict):
+        return obj[column]
+    return getattr(obj, column)
@@ -0,0 +1,150 @@
+# accounts/pencarian.py
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Konsultasi, KonsultasiFTS
+
+# Tabel virtual FTS5 dengan rowid = pk Konsultasi (dibuat oleh migrasi 0006)
+FTS_TABLE = KonsultasiFTS._meta.db_table
+
+# Kolom yang diindeks beserta bobot bm25; kecocokan nama lebih penting daripada minat karir
+KOLOM_PENCARIAN = (
+    ('nama', 10.0),
+    ('email', 5.0),
+    ('no_hp', 5.0),
+    ('minat_karir', 1.0),
+    ('jurusan', 2.0),
+)
+
+# Batas hasil pencarian di sisi konsultan
+MAKS_HASIL = 50
+
+_fts_per_database = {}
+
+
+def fts_tersedia(using='default'):
+    """
+    True jika database `using` adalah SQLite dan tabel indeks FTS5 sudah dibuat.
+    Hasil pengecekan disimpan per alias database.
+    """
+    if using not in _fts_per_database:
+        connection = connections[using]
+        tersedia = False
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+                )
+                tersedia = cursor.fetchone() is not None
+        _fts_per_database[using] = tersedia
+    return _fts_per_database[using]
+
+
+def query_fts(teks):
+    """
+    Mengubah input bebas pengguna menjadi ekspresi MATCH FTS5 yang aman:
+    setiap kata dijadikan frasa berkutip dengan pencocokan awalan, semua kata wajib ada.
+    Mengembalikan None jika tidak ada kata yang bisa dicari.
+    """
+    kata = re.findall(r'\S+', teks or '')
+    if not kata:
+        return None
+    return ' '.join('"%s"*' % k.replace('"', '""') for k in kata)
+
+
+def cari_konsultasi(queryset, teks):
+    """
+    Menyaring `queryset` Konsultasi dengan teks pencarian dan mengurutkannya
+    berdasarkan relevansi (bm25, makin kecil makin relevan).
+    Tanpa FTS5 (misal PostgreSQL), dipakai icontains per kata, urut dari yang terbaru.
+    """
+    query = query_fts(teks)
+    if query is None:
+        return queryset.none()
+
+    if fts_tersedia(queryset.db):
+        bobot = ', '.join(str(b) for _, b in KOLOM_PENCARIAN)
+        # fts__isnull=False membuat INNER JOIN ke KonsultasiFTS dengan alias nama tabelnya,
+        # sehingga MATCH dan bm25 dihitung sekali per baris yang cocok
+        return queryset.filter(
+            RawSQL(f'{FTS_TABLE} MATCH %s', [query], output_field=BooleanField()),
+            fts__isnull=False,
+        ).annotate(
+            relevansi=RawSQL(f'bm25({FTS_TABLE}, {bobot})', [], output_field=FloatField()),
+        ).order_by('relevansi', '-pk')
+
+    kondisi = [
+        reduce(or_, (Q(**{f'{kolom}__icontains': kata}) for kolom, _ in KOLOM_PENCARIAN))
+        for kata in teks.split()
+    ]
+    return queryset.filter(reduce(and_, kondisi)).order_by('-tanggal_dibuat', '-pk')
+
+
+def _nilai_indeks(konsultasi):
+    return [konsultasi.pk] + [getattr(konsultasi, kolom) or '' for kolom, _ in KOLOM_PENCARIAN]
+
+
+def indeks_banyak(daftar_konsultasi, using='default'):
+    """
+    Menulis ulang baris indeks untuk Konsultasi yang diberikan.
+    Dipanggil oleh sinyal post_save, dan secara eksplisit setelah bulk_create
+    yang tidak memicu sinyal.
+    """
+    if not fts_tersedia(using):
+        return
+    rows = [_nilai_indeks(k) for k in daftar_konsultasi if k.pk is not None]
+    if not rows:
+        return
+    kolom = ', '.join(k for k, _ in KOLOM_PENCARIAN)
+    placeholder = ', '.join(['%s'] * (len(KOLOM_PENCARIAN) + 1))
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [[row[0]] for row in rows])
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, {kolom}) VALUES ({placeholder})', rows
+        )
+
+
+def indeks_konsultasi(konsultasi):
+    indeks_banyak([konsultasi], using=konsultasi._state.db or 'default')
+
+
+def hapus_dari_indeks(pk, using='default'):
+    if not fts_tersedia(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+
+def hapus_queryset_dari_indeks(queryset):
+    """
+    Menghapus baris indeks untuk semua Konsultasi di `queryset` dengan satu DELETE
+    bersubquery, misal sebelum menghapus banyak baris dengan SQL langsung.
+    """
+    if not fts_tersedia(queryset.db):
+        return
+    sql, params = queryset.values('pk').query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({sql})', params)
+
+
+def bangun_ulang_indeks(using='default'):
+    """
+    Mengisi ulang seluruh indeks dari tabel Konsultasi.
+    Mengembalikan jumlah baris yang diindeks, atau None jika FTS5 tidak tersedia.
+    """
+    if not fts_tersedia(using):
+        return None
+    tabel = Konsultasi._meta.db_table
+    kolom = ', '.join(k for k, _ in KOLOM_PENCARIAN)
+    sumber = ', '.join(f"COALESCE({k}, '')" for k, _ in KOLOM_PENCARIAN)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, {kolom}) SELECT id, {sumber} FROM {tabel}')
+        cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
+
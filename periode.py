@@ -0,0 +1,59 @@
+# accounts/periode.py
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple
+
+from django.db.models import Q
+from django.utils import timezone
+
+
+def batas_hari(tanggal):
+    """
+    Mengembalikan rentang waktu aware [awal, akhir) untuk satu tanggal kalender lokal.
+    """
+    tz = timezone.get_current_timezone()
+    awal = timezone.make_aware(datetime.combine(tanggal, time.min), tz)
+    akhir = timezone.make_aware(datetime.combine(tanggal + timedelta(days=1), time.min), tz)
+    return awal, akhir
+
+
+class Periode(NamedTuple):
+    """
+    Periode tanggal kalender lokal (settings.TIME_ZONE) yang setengah terbuka:
+    mulai <= tanggal < sampai.
+    Semua filter tanggal di view konsultan dibuat lewat kelas ini. Hasilnya predikat rentang
+    biasa (kolom >= awal AND kolom < akhir) yang bisa memakai index. Lookup __date,
+    __month, dan __year tidak dipakai karena membungkus kolom setiap baris dengan fungsi
+    konversi zona waktu.
+    """
+    mulai: date
+    sampai: date
+
+    @classmethod
+    def hari(cls, tanggal=None):
+        """Satu hari kalender lokal (default: hari ini)."""
+        tanggal = tanggal or timezone.localdate()
+        return cls(tanggal, tanggal + timedelta(days=1))
+
+    @classmethod
+    def bulan(cls, tanggal=None):
+        """Bulan kalender lokal yang memuat `tanggal` (default: bulan ini)."""
+        awal = (tanggal or timezone.localdate()).replace(day=1)
+        return cls(awal, (awal + timedelta(days=32)).replace(day=1))
+
+    @classmethod
+    def antara(cls, dari, sampai):
+        """Periode dari tanggal `dari` sampai dengan tanggal `sampai` (keduanya termasuk)."""
+        return cls(dari, sampai + timedelta(days=1))
+
+    def batas_waktu(self):
+        """Rentang waktu aware [awal, akhir) periode ini, dari tengah malam lokal ke tengah malam lokal."""
+        return batas_hari(self.mulai)[0], batas_hari(self.sampai)[0]
+
+    def q_tanggal(self, field):
+        """Predikat untuk kolom DateField: mulai <= field < sampai."""
+        return Q(**{f'{field}__gte': self.mulai, f'{field}__lt': self.sampai})
+
+    def q_waktu(self, field):
+        """Predikat untuk kolom DateTimeField: awal <= field < akhir dalam waktu aware."""
+        awal, akhir = self.batas_waktu()
+        return Q(**{f'{field}__gte': awal, f'{field}__lt': akhir})
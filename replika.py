@@ -0,0 +1,176 @@
+# accounts/replika.py
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Cookie penanda bahwa browser ini baru saja menulis; selama cookie ada, semua baca ke primary
+COOKIE_LENGKET = 'replika_lengket'
+
+# Alias database untuk baca di request/blok yang sedang berjalan (None = biarkan Django memilih)
+_alias_baca = ContextVar('alias_baca_replika', default=None)
+# Status request yang sedang berjalan (None di luar ReplikaMiddleware)
+_status_request = ContextVar('status_request_replika', default=None)
+
+
+def alias_replika():
+    """Alias replika dari settings.REPLIKA_DB_ALIAS, atau None jika replika tidak dikonfigurasi."""
+    alias = getattr(settings, 'REPLIKA_DB_ALIAS', None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+class StatusRequest:
+    """Dicatat selama satu request: apakah ada penulisan ke database."""
+    __slots__ = ('menulis',)
+
+    def __init__(self):
+        self.menulis = False
+
+
+class RouterReplika:
+    """
+    Database router: baca diarahkan ke replika hanya di dalam pakai_replika() (view yang
+    diberi @baca_dari_replika dan changelist admin tertentu); semua baca lain dan semua tulis
+    ke primary. Setiap tulis dicatat agar ReplikaMiddleware bisa membuat browser tersebut
+    "lengket" ke primary (read-your-writes). Replika tidak pernah dimigrasi; isinya
+    disalin dari primary oleh replikasi database (atau `sync_sqlite_replica` saat uji lokal).
+    """
+    def db_for_read(self, model, **hints):
+        return _alias_baca.get()
+
+    def db_for_write(self, model, **hints):
+        status = _status_request.get()
+        if status is not None:
+            status.menulis = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replika berisi data yang sama dengan primary
+        alias = {DEFAULT_DB_ALIAS, alias_replika()}
+        if obj1._state.db in alias and obj2._state.db in alias:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == alias_replika():
+            return False
+        return None
+
+
+def lengket(request):
+    """True jika request ini (atau browser yang mengirimnya, lewat cookie) baru saja menulis."""
+    status = _status_request.get()
+    return (status is not None and status.menulis) or COOKIE_LENGKET in request.COOKIES
+
+
+@contextmanager
+def pakai_replika(request):
+    """
+    Mengarahkan baca di dalam blok ke replika, kecuali replika tidak dikonfigurasi, request
+    bukan GET/HEAD, atau browser masih lengket ke primary setelah menulis.
+    Menghasilkan alias yang dipakai, untuk queryset yang baru dievaluasi setelah blok
+    selesai (misal isi respons streaming): `rows.using(alias)`.
+    """
+    alias = alias_replika()
+    if alias is None or request.method not in ('GET', 'HEAD') or lengket(request):
+        alias = None
+    token = _alias_baca.set(alias)
+    try:
+        yield alias or DEFAULT_DB_ALIAS
+    finally:
+        _alias_baca.reset(token)
+
+
+def baca_dari_replika(view_func):
+    """
+    Decorator untuk view yang hanya membaca: query view dijalankan di replika (lihat
+    pakai_replika). View harus sudah merender respons sebelum kembali; respons streaming
+    perlu memakai alias secara eksplisit lewat alias_aktif(). Mendukung view async.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            with pakai_replika(request):
+                return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with pakai_replika(request):
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def alias_aktif():
+    """Alias baca yang berlaku saat ini: replika di dalam pakai_replika(), selain itu primary."""
+    return _alias_baca.get() or DEFAULT_DB_ALIAS
+
+
+class ReplikaMiddleware:
+    """
+    Mencatat apakah request menulis ke database (lewat RouterReplika.db_for_write). Jika ya,
+    respons memasang cookie COOKIE_LENGKET selama settings.REPLIKA_LENGKET_DETIK sehingga
+    request berikutnya dari browser yang sama membaca dari primary sampai replika menyusul.
+    Letakkan sebelum SessionMiddleware agar penyimpanan session ikut tercatat.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        status = StatusRequest()
+        token = _status_request.set(status)
+        try:
+            response = self.get_response(request)
+        finally:
+            _status_request.reset(token)
+        return self._tandai(status, response)
+
+    async def __acall__(self, request):
+        status = StatusRequest()
+        token = _status_request.set(status)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _status_request.reset(token)
+        return self._tandai(status, response)
+
+    def _tandai(self, status, response):
+        if status.menulis and alias_replika() is not None:
+            response.set_cookie(
+                COOKIE_LENGKET, '1', max_age=settings.REPLIKA_LENGKET_DETIK, httponly=True, samesite='Lax',
+            )
+        return response
+
+
+def salin_sqlite_ke_replika():
+    """
+    Menyalin database SQLite primary ke file replika dengan backup API SQLite (aman selagi
+    primary dipakai). Hanya untuk uji lokal dengan dua file SQLite; replika sungguhan diisi
+    oleh replikasi database.
+    """
+    alias = alias_replika()
+    if alias is None:
+        raise ValueError("Replika tidak dikonfigurasi (settings.REPLIKA_DB_ALIAS).")
+    primary = connections[DEFAULT_DB_ALIAS]
+    if primary.vendor != 'sqlite' or connections[alias].vendor != 'sqlite':
+        raise ValueError("Penyalinan hanya didukung jika primary dan replika sama-sama SQLite.")
+    # Koneksi replika yang terbuka akan membaca file lama; tutup sebelum ditimpa
+    connections[alias].close()
+    primary.ensure_connection()
+    tujuan = sqlite3.connect(str(settings.DATABASES[alias]['NAME']))
+    try:
+        primary.connection.backup(tujuan)
+    finally:
+        tujuan.close()
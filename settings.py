@@ -30,6 +30,10 @@ INSTALLED_APPS = [
 # Middleware yang digunakan oleh Django.
 # Ini menangani sesi, autentikasi, perlindungan CSRF, dll.
 MIDDLEWARE = [
+    # Paling atas agar seluruh request (termasuk query session/autentikasi) ikut diukur
+    'accounts.instrumentasi.InstrumentasiMiddleware',
+    # Sebelum SessionMiddleware agar penyimpanan session ikut dihitung sebagai tulis
+    'accounts.replika.ReplikaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -45,12 +49,22 @@ ROOT_URLCONF = 'konsultan_karir.urls'
 # Konfigurasi template Django.
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates yang waktu render-nya diukur oleh InstrumentasiMiddleware
+        'BACKEND': 'accounts.instrumentasi.DjangoTemplatesTerukur',
+        'NAME': 'django',
         # Direktori di mana Django akan mencari file template.
         # Pastikan ini menunjuk ke folder 'templates' di root proyek Anda.
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True, # Mengizinkan aplikasi untuk memiliki folder 'templates' sendiri
+        # Template dicari di DIRS lalu di folder 'templates' setiap aplikasi (pengganti APP_DIRS),
+        # lewat cached loader: setiap template hanya di-parse sekali per proses.
+        # Saat DEBUG, perubahan file template tetap terdeteksi oleh autoreloader runserver.
         'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -63,16 +77,145 @@ TEMPLATES = [
 
 # Aplikasi WSGI yang digunakan oleh server produksi.
 WSGI_APPLICATION = 'konsultan_karir.wsgi.application'
+# Alternatif ASGI (misal `uvicorn konsultan_karir.asgi:application`). asgi.py melayani URL
+# lewat konsultan_karir.urls_asgi sehingga dashboard, reports, dan halaman publik dilayani
+# versi async; di bawah WSGI view sinkron tetap dipakai.
+ASGI_APPLICATION = 'konsultan_karir.asgi.application'
 
 # Konfigurasi database.
-# Defaultnya adalah SQLite3, cocok untuk pengembangan.
-DATABASES = {
+# Defaultnya adalah SQLite3, cocok untuk pengembangan. Backend dipilih lewat environment:
+# DJANGO_DB_ENGINE = sqlite3 | postgresql | mysql, plus DJANGO_DB_NAME/USER/PASSWORD/HOST/PORT.
+DB_ENGINE = os.environ.get('DJANGO_DB_ENGINE', 'sqlite3')
+
+if DB_ENGINE == 'sqlite3':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DJANGO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Detik menunggu lock dilepas sebelum "database is locked"
+                'timeout': int(os.environ.get('DJANGO_SQLITE_TIMEOUT', 20)),
+                # Transaksi langsung mengambil write lock (Django 5.1+), sehingga tidak gagal
+                # saat transaksi baca harus naik menjadi transaksi tulis
+                'transaction_mode': 'IMMEDIATE',
+            },
+            # Database test berupa file (bukan in-memory) agar test konkurensi bisa membuka
+            # koneksi dari beberapa thread, seperti beberapa worker di produksi
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': f'django.db.backends.{DB_ENGINE}',
+            'NAME': os.environ.get('DJANGO_DB_NAME', 'konsultan_karir'),
+            'USER': os.environ.get('DJANGO_DB_USER', ''),
+            'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', ''),
+            'HOST': os.environ.get('DJANGO_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DJANGO_DB_PORT', ''),
+            # Koneksi persisten dengan health check sebelum dipakai ulang
+            'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if DB_ENGINE == 'postgresql' and os.environ.get('DJANGO_DB_POOL') == '1':
+        # Connection pool psycopg 3 (Django 5.1+); tidak bisa digabung dengan koneksi persisten
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DJANGO_DB_POOL_MIN', 2)),
+            'max_size': int(os.environ.get('DJANGO_DB_POOL_MAX', 10)),
+        }
+
+# Replika baca (opsional). Jika DJANGO_DB_REPLICA_NAME (SQLite: path file replika) atau
+# DJANGO_DB_REPLICA_HOST diisi, alias 'replica' dibuat dari konfigurasi 'default' dan view yang
+# berat membaca (reports, clients, ekspor, changelist admin konsultasi) membacanya lewat
+# accounts.replika.RouterReplika. Browser yang baru menulis tetap membaca dari primary selama
+# REPLIKA_LENGKET_DETIK detik. Untuk uji lokal dengan SQLite: `manage.py sync_sqlite_replica`.
+REPLIKA_DB_ALIAS = 'replica'
+REPLIKA_LENGKET_DETIK = int(os.environ.get('REPLIKA_LENGKET_DETIK', 30))
+if os.environ.get('DJANGO_DB_REPLICA_NAME') or os.environ.get('DJANGO_DB_REPLICA_HOST'):
+    replika = {**DATABASES['default'], 'OPTIONS': dict(DATABASES['default']['OPTIONS'])}
+    for kunci in ('NAME', 'HOST', 'PORT', 'USER', 'PASSWORD'):
+        if os.environ.get(f'DJANGO_DB_REPLICA_{kunci}'):
+            replika[kunci] = os.environ[f'DJANGO_DB_REPLICA_{kunci}']
+    # Replika hanya dibaca; tidak perlu mengambil write lock di awal transaksi
+    replika['OPTIONS'].pop('transaction_mode', None)
+    # Saat test, replika menunjuk ke database test 'default' agar data test terlihat
+    replika['TEST'] = {'MIRROR': 'default'}
+    DATABASES[REPLIKA_DB_ALIAS] = replika
+DATABASE_ROUTERS = ['accounts.replika.RouterReplika']
+
+# PRAGMA yang dijalankan setiap kali koneksi SQLite dibuka (lihat accounts/models.py).
+# WAL membuat pembaca tidak memblokir penulis, sehingga formulir publik dan view konsultan
+# bisa berjalan bersamaan.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,           # milidetik
+    'cache_size': -20000,            # KiB (negatif = ukuran dalam KiB, sekitar 20 MB)
+    'mmap_size': 268435456,          # 256 MB
+    'temp_store': 'MEMORY',
+}
+
+# Konfigurasi cache.
+# Defaultnya local-memory (per proses). Untuk backend bersama (misal Redis atau Memcached),
+# atur DJANGO_CACHE_BACKEND dan DJANGO_CACHE_LOCATION di environment.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'konsultan-karir'),
     }
 }
 
+# Alias cache dan masa berlaku (detik) untuk ringkasan dashboard konsultan.
+DASHBOARD_CACHE_ALIAS = 'default'
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('DASHBOARD_CACHE_TIMEOUT', 300))
+
+# Cache respons lengkap halaman publik (beranda, tentang, kontak, layanan karir) untuk
+# pengunjung anonim, dalam detik. 0 menonaktifkan cache halaman.
+PUBLIC_PAGE_CACHE_ALIAS = 'default'
+PUBLIC_PAGE_CACHE_TIMEOUT = int(os.environ.get('PUBLIC_PAGE_CACHE_TIMEOUT', 600))
+
+# Instrumentasi performa per view (accounts.instrumentasi.InstrumentasiMiddleware).
+# Jumlah request terakhir yang disimpan per proses untuk halaman performa staf.
+PERF_BUFFER_SIZE = int(os.environ.get('PERF_BUFFER_SIZE', 500))
+# Anggaran jumlah query per nama view (termasuk query session dan user, dan versi data
+# untuk ETag/cache dashboard).
+# Pelanggaran dicatat sebagai warning; dengan QUERY_BUDGET_STRICT = True (misal saat test)
+# request langsung gagal dengan AnggaranQueryTerlampaui.
+QUERY_BUDGETS = {
+    'dashboard': 7,
+    'clients': 4,
+    'appointments': 4,
+    'reports': 7,
+    'schedule': 6,
+    'search_konsultasi': 5,
+    'pending_consultations': 4,
+    'api_dashboard': 7,
+    'api_reports': 7,
+    'api_appointments': 4,
+    'api_schedule': 6,
+}
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', '') == '1'
+
+# Log instrumentasi (logger 'accounts.instrumentasi'): pelanggaran anggaran query di level
+# WARNING; satu baris JSON per request di level DEBUG, tampil dengan PERF_LOG_LEVEL=DEBUG.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'accounts.instrumentasi': {
+            'handlers': ['console'],
+            'level': os.environ.get('PERF_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 # Validator password bawaan Django.
 # Anda bisa menambahkan atau menghapus validator di sini.
 AUTH_PASSWORD_VALIDATORS = [
@@ -109,8 +252,21 @@ LOGIN_REDIRECT_URL = 'dashboard' # Arahkan ke halaman dashboard setelah login
 LOGOUT_REDIRECT_URL = 'home' # Arahkan ke halaman beranda setelah logout
 
 # Konfigurasi Message Storage
-# Ini penting agar pesan 'messages' (misal: messages.success) berfungsi
-MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
+# Ini penting agar pesan 'messages' (misal: messages.success) berfungsi.
+# Pesan disimpan di cookie terlebih dahulu dan hanya jatuh ke session jika terlalu besar,
+# sehingga pengunjung anonim tidak membuat baris session baru.
+MESSAGE_STORAGE = 'django.contrib.messages.storage.fallback.FallbackStorage'
+
+# Mode penyimpanan formulir konsultasi publik:
+# 'langsung' = Konsultasi.objects.create di dalam request (default),
+# 'spool'    = antrekan ke file SQLite lokal lalu pindahkan per batch dengan
+#              `python manage.py drain_konsultasi_spool --loop`.
+KONSULTASI_INGEST_MODE = os.environ.get('KONSULTASI_INGEST_MODE', 'langsung')
+KONSULTASI_SPOOL_PATH = os.environ.get('KONSULTASI_SPOOL_PATH', BASE_DIR / 'konsultasi_spool.sqlite3')
+
+# Umur (hari) konsultasi selesai/dibatalkan sebelum dipindahkan ke tabel arsip oleh
+# `python manage.py archive_konsultasi` (bisa ditimpa dengan --older-than).
+ARSIP_UMUR_HARI = int(os.environ.get('ARSIP_UMUR_HARI', 365))
 
 # Konfigurasi media (untuk file yang diunggah pengguna, misal: gambar profil)
 # MEDIA_URL = '/media/'
@@ -0,0 +1,120 @@
+# accounts/spool_konsultasi.py
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+
+from .klien import tautkan_banyak
+from .models import Konsultasi
+from .pencarian import indeks_banyak
+
+# Satu koneksi spool per thread; sqlite3.Connection tidak boleh dipakai lintas thread
+_local = threading.local()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spool (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL
+)
+"""
+
+
+def spool_path():
+    return str(getattr(settings, 'KONSULTASI_SPOOL_PATH', settings.BASE_DIR / 'konsultasi_spool.sqlite3'))
+
+
+def _connect(path=None):
+    path = path or spool_path()
+    cached = getattr(_local, 'connections', None)
+    if cached is None:
+        cached = _local.connections = {}
+    conn = cached.get(path)
+    if conn is None:
+        # isolation_level=None: transaksi dikelola manual dengan BEGIN IMMEDIATE
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute(SCHEMA)
+        cached[path] = conn
+    return conn
+
+
+def enqueue(fields, path=None):
+    """
+    Menambahkan satu permintaan konsultasi (dict field Konsultasi) ke spool.
+    Hanya satu INSERT kecil ke file SQLite lokal, terpisah dari database utama.
+    """
+    # kunci_spool membuat drain idempoten: baris yang sudah masuk tidak dibuat lagi
+    payload = dict(fields, tanggal_dibuat=timezone.now(), kunci_spool=uuid.uuid4().hex)
+    _connect(path).execute(
+        'INSERT INTO spool (payload) VALUES (?)', (json.dumps(payload, default=_json_default),)
+    )
+
+
+def pending_count(path=None):
+    return _connect(path).execute('SELECT COUNT(*) FROM spool').fetchone()[0]
+
+
+def drain(batch_size=500, path=None):
+    """
+    Memindahkan satu batch dari spool ke tabel Konsultasi dengan satu bulk_create.
+    Baris spool dihapus dalam transaksi spool yang baru di-commit setelah transaksi database
+    utama berhasil. Jika proses berhenti di antara kedua commit, batch yang sama dibaca lagi
+    pada drain berikutnya; permintaan yang kunci_spool-nya sudah ada di Konsultasi dilewati,
+    sehingga tidak ada konsultasi ganda. Mengembalikan jumlah konsultasi yang dibuat.
+    """
+    conn = _connect(path)
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        rows = conn.execute(
+            'SELECT id, payload FROM spool ORDER BY id LIMIT ?', (batch_size,)
+        ).fetchall()
+        if not rows:
+            conn.execute('ROLLBACK')
+            return 0
+
+        # tanggal_dibuat berisi waktu formulir dikirim, bukan waktu drain
+        objs = [Konsultasi(**_parse_fields(json.loads(payload))) for _, payload in rows]
+
+        with transaction.atomic():
+            # Hanya satu drain yang berjalan (BEGIN IMMEDIATE di spool), jadi cukup dicek sekali.
+            # Arsip tidak perlu dicek: konsultasi baru diarsipkan setelah ARSIP_UMUR_HARI hari
+            kunci = [obj.kunci_spool for obj in objs if obj.kunci_spool]
+            sudah_masuk = set(
+                Konsultasi.objects.filter(kunci_spool__in=kunci).values_list('kunci_spool', flat=True)
+            ) if kunci else set()
+            objs = [obj for obj in objs if obj.kunci_spool not in sudah_masuk]
+            Konsultasi.objects.bulk_create(objs, batch_size=batch_size)
+            # bulk_create tidak memicu sinyal pre_save/post_save
+            indeks_banyak(objs)
+            tautkan_banyak(objs)
+
+        conn.execute('DELETE FROM spool WHERE id <= ?', (rows[-1][0],))
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    return len(objs)
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Tidak bisa diserialisasi: {value!r}")
+
+
+def _parse_fields(fields):
+    fields['tanggal_dibuat'] = parse_datetime(fields['tanggal_dibuat'])
+    if fields.get('kunci_spool'):
+        fields['kunci_spool'] = uuid.UUID(fields['kunci_spool'])
+    if fields.get('tanggal_janji'):
+        fields['tanggal_janji'] = parse_date(fields['tanggal_janji'])
+    if fields.get('waktu_janji'):
+        fields['waktu_janji'] = parse_time(fields['waktu_janji'])
+    return fields
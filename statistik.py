@@ -0,0 +1,235 @@
+# accounts/statistik.py
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Konsultasi, KonsultasiArsip, StatistikHarian
+from .periode import Periode, batas_hari
+
+# Status yang memiliki kolom sendiri di StatistikHarian
+STATUS_KOLOM = {
+    'pending': 'jumlah_pending',
+    'terjadwal': 'jumlah_terjadwal',
+    'selesai': 'jumlah_selesai',
+    'dibatalkan': 'jumlah_dibatalkan',
+}
+
+# Data mentah yang dihitung StatistikHarian: tabel aktif dan arsip (lihat arsip.py)
+SUMBER = (Konsultasi, KonsultasiArsip)
+
+
+# Field Konsultasi yang menentukan kontribusinya pada StatistikHarian
+FIELD_STATISTIK = ('user_id', 'tanggal_dibuat', 'status', 'jenis_layanan')
+
+
+def hitung_ulang_hari(user_id, tanggal):
+    """
+    Menghitung ulang satu baris StatistikHarian dari data Konsultasi mentah, aktif maupun arsip.
+    Hanya membaca konsultasi milik user pada hari tersebut (memakai index user+tanggal_dibuat);
+    arsip hanya diagregasi jika hari tersebut memiliki baris arsip.
+    Dipakai `rebuild_statistik_harian` dan sebagai cadangan jika nilai awal konsultasi tidak
+    diketahui; perubahan biasa memakai perbarui_statistik_banyak.
+    """
+    hari = Periode.hari(tanggal)
+    aktif = Konsultasi.objects.filter(hari.q_waktu('tanggal_dibuat'), user_id=user_id)
+    arsip = KonsultasiArsip.objects.filter(hari.q_waktu('tanggal_dibuat'), user_id=user_id)
+    daftar_rows = [aktif, arsip] if arsip.exists() else [aktif]
+
+    counts = Counter()
+    per_layanan = Counter()
+    for rows in daftar_rows:
+        counts.update(rows.aggregate(
+            total_dibuat=Count('pk'),
+            **{kolom: Count('pk', filter=Q(status=status)) for status, kolom in STATUS_KOLOM.items()}
+        ))
+        per_layanan.update(dict(
+            rows.filter(jenis_layanan__gt='').values_list('jenis_layanan').annotate(Count('pk'))
+        ))
+    if not counts['total_dibuat']:
+        StatistikHarian.objects.filter(user_id=user_id, tanggal=tanggal).delete()
+        return None
+
+    statistik, _ = StatistikHarian.objects.update_or_create(
+        user_id=user_id,
+        tanggal=tanggal,
+        defaults={**counts, 'per_layanan': dict(per_layanan)},
+    )
+    return statistik
+
+
+def nilai_statistik(konsultasi):
+    """
+    Nilai FIELD_STATISTIK konsultasi saat ini, dalam bentuk yang sama dengan Konsultasi._nilai_awal.
+    """
+    return {name: getattr(konsultasi, name) for name in FIELD_STATISTIK}
+
+
+def selisih_statistik(perubahan):
+    """
+    Menghitung selisih StatistikHarian dari pasangan (nilai_awal, nilai_baru) per konsultasi;
+    nilai None berarti konsultasi belum ada (dibuat) atau sudah tidak ada (dihapus).
+    Mengembalikan {(user_id, tanggal): (Counter kolom, Counter per_layanan)}.
+    """
+    selisih = {}
+    for awal, baru in perubahan:
+        for nilai, tanda in ((awal, -1), (baru, 1)):
+            if not nilai or nilai.get('user_id') is None or nilai.get('tanggal_dibuat') is None:
+                continue
+            kolom, layanan = selisih.setdefault(
+                (nilai['user_id'], timezone.localdate(nilai['tanggal_dibuat'])), (Counter(), Counter())
+            )
+            kolom['total_dibuat'] += tanda
+            if nilai.get('status') in STATUS_KOLOM:
+                kolom[STATUS_KOLOM[nilai['status']]] += tanda
+            if nilai.get('jenis_layanan'):
+                layanan[nilai['jenis_layanan']] += tanda
+    return selisih
+
+
+def terapkan_selisih(selisih):
+    """
+    Menambahkan selisih_statistik ke baris StatistikHarian dalam satu transaksi: baris hari
+    baru dibuat lebih dulu (INSERT yang mengabaikan konflik), semua baris terdampak dikunci
+    dan dibaca dengan satu SELECT, lalu ditulis dengan satu bulk UPDATE; baris yang tidak lagi
+    memiliki konsultasi dihapus. Tidak membaca Konsultasi sama sekali.
+    """
+    selisih = {
+        kunci: ({k: v for k, v in kolom.items() if v}, {k: v for k, v in layanan.items() if v})
+        for kunci, (kolom, layanan) in selisih.items()
+    }
+    selisih = {kunci: nilai for kunci, nilai in selisih.items() if nilai[0] or nilai[1]}
+    if not selisih:
+        return
+
+    with transaction.atomic():
+        StatistikHarian.objects.bulk_create([
+            StatistikHarian(user_id=user_id, tanggal=tanggal)
+            for (user_id, tanggal), (kolom, _) in selisih.items() if kolom.get('total_dibuat', 0) > 0
+        ], ignore_conflicts=True)
+
+        kondisi = Q()
+        for user_id, tanggal in selisih:
+            kondisi |= Q(user_id=user_id, tanggal=tanggal)
+        diubah, kosong = [], []
+        for statistik in StatistikHarian.objects.select_for_update().filter(kondisi).order_by('pk'):
+            kolom, layanan = selisih[(statistik.user_id, statistik.tanggal)]
+            for nama, tambahan in kolom.items():
+                # Tidak pernah di bawah nol, walaupun ringkasan sempat tidak sinkron
+                setattr(statistik, nama, max(0, getattr(statistik, nama) + tambahan))
+            per_layanan = Counter(statistik.per_layanan or {})
+            per_layanan.update(layanan)
+            statistik.per_layanan = {nama: jumlah for nama, jumlah in sorted(per_layanan.items()) if jumlah > 0}
+            (diubah if statistik.total_dibuat else kosong).append(statistik)
+
+        if diubah:
+            StatistikHarian.objects.bulk_update(diubah, ['total_dibuat', *STATUS_KOLOM.values(), 'per_layanan'])
+        if kosong:
+            StatistikHarian.objects.filter(pk__in=[statistik.pk for statistik in kosong]).delete()
+
+
+def perbarui_statistik_konsultasi(konsultasi, dihapus=False):
+    """
+    Memperbarui semua baris StatistikHarian yang terdampak oleh perubahan satu Konsultasi.
+    """
+    perbarui_statistik_banyak([konsultasi], dihapus=dihapus)
+
+
+def perbarui_statistik_banyak(daftar_konsultasi, dihapus=False):
+    """
+    Seperti perbarui_statistik_konsultasi, tetapi untuk banyak Konsultasi sekaligus
+    (misal setelah QuerySet.update() yang tidak memicu sinyal).
+    Selisih antara nilai awal (Konsultasi._nilai_awal) dan nilai sekarang diterapkan lewat
+    terapkan_selisih: 2-3 query untuk semua hari yang terdampak. Konsultasi yang dimuat tanpa
+    salah satu FIELD_STATISTIK (misal lewat .only()) tidak punya nilai awal yang lengkap,
+    sehingga hari lama dan barunya dihitung ulang dengan hitung_ulang_hari.
+    """
+    perubahan = []
+    hitung_ulang = set()
+    for konsultasi in daftar_konsultasi:
+        awal = getattr(konsultasi, '_nilai_awal', None)
+        baru = None if dihapus else nilai_statistik(konsultasi)
+        if awal is not None and not all(name in awal for name in FIELD_STATISTIK):
+            for nilai in (awal, baru or {}):
+                user_id = nilai.get('user_id', konsultasi.user_id)
+                dibuat = nilai.get('tanggal_dibuat', konsultasi.tanggal_dibuat)
+                if user_id is not None and dibuat is not None:
+                    hitung_ulang.add((user_id, timezone.localdate(dibuat)))
+        else:
+            perubahan.append((awal, baru))
+        if not dihapus:
+            konsultasi._nilai_awal = {**baru, 'email': konsultasi.email, 'klien_id': konsultasi.klien_id}
+
+    terapkan_selisih(selisih_statistik(perubahan))
+    for user_id, tanggal in sorted(hitung_ulang):
+        hitung_ulang_hari(user_id, tanggal)
+
+
+def hitung_ulang_sejak(user_id, sejak):
+    """
+    Membangun ulang semua StatistikHarian milik user mulai tanggal `sejak`, misal setelah
+    impor data lama yang ditulis dengan bulk_create tanpa sinyal.
+    Berbeda dengan hitung_ulang_hari per hari, semua hari dihitung dengan beberapa query
+    GROUP BY per tabel (aktif dan arsip) lalu ditulis ulang sekaligus.
+    Mengembalikan jumlah hari yang dibangun ulang.
+    """
+    awal, _ = batas_hari(sejak)
+    per_hari = {}
+    per_layanan = {}
+    for model in SUMBER:
+        rows = model.objects.filter(user_id=user_id, tanggal_dibuat__gte=awal).annotate(
+            tanggal=TruncDate('tanggal_dibuat')
+        )
+        for data in rows.values('tanggal').annotate(
+            total_dibuat=Count('pk'),
+            **{kolom: Count('pk', filter=Q(status=status)) for status, kolom in STATUS_KOLOM.items()}
+        ).order_by():
+            per_hari.setdefault(data.pop('tanggal'), Counter()).update(data)
+
+        for tanggal, layanan, jumlah in (
+            rows.filter(jenis_layanan__gt='').values_list('tanggal', 'jenis_layanan').annotate(Count('pk')).order_by()
+        ):
+            per_layanan.setdefault(tanggal, Counter())[layanan] += jumlah
+
+
+    with transaction.atomic():
+        StatistikHarian.objects.filter(user_id=user_id, tanggal__gte=sejak).delete()
+        StatistikHarian.objects.bulk_create([
+            StatistikHarian(
+                user_id=user_id,
+                tanggal=tanggal,
+                per_layanan=dict(per_layanan.get(tanggal, {})),
+                **counts,
+            )
+            for tanggal, counts in sorted(per_hari.items())
+        ], batch_size=1000)
+    return len(per_hari)
+
+
+def ringkasan_periode(user, periode):
+    """
+    Menjumlahkan StatistikHarian milik user untuk tanggal di dalam `periode` (periode.Periode).
+    Mengembalikan dict berisi total_dibuat dan per_layanan (Counter). Klien baru per periode
+    dihitung dari Klien.kontak_pertama, bukan dari ringkasan ini.
+    """
+    rows = StatistikHarian.objects.filter(periode.q_tanggal('tanggal'), user=user)
+    ringkasan = rows.aggregate(total_dibuat=Sum('total_dibuat'))
+    per_layanan = Counter()
+    for layanan in rows.values_list('per_layanan', flat=True):
+        per_layanan.update(layanan or {})
+    return {
+        'total_dibuat': ringkasan['total_dibuat'] or 0,
+        'per_layanan': per_layanan,
+    }
+
+
+def ringkasan_status(user):
+    """
+    Jumlah konsultasi milik user per status sepanjang waktu, dari StatistikHarian.
+    """
+    totals = StatistikHarian.objects.filter(user=user).aggregate(
+        **{status: Sum(kolom) for status, kolom in STATUS_KOLOM.items()}
+    )
+    return {status: jumlah for status, jumlah in totals.items() if jumlah}
@@ -0,0 +1,100 @@
+# accounts/tests/test_admin.py
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.admin import ESTIMATED_COUNT_THRESHOLD, EstimatedCountPaginator, estimate_row_count
+from accounts.models import Konsultasi
+
+PERKIRAAN = ESTIMATED_COUNT_THRESHOLD * 2
+
+
+class ChangelistKonsultasiTests(TestCase):
+    """Jumlah query changelist Konsultasi tidak bergantung pada jumlah baris atau konsultan."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'rahasia')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def tambah(self, jumlah):
+        awal = Konsultasi.objects.count()
+        for i in range(awal, awal + jumlah):
+            # Konsultan berbeda per baris agar query per baris (N+1) pada kolom user terlihat
+            user = User.objects.create(username=f'konsultan{i}')
+            Konsultasi.objects.create(user=user, nama=f'Klien {i}', email=f'klien{i}@example.com')
+
+    def jumlah_query(self, query_string=''):
+        url = reverse('admin:accounts_konsultasi_changelist') + query_string
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_jumlah_query_tetap(self):
+        for query_string in ('', '?status=pending', '?konsultan=konsultan1', '?q=Klien'):
+            with self.subTest(query_string=query_string):
+                self.tambah(3)
+                sedikit = self.jumlah_query(query_string)
+                self.tambah(40)
+                self.assertEqual(self.jumlah_query(query_string), sedikit)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            Konsultasi.objects.create(nama=f'Klien {i}', email=f'klien{i}@example.com', status='selesai' if i else 'pending')
+
+    def isi_statistik(self, jumlah):
+        if connection.vendor != 'sqlite':
+            self.skipTest("Statistik palsu ditulis ke sqlite_stat1.")
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            cursor.execute('DELETE FROM sqlite_stat1 WHERE tbl = %s', [Konsultasi._meta.db_table])
+            cursor.execute(
+                'INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (%s, NULL, %s)',
+                [Konsultasi._meta.db_table, str(jumlah)],
+            )
+
+    def hitung(self, queryset):
+        with CaptureQueriesContext(connection) as queries:
+            count = EstimatedCountPaginator(queryset, 50).count
+        return count, [q['sql'] for q in queries if 'COUNT(' in q['sql'].upper()]
+
+    def test_tanpa_statistik_memakai_count(self):
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+                if cursor.fetchone() is not None:
+                    cursor.execute('DELETE FROM sqlite_stat1')
+        count, count_query = self.hitung(Konsultasi.objects.order_by('pk'))
+        self.assertEqual((count, len(count_query)), (3, 1))
+
+    def test_perkiraan_untuk_tabel_besar_tanpa_filter(self):
+        self.isi_statistik(PERKIRAAN)
+        self.assertEqual(estimate_row_count(Konsultasi), PERKIRAAN)
+        count, count_query = self.hitung(Konsultasi.objects.order_by('pk'))
+        self.assertEqual((count, count_query), (PERKIRAAN, []))
+
+    def test_filter_atau_tabel_kecil_memakai_count(self):
+        self.isi_statistik(PERKIRAAN)
+        count, count_query = self.hitung(Konsultasi.objects.filter(status='selesai').order_by('pk'))
+        self.assertEqual((count, len(count_query)), (2, 1))
+
+        self.isi_statistik(ESTIMATED_COUNT_THRESHOLD)
+        count, count_query = self.hitung(Konsultasi.objects.order_by('pk'))
+        self.assertEqual((count, len(count_query)), (3, 1))
+
+    def test_changelist_tanpa_count_penuh(self):
+        self.isi_statistik(PERKIRAAN)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'rahasia'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:accounts_konsultasi_changelist'))
+        self.assertEqual(response.context['cl'].result_count, PERKIRAAN)
+        self.assertEqual([q['sql'] for q in queries if 'COUNT(' in q['sql'].upper()], [])
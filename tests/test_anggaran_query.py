@@ -0,0 +1,93 @@
+# accounts/tests/test_anggaran_query.py
+from datetime import time, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.template import TemplateDoesNotExist, engines
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts import dashboard_cache
+from accounts.instrumentasi import AnggaranQueryTerlampaui, DjangoTemplatesTerukur, anggaran_query, get_buffer
+from accounts.models import Konsultasi
+
+# Query string per view di settings.QUERY_BUDGETS
+PARAMETER = {
+    'dashboard': '',
+    'clients': '',
+    'appointments': '',
+    'reports': '',
+    'schedule': '',
+    'search_konsultasi': '?q=Klien',
+    'pending_consultations': '',
+    'api_dashboard': '',
+    'api_reports': '',
+    'api_appointments': '',
+    'api_schedule': '',
+}
+# Lebih banyak dari satu halaman (PAGE_SIZE 50) agar query N+1 langsung terlihat
+JUMLAH_BARIS = 60
+
+
+@override_settings(DASHBOARD_CACHE_TIMEOUT=0, QUERY_BUDGET_STRICT=True)
+class AnggaranQueryTests(TestCase):
+    """Setiap view di settings.QUERY_BUDGETS tetap dalam anggaran query-nya, tanpa cache."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        hari_ini = timezone.localdate()
+        status = ('pending', 'terjadwal', 'selesai', 'dibatalkan')
+        for i in range(JUMLAH_BARIS):
+            Konsultasi.objects.create(
+                user=cls.user, nama=f'Klien {i}', email=f'klien{i % 40}@example.com',
+                status=status[i % len(status)], jenis_layanan='Konseling Karir',
+                tanggal_janji=hari_ini + timedelta(days=i % 7), waktu_janji=time(9 + i % 8),
+            )
+            Konsultasi.objects.create(nama=f'Klien publik {i}', email=f'publik{i}@example.com')
+
+    def setUp(self):
+        # Cache LocMem bertahan antar test, sedangkan pk user dan versi datanya bisa sama
+        dashboard_cache.get_cache().clear()
+        self.client.force_login(self.user)
+
+    def test_semua_view_beranggaran_diuji(self):
+        self.assertEqual(set(PARAMETER), set(settings.QUERY_BUDGETS))
+
+    def test_view_dalam_anggaran(self):
+        for nama, query_string in PARAMETER.items():
+            with self.subTest(view=nama), anggaran_query(nama):
+                response = self.client.get(reverse(nama) + query_string)
+                self.assertEqual(response.status_code, 200)
+
+    def test_anggaran_query_gagal_jika_terlampaui(self):
+        with self.assertRaisesMessage(AnggaranQueryTerlampaui, "View 'dashboard' menjalankan"):
+            with anggaran_query('dashboard', batas=1):
+                self.client.get(reverse('dashboard'))
+
+    @override_settings(QUERY_BUDGETS={'dashboard': 1})
+    def test_middleware_strict_menggagalkan_request(self):
+        with self.assertRaises(AnggaranQueryTerlampaui):
+            self.client.get(reverse('dashboard'))
+
+    def test_waktu_template_diukur_lewat_backend(self):
+        self.assertIsInstance(engines['django'], DjangoTemplatesTerukur)
+        self.client.get(reverse('dashboard'))
+        catatan = get_buffer()[-1]
+        self.assertEqual(catatan['view'], 'dashboard')
+        self.assertGreater(catatan['template_ms'], 0)
+
+    def test_log_per_request_di_level_debug(self):
+        with self.assertNoLogs('accounts.instrumentasi', level='INFO'):
+            self.client.get(reverse('dashboard'))
+        with self.assertLogs('accounts.instrumentasi', level='DEBUG') as log:
+            self.client.get(reverse('dashboard'))
+        self.assertEqual(log.records[-1].performa['view'], 'dashboard')
+
+    def test_template_tidak_ada(self):
+        with self.assertRaises(TemplateDoesNotExist) as cm:
+            engines['django'].get_template('accounts/tidak-ada.html')
+        self.assertIs(cm.exception.backend, engines['django'])
+        # Template dari string juga terukur
+        self.assertEqual(engines['django'].from_string('{{ x }}').render({'x': 1}), '1')
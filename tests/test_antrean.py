@@ -0,0 +1,56 @@
+# accounts/tests/test_antrean.py
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase
+
+from accounts.antrean import klaim_berikutnya, klaim_konsultasi
+from accounts.models import Konsultasi
+
+from .utils import jalankan_bersamaan
+
+JUMLAH_KONSULTAN = 8
+JUMLAH_KONSULTASI = 60
+
+
+class KlaimBersamaanTests(TransactionTestCase):
+    """
+    Banyak konsultan mengambil antrean pending bersamaan dari thread dan koneksi berbeda
+    (database test berupa file, lihat settings.DATABASES['default']['TEST']).
+    """
+
+    def setUp(self):
+        self.konsultan = [
+            User.objects.create_user(f'konsultan{i}', f'konsultan{i}@example.com', 'rahasia')
+            for i in range(JUMLAH_KONSULTAN)
+        ]
+        for i in range(JUMLAH_KONSULTASI):
+            Konsultasi.objects.create(nama=f'Klien {i}', email=f'klien{i}@example.com')
+
+    def test_klaim_berikutnya_tidak_pernah_ganda(self):
+        def ambil_sampai_habis(user):
+            diambil = []
+            while klaim := klaim_berikutnya(user, 3):
+                diambil.extend(konsultasi.pk for konsultasi in klaim)
+            return diambil
+
+        hasil = jalankan_bersamaan(ambil_sampai_habis, self.konsultan)
+
+        hitung = Counter(pk for diambil in hasil.values() for pk in diambil)
+        self.assertEqual([pk for pk, n in hitung.items() if n > 1], [])
+        self.assertEqual(set(hitung), set(Konsultasi.objects.values_list('pk', flat=True)))
+        # Pemilik di database sama dengan konsultan yang menerima klaimnya
+        for user, diambil in hasil.items():
+            self.assertEqual(
+                set(Konsultasi.objects.filter(user=user).values_list('pk', flat=True)), set(diambil),
+            )
+        self.assertFalse(Konsultasi.objects.filter(user__isnull=True).exists())
+
+    def test_satu_konsultasi_hanya_diklaim_sekali(self):
+        pk = Konsultasi.objects.order_by('pk').values_list('pk', flat=True).first()
+
+        hasil = jalankan_bersamaan(lambda user: klaim_konsultasi(user, pk), self.konsultan)
+
+        pemenang = [user for user, konsultasi in hasil.items() if konsultasi is not None]
+        self.assertEqual(len(pemenang), 1)
+        self.assertEqual(Konsultasi.objects.get(pk=pk).user, pemenang[0])
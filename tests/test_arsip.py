@@ -0,0 +1,81 @@
+# accounts/tests/test_arsip.py
+from datetime import time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.arsip import arsipkan
+from accounts.klien import hitung_ulang_klien
+from accounts.models import Klien, Konsultasi, KonsultasiArsip, StatistikHarian
+from accounts.pencarian import FTS_TABLE, fts_tersedia
+
+KOLOM_KLIEN = ('pk', 'email', 'nama', 'jumlah_konsultasi', 'kontak_pertama', 'kontak_terakhir', 'status_terakhir')
+
+
+class ArsipKonsultasiTests(TestCase):
+    """Memindahkan konsultasi ke arsip tidak mengubah isi data maupun ringkasannya."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        lama = timezone.now() - timedelta(days=400)
+        status = ('selesai', 'dibatalkan', 'pending', 'terjadwal')
+        for i in range(12):
+            Konsultasi.objects.create(
+                user=cls.user if i % 3 else None, nama=f'Klien {i}', email=f'klien{i % 4}@example.com',
+                status=status[i % 4], jenis_layanan='Konseling Karir', tanggal_janji=lama.date(),
+                waktu_janji=time(9 + i % 8), tanggal_dibuat=lama + timedelta(days=i),
+            )
+        # Ditutup tetapi belum cukup lama untuk diarsipkan
+        cls.baru = Konsultasi.objects.create(user=cls.user, nama='Baru', email='klien0@example.com', status='selesai')
+
+    def snapshot(self):
+        return {
+            'klien': list(Klien.objects.order_by('pk').values_list(*KOLOM_KLIEN)),
+            'statistik': list(StatistikHarian.objects.order_by('user_id', 'tanggal').values(
+                'user_id', 'tanggal', 'total_dibuat', 'jumlah_selesai', 'jumlah_dibatalkan', 'per_layanan',
+            )),
+        }
+
+    def isi_tabel(self, model):
+        kolom = [field.attname for field in Konsultasi._meta.concrete_fields]
+        return {row[0]: row for row in model.objects.values_list(*kolom)}
+
+    def test_baris_dipindahkan_utuh(self):
+        sebelum = self.isi_tabel(Konsultasi)
+        ditutup = set(Konsultasi.objects.filter(
+            status__in=('selesai', 'dibatalkan'),
+        ).exclude(pk=self.baru.pk).values_list('pk', flat=True))
+
+        batch = []
+        self.assertEqual(arsipkan(umur_hari=30, batch_size=2, setelah_batch=batch.append), len(ditutup))
+        # Per status (3 selesai, lalu 3 dibatalkan), paling banyak 2 baris per transaksi
+        self.assertEqual(batch, [2, 3, 5, 6])
+
+        aktif, arsip = self.isi_tabel(Konsultasi), self.isi_tabel(KonsultasiArsip)
+        self.assertEqual(set(arsip), ditutup)
+        self.assertEqual(set(aktif), set(sebelum) - ditutup)
+        # pk, klien, tanggal_dibuat, dan kolom lain sama persis
+        self.assertEqual({**aktif, **arsip}, sebelum)
+
+        # Diulang: tidak ada lagi yang dipindahkan
+        self.assertEqual(arsipkan(umur_hari=30), 0)
+
+    def test_klien_dan_statistik_tetap(self):
+        sebelum = self.snapshot()
+        arsipkan(umur_hari=30)
+        self.assertEqual(self.snapshot(), sebelum)
+        # Menghitung ulang dari kedua tabel memberi angka yang sama
+        hitung_ulang_klien(Klien.objects.values_list('pk', flat=True))
+        self.assertEqual(self.snapshot(), sebelum)
+
+    def test_indeks_pencarian(self):
+        if not fts_tersedia():
+            self.skipTest("Indeks FTS5 membutuhkan SQLite dengan FTS5.")
+        arsipkan(umur_hari=30)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT rowid FROM {FTS_TABLE} ORDER BY rowid')
+            indeks = [row[0] for row in cursor.fetchall()]
+        self.assertEqual(indeks, list(Konsultasi.objects.order_by('pk').values_list('pk', flat=True)))
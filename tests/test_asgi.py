@@ -0,0 +1,124 @@
+# accounts/tests/test_asgi.py
+from unittest import mock
+
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth.models import User
+from django.core.handlers.base import BaseHandler
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from accounts import dashboard_cache, views
+from accounts.models import Konsultasi
+
+URLCONF_ASGI = 'konsultan_karir.urls_asgi'
+# Path yang dilayani versi async di bawah ASGI, dengan prefix '' dan 'accounts/'
+VIEW_ASYNC = {
+    'home': (views.home, views.home_async),
+    'about': (views.about, views.about_async),
+    'contact': (views.contact, views.contact_async),
+    'career_services': (views.career_services_view, views.career_services_async),
+    'dashboard': (views.dashboard, views.dashboard_async),
+    'reports': (views.reports, views.reports_async),
+}
+
+KUNCI_DASHBOARD = ('client_count', 'today_appointments', 'new_consultations')
+KUNCI_REPORTS = ('total_consultations_month', 'new_clients_month', 'popular_service', 'chart_labels', 'chart_data')
+
+
+@override_settings(DASHBOARD_CACHE_TIMEOUT=0)
+class ViewAsyncTests(TestCase):
+    """View async (deployment ASGI) harus menghasilkan angka yang sama dengan view sinkron."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        hari_ini = timezone.localdate()
+        for i in range(3):
+            Konsultasi.objects.create(
+                user=cls.user, nama=f'Klien {i}', email=f'klien{i}@example.com',
+                status='terjadwal', tanggal_janji=hari_ini,
+            )
+        Konsultasi.objects.create(user=cls.user, nama='Klien 0', email='klien0@example.com', status='selesai')
+
+    def setUp(self):
+        # Cache LocMem bertahan antar test, sedangkan pk user dan versi datanya bisa sama
+        dashboard_cache.get_cache().clear()
+
+    def test_dashboard_async_sama_dengan_sync(self):
+        self.client.force_login(self.user)
+        sync = self.client.get('/accounts/dashboard/')
+        self.assertEqual(sync.context['client_count'], 3)
+
+        with self.settings(ROOT_URLCONF=URLCONF_ASGI):
+            response = self.client.get('/accounts/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        for kunci in KUNCI_DASHBOARD:
+            self.assertEqual(response.context[kunci], sync.context[kunci], kunci)
+        self.assertEqual(
+            [k.pk for k in response.context['upcoming_appointments']],
+            [k.pk for k in sync.context['upcoming_appointments']],
+        )
+
+    def test_reports_async_sama_dengan_sync(self):
+        self.client.force_login(self.user)
+        sync = self.client.get('/accounts/reports/')
+        with self.settings(ROOT_URLCONF=URLCONF_ASGI):
+            response = self.client.get('/accounts/reports/')
+        self.assertEqual(response.status_code, 200)
+        for kunci in KUNCI_REPORTS:
+            self.assertEqual(response.context[kunci], sync.context[kunci], kunci)
+
+    @override_settings(ROOT_URLCONF=URLCONF_ASGI)
+    async def test_view_async_lewat_async_client(self):
+        await self.async_client.aforce_login(self.user)
+        for url in ('/accounts/dashboard/', '/accounts/reports/', '/'):
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+
+    @override_settings(ROOT_URLCONF=URLCONF_ASGI)
+    def test_dashboard_async_butuh_login(self):
+        response = self.client.get('/accounts/dashboard/')
+        self.assertEqual(response.status_code, 302)
+
+
+class URLconfAsgiTests(SimpleTestCase):
+    """
+    View async hanya dipilih oleh URLconf ASGI (konsultan_karir.urls_asgi, dipakai asgi.py);
+    ROOT_URLCONF tetap melayani view sinkron, tidak bergantung environment atau urutan impor.
+    """
+
+    def test_path_dan_nama_url_sama(self):
+        for nama, (sync, async_) in VIEW_ASYNC.items():
+            url = reverse(nama)
+            with self.subTest(nama=nama):
+                self.assertEqual(reverse(nama, urlconf=URLCONF_ASGI), url)
+                for prefix in ('', '/accounts'):
+                    path = prefix + reverse(nama).removeprefix('/accounts')
+                    self.assertIs(resolve(path).func, sync)
+                    self.assertIs(resolve(path, urlconf=URLCONF_ASGI).func, async_)
+
+    async def test_handler_asgi_memakai_urls_asgi(self):
+        from konsultan_karir.asgi import application
+
+        terpilih = []
+        resolve_request = BaseHandler.resolve_request
+
+        def catat(handler, request):
+            terpilih.append(resolve_request(handler, request))
+            return terpilih[-1]
+
+        scope = {
+            'type': 'http', 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': '/accounts/dashboard/', 'raw_path': b'/accounts/dashboard/', 'query_string': b'',
+            'root_path': '', 'headers': [(b'host', b'testserver')],
+            'client': ('127.0.0.1', 1234), 'server': ('testserver', 80),
+        }
+        with mock.patch.object(BaseHandler, 'resolve_request', catat):
+            komunikator = ApplicationCommunicator(application, scope)
+            await komunikator.send_input({'type': 'http.request', 'body': b''})
+            awal = await komunikator.receive_output(5)
+            await komunikator.wait(5)
+        # Belum login: diarahkan ke halaman login oleh dashboard_async
+        self.assertEqual(awal['status'], 302)
+        self.assertIs(terpilih[0].func, views.dashboard_async)
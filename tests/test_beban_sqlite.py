@@ -0,0 +1,71 @@
+# accounts/tests/test_beban_sqlite.py
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, TransactionTestCase, override_settings
+
+from accounts.antrean import klaim_berikutnya
+from accounts.models import Konsultasi
+
+from .utils import jalankan_bersamaan
+
+PENGIRIM_FORMULIR = 6
+KONSULTAN = 4
+ULANGAN = 15
+
+
+@override_settings(DASHBOARD_CACHE_TIMEOUT=0, KONSULTASI_INGEST_MODE='langsung')
+class BebanFormulirDanDashboardTests(TransactionTestCase):
+    """
+    Uji beban kecil pada database test berupa file: pengirim formulir publik menulis
+    sementara konsultan membaca dashboard dan mengklaim antrean. Dengan WAL dan busy_timeout
+    (settings.SQLITE_PRAGMAS) tidak boleh ada "database is locked".
+    """
+
+    def setUp(self):
+        self.konsultan = [
+            User.objects.create_user(f'konsultan{i}', f'konsultan{i}@example.com', 'rahasia')
+            for i in range(KONSULTAN)
+        ]
+
+    def test_pragma_diterapkan(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("PRAGMA khusus SQLite.")
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertGreater(cursor.fetchone()[0], 0)
+
+    def test_formulir_dan_dashboard_bersamaan(self):
+        def kirim_formulir(nomor):
+            client = Client()
+            for i in range(ULANGAN):
+                response = client.post('/accounts/consultation/', {
+                    'name': f'Pengirim {nomor}',
+                    'email': f'pengirim{nomor}-{i}@example.com',
+                    'message': 'Ingin konsultasi karir.',
+                })
+                self.assertRedirects(response, '/accounts/consultation-success/', fetch_redirect_response=False)
+            return ULANGAN
+
+        def buka_dashboard(user):
+            client = Client()
+            client.force_login(user)
+            diklaim = 0
+            for _ in range(ULANGAN):
+                self.assertEqual(client.get('/accounts/dashboard/').status_code, 200)
+                # Konsultan juga menulis: mengambil konsultasi dari antrean pending
+                diklaim += len(klaim_berikutnya(user, 1))
+            return diklaim
+
+        def kerja(pekerja):
+            jenis, arg = pekerja
+            return kirim_formulir(arg) if jenis == 'formulir' else buka_dashboard(arg)
+
+        pekerja = [('formulir', i) for i in range(PENGIRIM_FORMULIR)] + [('dashboard', user) for user in self.konsultan]
+        # Exception dari thread mana pun (misal OperationalError "database is locked") menggagalkan test
+        hasil = jalankan_bersamaan(kerja, pekerja)
+
+        self.assertEqual(Konsultasi.objects.count(), PENGIRIM_FORMULIR * ULANGAN)
+        diklaim = sum(hasil[('dashboard', user)] for user in self.konsultan)
+        self.assertEqual(Konsultasi.objects.filter(user__isnull=False).count(), diklaim)
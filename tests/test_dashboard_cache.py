@@ -0,0 +1,60 @@
+# accounts/tests/test_dashboard_cache.py
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from accounts import dashboard_cache
+from accounts.models import Konsultasi
+
+# Dua LocMemCache terpisah meniru dua worker, masing-masing dengan cache per proses
+CACHE_DUA_WORKER = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-a'},
+    'worker_b': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-b'},
+}
+
+
+@override_settings(CACHES=CACHE_DUA_WORKER, DASHBOARD_CACHE_ALIAS='default')
+class VersiDataTests(TestCase):
+    """Perubahan data yang ditulis di satu worker harus terlihat oleh worker lain."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        Konsultasi.objects.create(user=cls.user, nama='Klien A', email='a@example.com')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def tulis_di_worker_b(self, email):
+        with self.settings(DASHBOARD_CACHE_ALIAS='worker_b'), self.captureOnCommitCallbacks(execute=True):
+            Konsultasi.objects.create(user=self.user, nama='Klien baru', email=email)
+
+    def test_etag_berganti_untuk_worker_lain(self):
+        etag_lama = dashboard_cache.etag('dashboard', self.user.pk)
+        self.tulis_di_worker_b('b@example.com')
+        self.assertNotEqual(dashboard_cache.etag('dashboard', self.user.pk), etag_lama)
+
+    def test_api_tidak_menjawab_304_setelah_tulis_di_worker_lain(self):
+        response = self.client.get('/accounts/api/dashboard/')
+        etag_lama = response['ETag']
+        self.assertEqual(self.client.get('/accounts/api/dashboard/', HTTP_IF_NONE_MATCH=etag_lama).status_code, 304)
+
+        self.tulis_di_worker_b('b@example.com')
+        response = self.client.get('/accounts/api/dashboard/', HTTP_IF_NONE_MATCH=etag_lama)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['client_count'], 2)
+
+    def test_dashboard_dan_fragmen_tidak_basi(self):
+        response = self.client.get('/accounts/dashboard/')
+        self.assertEqual(response.context['client_count'], 1)
+
+        self.tulis_di_worker_b('b@example.com')
+        response = self.client.get('/accounts/dashboard/')
+        self.assertEqual(response.context['client_count'], 2)
+        # Kartu statistik di-cache dengan kunci api_etag, jadi fragmen lama tidak dipakai lagi
+        self.assertEqual(response.context['api_etag'], dashboard_cache.etag('dashboard', self.user.pk))
+
+    def test_invalidate_tanpa_baris_versi(self):
+        self.assertEqual(dashboard_cache.data_version(self.user.pk), 0)
+        dashboard_cache.invalidate(self.user.pk, None)
+        dashboard_cache.invalidate(self.user.pk)
+        self.assertEqual(dashboard_cache.data_version(self.user.pk), 2)
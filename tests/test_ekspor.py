@@ -0,0 +1,112 @@
+# accounts/tests/test_ekspor.py
+import csv
+import io
+import unittest
+import zipfile
+from datetime import time
+from unittest import mock
+from xml.etree import ElementTree
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from accounts.arsip import arsipkan
+from accounts.ekspor import stream_csv, stream_xlsx
+from accounts.models import Konsultasi
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+JUDUL = ['Teks', 'Angka']
+# Isi sel yang dibaca spreadsheet sebagai formula jika tidak di-escape
+FORMULA = ['=HYPERLINK("http://contoh.invalid")', '+62811', '-1+1', '@SUM(A1)', '\t=1', '\r=1']
+
+
+def gabung(potongan):
+    potongan = list(potongan)
+    return (''.join(potongan) if isinstance(potongan[0], str) else b''.join(potongan)), len(potongan)
+
+
+class StreamCsvTests(SimpleTestCase):
+
+    def test_escape_formula(self):
+        isi, _ = gabung(stream_csv(JUDUL, [(teks, 1) for teks in FORMULA + ['biasa', 'a=b']]))
+        self.assertTrue(isi.startswith('\ufeff'))
+        rows = list(csv.reader(io.StringIO(isi[1:])))
+        self.assertEqual(rows[0], JUDUL)
+        self.assertEqual([row[0] for row in rows[1:]], ["'" + teks for teks in FORMULA] + ['biasa', 'a=b'])
+        # Angka negatif asli tetap angka, bukan teks ber-escape
+        self.assertEqual(gabung(stream_csv(JUDUL, [('x', -5)]))[0].splitlines()[-1], 'x,-5')
+
+    def test_dialirkan_per_potongan(self):
+        with mock.patch('accounts.ekspor.CHUNK_SIZE', 2):
+            isi, jumlah_potongan = gabung(stream_csv(JUDUL, ((f'baris {i}', i) for i in range(5))))
+        # Judul, lalu 2 + 2 + 1 baris
+        self.assertEqual(jumlah_potongan, 4)
+        self.assertEqual(len(isi.splitlines()), 6)
+
+
+class StreamXlsxTests(SimpleTestCase):
+
+    def setUp(self):
+        self.rows = [('=1+1', 3), ('Budi & <Sari>\x07', 2.5), (None, True), (time(9, 30), -1)]
+        with mock.patch('accounts.ekspor.CHUNK_SIZE', 2):
+            self.isi, self.jumlah_potongan = gabung(stream_xlsx(JUDUL, iter(self.rows)))
+
+    def test_zip_dan_xml_valid(self):
+        self.assertGreater(self.jumlah_potongan, 2)
+        with zipfile.ZipFile(io.BytesIO(self.isi)) as zf:
+            self.assertIsNone(zf.testzip())
+            for nama in zf.namelist():
+                ElementTree.fromstring(zf.read(nama))
+
+    @unittest.skipIf(openpyxl is None, "openpyxl tidak terpasang.")
+    def test_dibuka_openpyxl(self):
+        sheet = openpyxl.load_workbook(io.BytesIO(self.isi), read_only=True).active
+        rows = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(rows, [
+            ('Teks', 'Angka'),
+            # String inline tidak pernah dievaluasi sebagai formula
+            ('=1+1', 3),
+            ('Budi & <Sari>', 2.5),
+            ('', 'True'),
+            ('09:30', -1),
+        ])
+
+
+class EksporKonsultasiTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        lain = User.objects.create_user('lain', 'lain@example.com', 'rahasia')
+        Konsultasi.objects.create(user=cls.user, nama='Diarsipkan', email='arsip@example.com', status='selesai')
+        arsipkan(umur_hari=0)
+        Konsultasi.objects.create(user=cls.user, nama='=CMD()', email='budi@example.com', waktu_janji=time(9, 0))
+        Konsultasi.objects.create(user=lain, nama='Milik lain', email='lain@example.com')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_csv(self):
+        response = self.client.get('/accounts/export/konsultasi/')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertRegex(response['Content-Disposition'], r'attachment; filename="konsultasi-\d{8}-\d{4}\.csv"')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode('utf-8-sig'))))
+        # Konsultasi aktif lebih dulu, lalu arsip; konsultasi milik konsultan lain tidak ikut
+        self.assertEqual([(row['Nama'], row['Waktu Janji']) for row in rows], [("'=CMD()", '09:00'), ('Diarsipkan', '')])
+        self.assertEqual(rows[0]['Konsultan'], 'konsultan')
+
+    def test_xlsx(self):
+        response = self.client.get('/accounts/export/konsultasi/?format=xlsx')
+        self.assertTrue(response.streaming)
+        self.assertRegex(response['Content-Disposition'], r'\.xlsx"$')
+        isi = b''.join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(isi)) as zf:
+            self.assertIsNone(zf.testzip())
+        if openpyxl is not None:
+            rows = list(openpyxl.load_workbook(io.BytesIO(isi), read_only=True).active.iter_rows(values_only=True))
+            self.assertEqual([row[1] for row in rows], ['Nama', '=CMD()', 'Diarsipkan'])
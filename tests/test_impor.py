@@ -0,0 +1,136 @@
+# accounts/tests/test_impor.py
+import csv
+import json
+import os
+import tempfile
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.arsip import arsipkan
+from accounts.impor_konsultasi import HasilImpor, ImporKonsultasi, baca_csv
+from accounts.models import Konsultasi, KonsultasiArsip
+
+KOLOM = ['nama', 'email', 'status', 'tanggal_janji', 'waktu_janji', 'jenis_layanan', 'konsultan', 'tanggal_dibuat']
+
+
+class Berhenti(Exception):
+    pass
+
+
+class ImporKonsultasiTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.path = str(self.dir / 'impor.csv')
+
+    def tulis_csv(self, rows):
+        with open(self.path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, KOLOM)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({'status': 'pending', 'konsultan': 'konsultan', **row})
+
+    def impor(self, *args):
+        out = StringIO()
+        call_command('import_konsultasi', self.path, *args, stdout=out)
+        return out.getvalue()
+
+    def baris(self, i, **kwargs):
+        return {'nama': f'Klien {i}', 'email': f'klien{i}@example.com', 'tanggal_janji': '2024-03-0%d' % (i % 9 + 1), **kwargs}
+
+    def test_validasi_baris(self):
+        self.tulis_csv([
+            self.baris(1, tanggal_dibuat='2024-01-15 10:30', waktu_janji='09:00'),
+            self.baris(2, nama=''),
+            self.baris(3, email='bukan-email'),
+            self.baris(4, konsultan='tidak-ada'),
+            self.baris(5, tanggal_dibuat='kemarin'),
+            self.baris(6, tanggal_janji='2024-02-30'),
+            self.baris(7, konsultan='', email='KLIEN7@Example.com'),
+        ])
+        penolakan = str(self.dir / 'ditolak.jsonl')
+        out = self.impor('--reject-file', penolakan)
+
+        self.assertIn("2 konsultasi dibuat, 0 duplikat dilewati, 5 baris tidak valid", out)
+        with open(penolakan, encoding='utf-8') as f:
+            ditolak = [json.loads(line) for line in f]
+        self.assertEqual(
+            [(row['baris'], sorted(row['errors'])) for row in ditolak],
+            [(3, ['nama']), (4, ['email']), (5, ['konsultan']), (6, ['tanggal_dibuat']), (7, ['tanggal_janji'])],
+        )
+
+        pertama = Konsultasi.objects.get(nama='Klien 1')
+        self.assertEqual(pertama.user, self.user)
+        self.assertEqual(pertama.tanggal_dibuat, timezone.make_aware(datetime(2024, 1, 15, 10, 30)))
+        self.assertIsNotNone(pertama.klien_id)
+        # Tanpa konsultan: antrean publik; email dinormalisasi
+        self.assertEqual(
+            Konsultasi.objects.filter(user__isnull=True).values_list('email', flat=True).get(), 'klien7@example.com',
+        )
+
+    def test_jsonl_rusak(self):
+        self.path = str(self.dir / 'impor.jsonl')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({**self.baris(1), 'status': 'pending'}) + '\n{bukan json\n\n[1, 2]\n')
+        self.assertIn("1 konsultasi dibuat, 0 duplikat dilewati, 2 baris tidak valid", self.impor())
+
+    def test_duplikat_dilewati(self):
+        Konsultasi.objects.create(user=self.user, nama='Lama', email='klien1@example.com', tanggal_janji='2024-03-02')
+        self.tulis_csv([
+            self.baris(1),
+            self.baris(2),
+            self.baris(2, nama='Nama lain', email='Klien2@Example.com'),
+            # Waktu atau layanan berbeda: konsultasi lain
+            self.baris(2, waktu_janji='10:00'),
+            self.baris(2, jenis_layanan='Review CV'),
+        ])
+        self.assertIn("3 konsultasi dibuat, 2 duplikat dilewati", self.impor())
+        self.assertIn("0 konsultasi dibuat, 5 duplikat dilewati", self.impor())
+        self.assertEqual(Konsultasi.objects.count(), 4)
+
+    def test_duplikat_yang_sudah_diarsipkan(self):
+        self.tulis_csv([self.baris(i, status='selesai') for i in range(3)] + [self.baris(3)])
+        self.impor()
+        self.assertEqual(arsipkan(umur_hari=0), 3)
+
+        self.assertIn("0 konsultasi dibuat, 4 duplikat dilewati", self.impor())
+        self.assertEqual((Konsultasi.objects.count(), KonsultasiArsip.objects.count()), (1, 3))
+
+    def test_lanjut_dari_checkpoint(self):
+        self.tulis_csv([self.baris(i) for i in range(5)])
+        checkpoint = f'{self.path}.checkpoint'
+
+        def berhenti(hasil):
+            raise Berhenti
+
+        with open(self.path, newline='', encoding='utf-8') as f:
+            importir = ImporKonsultasi(batch_size=2, checkpoint_path=checkpoint)
+            with self.assertRaises(Berhenti):
+                importir.jalankan(baca_csv(f), setelah_batch=berhenti)
+        # Batch pertama (baris file 2-3) sudah di-commit dan tercatat di checkpoint
+        self.assertEqual(Konsultasi.objects.count(), 2)
+        self.assertEqual(HasilImpor.dari_checkpoint(checkpoint).baris, 3)
+
+        out = self.impor('--batch-size', '2')
+        self.assertIn("Melanjutkan dari checkpoint: baris 3 sudah diproses.", out)
+        self.assertIn("5 konsultasi dibuat, 0 duplikat dilewati", out)
+        self.assertEqual(Konsultasi.objects.count(), 5)
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_restart_mengabaikan_checkpoint(self):
+        self.tulis_csv([self.baris(i) for i in range(3)])
+        HasilImpor(baris=10).simpan_checkpoint(f'{self.path}.checkpoint')
+        self.assertIn("0 konsultasi dibuat", self.impor())
+        self.assertIn("3 konsultasi dibuat", self.impor('--restart'))
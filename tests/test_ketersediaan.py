@@ -0,0 +1,199 @@
+# accounts/tests/test_ketersediaan.py
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from accounts.forms import KonsultasiForm
+from accounts.ketersediaan import MAKS_HARI_SLOT, IndeksJadwal, cek_bentrok, saring_bentrok, slot_kosong
+from accounts.models import Konsultasi, Profile
+from accounts.views import _simpan_tanpa_bentrok
+
+SENIN = date(2030, 1, 7)
+JAM = timedelta(hours=1)
+
+
+class IndeksJadwalTests(SimpleTestCase):
+    """Slot berdurasi sama: [mulai, mulai + durasi) bentrok jika tumpang tindih."""
+
+    def setUp(self):
+        self.jam_10 = datetime.combine(SENIN, time(10, 0))
+        self.indeks = IndeksJadwal([self.jam_10 + 3 * JAM, self.jam_10], JAM)
+
+    def test_batas_slot(self):
+        self.assertIsNone(self.indeks.bentrok(self.jam_10 - JAM))
+        self.assertIsNone(self.indeks.bentrok(self.jam_10 + JAM))
+        self.assertEqual(self.indeks.bentrok(self.jam_10 - JAM + timedelta(minutes=1)), self.jam_10)
+        self.assertEqual(self.indeks.bentrok(self.jam_10 + timedelta(minutes=59)), self.jam_10)
+        self.assertEqual(self.indeks.bentrok(self.jam_10), self.jam_10)
+
+    def test_tambah(self):
+        mulai = self.jam_10 + 2 * JAM
+        self.assertIsNone(self.indeks.bentrok(mulai))
+        self.indeks.tambah(mulai)
+        self.assertEqual(self.indeks.bentrok(mulai + timedelta(minutes=30)), mulai)
+        self.assertEqual(self.indeks.mulai, sorted(self.indeks.mulai))
+
+
+class CekBentrokTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        cls.lain = User.objects.create_user('lain', 'lain@example.com', 'rahasia')
+        buat = lambda **kwargs: Konsultasi.objects.create(
+            **{'user': cls.user, 'nama': 'Klien', 'email': 'klien@example.com',
+               'tanggal_janji': SENIN, 'status': 'terjadwal', **kwargs},
+        )
+        cls.jam_10 = buat(waktu_janji=time(10, 0))
+        cls.malam = buat(waktu_janji=time(23, 30))
+        # Tidak menempati slot user: status lain atau milik konsultan lain
+        buat(waktu_janji=time(13, 0), status='pending')
+        buat(waktu_janji=time(14, 0), user=cls.lain)
+
+    def test_waktu_batas(self):
+        self.assertIsNone(cek_bentrok(self.user, SENIN, time(9, 0)))
+        self.assertIsNone(cek_bentrok(self.user, SENIN, time(11, 0)))
+        self.assertEqual(cek_bentrok(self.user, SENIN, time(10, 59)), datetime.combine(SENIN, time(10, 0)))
+        self.assertEqual(cek_bentrok(self.user, SENIN, time(9, 1)), datetime.combine(SENIN, time(10, 0)))
+
+    def test_melewati_tengah_malam(self):
+        besok = SENIN + timedelta(days=1)
+        self.assertEqual(cek_bentrok(self.user, besok, time(0, 15)), datetime.combine(SENIN, time(23, 30)))
+        self.assertIsNone(cek_bentrok(self.user, besok, time(0, 30)))
+
+    def test_hanya_janji_terjadwal_milik_user(self):
+        self.assertIsNone(cek_bentrok(self.user, SENIN, time(13, 0)))
+        self.assertIsNone(cek_bentrok(self.user, SENIN, time(14, 0)))
+
+    def test_tanpa_tanggal_atau_waktu(self):
+        self.assertIsNone(cek_bentrok(self.user, None, time(10, 0)))
+        self.assertIsNone(cek_bentrok(self.user, SENIN, None))
+
+    def test_kecuali_pk(self):
+        # Janji yang sedang diubah tidak bentrok dengan dirinya sendiri
+        self.assertIsNone(cek_bentrok(self.user, SENIN, time(10, 30), kecuali_pk=self.jam_10.pk))
+        self.assertIsNotNone(cek_bentrok(self.user, SENIN, time(10, 30), kecuali_pk=self.malam.pk))
+
+    def test_durasi_slot_dari_profil(self):
+        Profile.objects.create(user=self.user, durasi_slot=30)
+        self.assertIsNone(cek_bentrok(self.user, SENIN, time(10, 30)))
+        self.assertIsNotNone(cek_bentrok(self.user, SENIN, time(10, 29)))
+
+    def test_saring_bentrok_berurutan(self):
+        kandidat = [
+            {'pk': 101, 'tanggal_janji': SENIN, 'waktu_janji': time(10, 30)},
+            {'pk': 102, 'tanggal_janji': SENIN, 'waktu_janji': time(15, 0)},
+            {'pk': 103, 'tanggal_janji': SENIN, 'waktu_janji': time(15, 30)},
+            {'pk': 104, 'tanggal_janji': None, 'waktu_janji': None},
+        ]
+        self.assertEqual(saring_bentrok(self.user, kandidat), ([102, 104], [101, 103]))
+
+
+class SlotKosongTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        Profile.objects.create(
+            user=cls.user, jam_mulai_kerja=time(9, 0), jam_selesai_kerja=time(12, 30),
+            durasi_slot=60, hari_kerja='0,1',
+        )
+        Konsultasi.objects.create(
+            user=cls.user, nama='Klien', email='klien@example.com',
+            tanggal_janji=SENIN, waktu_janji=time(10, 0), status='terjadwal',
+        )
+
+    def test_jam_dan_hari_kerja(self):
+        sekarang = datetime.combine(SENIN - timedelta(days=1), time(0, 0))
+        hasil = slot_kosong(self.user, SENIN, SENIN + timedelta(days=2), sekarang=sekarang)
+        selasa = SENIN + timedelta(days=1)
+        # Slot terakhir 11:00-12:00; 12:00 tidak muat sampai 12:30. Rabu bukan hari kerja
+        self.assertEqual(hasil, [
+            (SENIN, [datetime.combine(SENIN, time(9, 0)), datetime.combine(SENIN, time(11, 0))]),
+            (selasa, [datetime.combine(selasa, time(h, 0)) for h in (9, 10, 11)]),
+        ])
+
+    def test_setelah_waktu_sekarang(self):
+        sekarang = datetime.combine(SENIN, time(9, 30))
+        [(_, slot), _] = slot_kosong(self.user, SENIN, SENIN + timedelta(days=1), sekarang=sekarang)
+        self.assertEqual(slot, [datetime.combine(SENIN, time(11, 0))])
+
+    def test_rentang_dibatasi(self):
+        hasil = slot_kosong(self.user, SENIN, SENIN + timedelta(days=365), sekarang=datetime.min)
+        self.assertLessEqual(hasil[-1][0], SENIN + timedelta(days=MAKS_HARI_SLOT - 1))
+
+
+class TolakJadwalGandaTests(TestCase):
+    """Semua jalan menuju status 'terjadwal' menolak janji yang bentrok."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        cls.terjadwal = Konsultasi.objects.create(
+            user=cls.user, nama='Terjadwal', email='terjadwal@example.com',
+            tanggal_janji=SENIN, waktu_janji=time(10, 0), status='terjadwal',
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def data_form(self, waktu, **kwargs):
+        return {
+            'nama': 'Klien', 'email': 'klien@example.com', 'tanggal_janji': SENIN.isoformat(),
+            'waktu_janji': waktu, 'status': 'terjadwal', **kwargs,
+        }
+
+    def jumlah_terjadwal(self):
+        return Konsultasi.objects.filter(user=self.user, status='terjadwal').count()
+
+    def test_buat(self):
+        # Lewat helper yang dipakai create_konsultasi (template halaman buat tidak ada di repo ini)
+        form = KonsultasiForm(self.data_form('10:30'))
+        self.assertTrue(form.is_valid())
+        self.assertFalse(_simpan_tanpa_bentrok(self.user, form))
+        self.assertEqual(form.errors['waktu_janji'], ["Bentrok dengan janji temu lain pada 07 Jan 2030 10:00."])
+        self.assertEqual(Konsultasi.objects.count(), 1)
+
+        form = KonsultasiForm(self.data_form('11:00'))
+        self.assertTrue(form.is_valid())
+        self.assertTrue(_simpan_tanpa_bentrok(self.user, form))
+        self.assertEqual(self.jumlah_terjadwal(), 2)
+
+    def test_ubah(self):
+        url = reverse('update_konsultasi', args=[self.terjadwal.pk])
+        # Menyimpan ulang janji di waktunya sendiri tidak dianggap bentrok (kecuali_pk)
+        response = self.client.post(url, self.data_form('10:15', nama='Terjadwal', email='terjadwal@example.com'))
+        self.assertEqual(response.status_code, 302)
+
+        lain = Konsultasi.objects.create(
+            user=self.user, nama='Klien', email='klien@example.com', tanggal_janji=SENIN, waktu_janji=time(12, 0),
+        )
+        response = self.client.post(reverse('update_konsultasi', args=[lain.pk]), self.data_form('11:00'))
+        self.assertEqual(response.status_code, 200)
+        lain.refresh_from_db()
+        self.assertEqual((lain.status, lain.waktu_janji), ('pending', time(12, 0)))
+
+    def test_terima(self):
+        pending = Konsultasi.objects.create(
+            user=self.user, nama='Klien', email='klien@example.com', tanggal_janji=SENIN, waktu_janji=time(10, 30),
+        )
+        self.client.post(reverse('accept_appointment', args=[pending.pk]))
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, 'pending')
+        self.assertEqual(self.jumlah_terjadwal(), 1)
+
+    def test_tugaskan(self):
+        publik = Konsultasi.objects.create(
+            nama='Klien', email='klien@example.com', tanggal_janji=SENIN, waktu_janji=time(9, 30),
+        )
+        self.client.post(reverse('assign_consultation', args=[publik.pk]))
+        publik.refresh_from_db()
+        self.assertEqual((publik.user_id, publik.status), (None, 'pending'))
+
+        publik.waktu_janji = time(9, 0)
+        publik.save()
+        self.client.post(reverse('assign_consultation', args=[publik.pk]))
+        publik.refresh_from_db()
+        self.assertEqual((publik.user_id, publik.status), (self.user.pk, 'terjadwal'))
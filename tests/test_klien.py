@@ -0,0 +1,46 @@
+# accounts/tests/test_klien.py
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts import dashboard_cache
+from accounts.arsip import arsipkan
+from accounts.models import Konsultasi
+
+
+@override_settings(DASHBOARD_CACHE_TIMEOUT=0)
+class DaftarKlienTests(TestCase):
+    """Daftar klien dibaca dari Klien, sama dengan jumlah klien di dashboard dan ekspor klien."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        # Email yang sama dengan huruf besar/spasi berbeda adalah satu klien
+        Konsultasi.objects.create(user=cls.user, nama='Budi', email='budi@example.com', no_hp='0811')
+        cls.terbaru = Konsultasi.objects.create(
+            user=cls.user, nama='Budi S.', email=' Budi@Example.com', no_hp='0812',
+        )
+        # Semua konsultasi klien ini ditutup lalu diarsipkan
+        Konsultasi.objects.create(user=cls.user, nama='Sari', email='sari@example.com', status='selesai')
+        arsipkan(umur_hari=0)
+
+    def setUp(self):
+        # Cache LocMem bertahan antar test, sedangkan pk user dan versi datanya bisa sama
+        dashboard_cache.get_cache().clear()
+        self.client.force_login(self.user)
+
+    def test_satu_baris_per_klien_ternormalisasi(self):
+        clients = self.client.get(reverse('clients')).context['clients']
+        client_count = self.client.get(reverse('dashboard')).context['client_count']
+        self.assertEqual(len(clients), client_count)
+        self.assertEqual([client['email'] for client in clients], ['sari@example.com', 'budi@example.com'])
+
+    def test_konsultasi_aktif_terbaru(self):
+        budi = self.client.get(reverse('clients')).context['clients'][1]
+        self.assertEqual((budi['pk'], budi['no_hp']), (self.terbaru.pk, '0812'))
+
+    def test_klien_yang_semua_konsultasinya_diarsipkan_tetap_tampil(self):
+        response = self.client.get(reverse('clients'))
+        sari = response.context['clients'][0]
+        self.assertEqual((sari['nama'], sari['pk'], sari['status_terakhir']), ('Sari', None, 'selesai'))
+        self.assertContains(response, 'Diarsipkan')
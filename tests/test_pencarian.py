@@ -0,0 +1,100 @@
+# accounts/tests/test_pencarian.py
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from accounts.arsip import arsipkan
+from accounts.models import Konsultasi
+from accounts.pencarian import FTS_TABLE, KOLOM_PENCARIAN, cari_konsultasi, fts_tersedia, indeks_banyak
+
+
+class IndeksPencarianTests(TestCase):
+    """Indeks FTS5 tetap sama dengan isi tabel Konsultasi setelah setiap jalur penulisan."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+
+    def setUp(self):
+        if not fts_tersedia():
+            self.skipTest("Indeks FTS5 membutuhkan SQLite dengan FTS5.")
+
+    def isi_indeks(self):
+        kolom = ', '.join(k for k, _ in KOLOM_PENCARIAN)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT rowid, {kolom} FROM {FTS_TABLE} ORDER BY rowid')
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def assertIndeksSinkron(self):
+        kolom = [k for k, _ in KOLOM_PENCARIAN]
+        diharapkan = [
+            (row[0], *(nilai or '' for nilai in row[1:]))
+            for row in Konsultasi.objects.order_by('pk').values_list('pk', *kolom)
+        ]
+        self.assertEqual(self.isi_indeks(), diharapkan)
+
+    def test_disimpan(self):
+        konsultasi = Konsultasi.objects.create(user=self.user, nama='Budi Santoso', email='budi@example.com')
+        self.assertIndeksSinkron()
+        konsultasi.nama = 'Budi Hartono'
+        konsultasi.jurusan = 'Informatika'
+        konsultasi.save()
+        self.assertIndeksSinkron()
+
+    def test_dihapus(self):
+        tetap = Konsultasi.objects.create(user=self.user, nama='Sari', email='sari@example.com')
+        Konsultasi.objects.create(user=self.user, nama='Budi', email='budi@example.com').delete()
+        self.assertIndeksSinkron()
+        Konsultasi.objects.filter(pk=tetap.pk).delete()
+        self.assertEqual(self.isi_indeks(), [])
+
+    def test_bulk_create(self):
+        # bulk_create tidak memicu sinyal; pemanggil (impor, spool, data sintetis) memanggil indeks_banyak
+        objs = Konsultasi.objects.bulk_create([
+            Konsultasi(user=self.user, nama=f'Klien {i}', email=f'klien{i}@example.com') for i in range(3)
+        ])
+        indeks_banyak(objs)
+        self.assertIndeksSinkron()
+
+    def test_diarsipkan(self):
+        Konsultasi.objects.create(user=self.user, nama='Budi', email='budi@example.com', status='selesai')
+        Konsultasi.objects.create(user=self.user, nama='Sari', email='sari@example.com')
+        arsipkan(umur_hari=0)
+        self.assertIndeksSinkron()
+        self.assertFalse(cari_konsultasi(Konsultasi.objects.all(), 'Budi').exists())
+
+
+class CariKonsultasiTests(TestCase):
+    """Urutan relevansi bm25 dan fallback icontains tanpa FTS5."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        buat = lambda **kwargs: Konsultasi.objects.create(user=cls.user, email='klien@example.com', **kwargs)
+        cls.di_minat = buat(nama='Sari', minat_karir='Ingin jadi data engineer')
+        cls.di_nama = buat(nama='Data Wijaya')
+        cls.lain = buat(nama='Budi', minat_karir='Desain grafis')
+
+    def cari(self, teks):
+        return list(cari_konsultasi(Konsultasi.objects.filter(user=self.user), teks).values_list('pk', flat=True))
+
+    def test_nama_lebih_relevan_daripada_minat_karir(self):
+        if not fts_tersedia():
+            self.skipTest("Indeks FTS5 membutuhkan SQLite dengan FTS5.")
+        self.assertEqual(self.cari('data'), [self.di_nama.pk, self.di_minat.pk])
+        # Pencocokan awalan, semua kata wajib ada, tanda kutip tidak merusak query
+        self.assertEqual(self.cari('wija'), [self.di_nama.pk])
+        self.assertEqual(self.cari('data grafis'), [])
+        self.assertEqual(self.cari('"data'), [self.di_nama.pk, self.di_minat.pk])
+
+    def test_teks_kosong(self):
+        self.assertEqual(self.cari('   '), [])
+
+    def test_fallback_icontains_tanpa_fts(self):
+        with mock.patch('accounts.pencarian.fts_tersedia', return_value=False):
+            # Tanpa relevansi: urut dari yang terbaru
+            self.assertEqual(self.cari('DATA'), [self.di_nama.pk, self.di_minat.pk])
+            self.assertEqual(self.cari('data grafis'), [])
+            self.assertEqual(self.cari('desain grafis'), [self.lain.pk])
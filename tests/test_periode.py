@@ -0,0 +1,146 @@
+# accounts/tests/test_periode.py
+import re
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import Klien, Konsultasi
+from accounts.periode import Periode
+
+# Fungsi SQLite milik Django yang membungkus kolom tanggal/waktu (lookup __date, __month, Trunc...)
+FUNGSI_TANGGAL = re.compile(r'django_(date|datetime|time)_\w+')
+SEBELUM_TENGAH_MALAM = time(23, 59, 59, 999999)
+
+
+def lokal(tanggal, jam=time.min):
+    """Waktu aware pada zona waktu lokal (settings.TIME_ZONE)."""
+    return timezone.make_aware(datetime.combine(tanggal, jam))
+
+
+class PeriodeTests(SimpleTestCase):
+
+    def test_hari(self):
+        self.assertEqual(Periode.hari(date(2024, 12, 31)), Periode(date(2024, 12, 31), date(2025, 1, 1)))
+
+    def test_bulan(self):
+        self.assertEqual(Periode.bulan(date(2024, 1, 31)), Periode(date(2024, 1, 1), date(2024, 2, 1)))
+        self.assertEqual(Periode.bulan(date(2024, 2, 29)), Periode(date(2024, 2, 1), date(2024, 3, 1)))
+        self.assertEqual(Periode.bulan(date(2024, 12, 1)), Periode(date(2024, 12, 1), date(2025, 1, 1)))
+
+    def test_antara_termasuk_tanggal_akhir(self):
+        self.assertEqual(Periode.antara(date(2024, 3, 1), date(2024, 3, 7)), Periode(date(2024, 3, 1), date(2024, 3, 8)))
+
+    def test_batas_waktu_dari_tengah_malam_lokal(self):
+        awal, akhir = Periode.hari(date(2024, 3, 15)).batas_waktu()
+        self.assertEqual(awal, lokal(date(2024, 3, 15)))
+        self.assertEqual(akhir - awal, timedelta(days=1))
+        # Tengah malam di Asia/Jakarta (UTC+7) masih tanggal sebelumnya di UTC
+        self.assertEqual(awal, datetime(2024, 3, 14, 17, tzinfo=dt_timezone.utc))
+
+
+class PeriodeQueryTests(TestCase):
+    """Filter Periode di database: batas hari dan bulan, dan SQL yang bisa memakai index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+
+    def buat(self, tanggal_dibuat=None, tanggal_janji=None):
+        konsultasi = Konsultasi.objects.create(
+            user=self.user, nama='Klien', email='klien@example.com', tanggal_janji=tanggal_janji,
+            tanggal_dibuat=tanggal_dibuat or timezone.now(),
+        )
+        return konsultasi.pk
+
+    def pks_waktu(self, periode):
+        return set(Konsultasi.objects.filter(periode.q_waktu('tanggal_dibuat')).values_list('pk', flat=True))
+
+    def pks_tanggal(self, periode):
+        return set(Konsultasi.objects.filter(periode.q_tanggal('tanggal_janji')).values_list('pk', flat=True))
+
+    def test_batas_hari(self):
+        hari = date(2024, 3, 15)
+        kemarin_akhir = self.buat(lokal(hari - timedelta(days=1), SEBELUM_TENGAH_MALAM))
+        awal = self.buat(lokal(hari))
+        akhir = self.buat(lokal(hari, SEBELUM_TENGAH_MALAM))
+        besok_awal = self.buat(lokal(hari + timedelta(days=1)))
+
+        self.assertEqual(self.pks_waktu(Periode.hari(hari)), {awal, akhir})
+        self.assertEqual(self.pks_waktu(Periode.hari(hari - timedelta(days=1))), {kemarin_akhir})
+        self.assertEqual(self.pks_waktu(Periode.hari(hari + timedelta(days=1))), {besok_awal})
+
+    def test_batas_bulan(self):
+        akhir_januari = self.buat(lokal(date(2024, 1, 31), SEBELUM_TENGAH_MALAM))
+        awal_februari = self.buat(lokal(date(2024, 2, 1)))
+        akhir_februari = self.buat(lokal(date(2024, 2, 29), SEBELUM_TENGAH_MALAM))
+        awal_maret = self.buat(lokal(date(2024, 3, 1)))
+        akhir_desember = self.buat(lokal(date(2024, 12, 31), SEBELUM_TENGAH_MALAM))
+        awal_januari = self.buat(lokal(date(2025, 1, 1)))
+
+        self.assertEqual(self.pks_waktu(Periode.bulan(date(2024, 1, 10))), {akhir_januari})
+        self.assertEqual(self.pks_waktu(Periode.bulan(date(2024, 2, 10))), {awal_februari, akhir_februari})
+        self.assertEqual(self.pks_waktu(Periode.bulan(date(2024, 3, 10))), {awal_maret})
+        self.assertEqual(self.pks_waktu(Periode.bulan(date(2024, 12, 10))), {akhir_desember})
+        self.assertEqual(self.pks_waktu(Periode.bulan(date(2025, 1, 10))), {awal_januari})
+
+    def test_tanggal_lokal_bukan_utc(self):
+        # 00:30 WIB tanggal 15 adalah 17:30 UTC tanggal 14
+        lewat_tengah_malam = self.buat(datetime(2024, 3, 14, 17, 30, tzinfo=dt_timezone.utc))
+        self.assertEqual(self.pks_waktu(Periode.hari(date(2024, 3, 15))), {lewat_tengah_malam})
+        self.assertEqual(self.pks_waktu(Periode.hari(date(2024, 3, 14))), set())
+
+    def test_q_tanggal_date_field(self):
+        akhir_februari = self.buat(tanggal_janji=date(2024, 2, 29))
+        awal_maret = self.buat(tanggal_janji=date(2024, 3, 1))
+        tujuh_maret = self.buat(tanggal_janji=date(2024, 3, 7))
+        delapan_maret = self.buat(tanggal_janji=date(2024, 3, 8))
+
+        self.assertEqual(self.pks_tanggal(Periode.bulan(date(2024, 2, 1))), {akhir_februari})
+        self.assertEqual(self.pks_tanggal(Periode.hari(date(2024, 3, 1))), {awal_maret})
+        self.assertEqual(
+            self.pks_tanggal(Periode.antara(date(2024, 3, 1), date(2024, 3, 7))), {awal_maret, tujuh_maret},
+        )
+        self.assertNotIn(delapan_maret, self.pks_tanggal(Periode.antara(date(2024, 3, 1), date(2024, 3, 7))))
+
+    def test_sql_tanpa_fungsi_pada_kolom(self):
+        hari = Periode.hari()
+        querysets = [
+            Konsultasi.objects.filter(hari.q_waktu('tanggal_dibuat'), user=self.user),
+            Konsultasi.objects.filter(hari.q_tanggal('tanggal_janji'), user=self.user),
+            Klien.objects.filter(Periode.bulan().q_waktu('kontak_pertama'), user=self.user),
+        ]
+        for queryset in querysets:
+            sql = str(queryset.query)
+            self.assertIsNone(FUNGSI_TANGGAL.search(sql), sql)
+        # Pembanding: lookup __date memang membungkus kolom dengan fungsi
+        sql_date = str(Konsultasi.objects.filter(tanggal_dibuat__date=hari.mulai).query)
+        self.assertIsNotNone(FUNGSI_TANGGAL.search(sql_date), sql_date)
+
+    def test_explain_memakai_index_untuk_rentang(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("Format EXPLAIN QUERY PLAN khusus SQLite.")
+        plan = Konsultasi.objects.filter(
+            Periode.bulan().q_waktu('tanggal_dibuat'), user=self.user,
+        ).values('pk').explain()
+        self.assertIn('konsultasi_user_dibuat', plan)
+        self.assertIn('tanggal_dibuat>?', plan)
+        self.assertIn('tanggal_dibuat<?', plan)
+
+    def test_view_tidak_membungkus_kolom_tanggal(self):
+        self.buat(lokal(timezone.localdate()), tanggal_janji=timezone.localdate())
+        self.client.force_login(self.user)
+        hari_ini = timezone.localdate().isoformat()
+        for url in (
+            '/accounts/dashboard/',
+            '/accounts/reports/',
+            f'/accounts/appointments/?dari={hari_ini}&sampai={hari_ini}',
+            f'/accounts/schedule/?dari={hari_ini}&sampai={hari_ini}',
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            for query in queries:
+                self.assertIsNone(FUNGSI_TANGGAL.search(query['sql']), f"{url}: {query['sql']}")
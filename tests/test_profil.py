@@ -0,0 +1,69 @@
+# accounts/tests/test_profil.py
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from accounts.models import Profile, get_profile
+
+DATA_PROFIL = {
+    'first_name': 'Sari', 'last_name': 'Wulan', 'email': 'konsultan@example.com',
+    'alamat': '', 'nomor_telepon': '', 'bio': '', 'tanggal_lahir': '', 'jenis_kelamin': '',
+    'jam_mulai_kerja': '09:00', 'jam_selesai_kerja': '17:00', 'durasi_slot': 60,
+    'hari_kerja': ['0', '1', '2', '3', '4'],
+}
+
+
+class JumlahQueryProfilTests(TestCase):
+    """Login dan simpan User tidak menyentuh Profile; ubah profil hanya menulis yang berubah."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'konsultan', 'konsultan@example.com', 'rahasia123', first_name='Sari', last_name='Wulan',
+        )
+        Profile.objects.create(user=cls.user)
+
+    def tabel_profil_disentuh(self, queries):
+        return [query['sql'] for query in queries if 'accounts_profile' in query['sql']]
+
+    def test_login(self):
+        # User, cek kunci session baru, INSERT session, UPDATE last_login, UPDATE session
+        # (ditambah SAVEPOINT/RELEASE dari TestCase untuk dua transaksi session)
+        with self.assertNumQueries(9) as queries:
+            response = self.client.post('/accounts/login/', {'username': 'konsultan', 'password': 'rahasia123'})
+        self.assertRedirects(response, '/accounts/dashboard/', fetch_redirect_response=False)
+        self.assertEqual(self.tabel_profil_disentuh(queries), [])
+
+    def test_simpan_user_tidak_menulis_profil(self):
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=['first_name'])
+
+    def test_update_profile_tanpa_perubahan(self):
+        self.client.force_login(self.user)
+        # Session, user, profil; tidak ada UPDATE
+        with self.assertNumQueries(3):
+            response = self.client.post('/accounts/profile/update/', DATA_PROFIL)
+        self.assertRedirects(response, '/accounts/profile/', fetch_redirect_response=False)
+
+    def test_update_profile_hanya_user_berubah(self):
+        self.client.force_login(self.user)
+        with self.assertNumQueries(4) as queries:
+            self.client.post('/accounts/profile/update/', {**DATA_PROFIL, 'first_name': 'Dewi'})
+        # Hanya field yang berubah yang ditulis
+        self.assertIn('SET "first_name"', queries[-1]['sql'])
+        self.assertNotIn('"last_name"', queries[-1]['sql'])
+        self.assertEqual(self.tabel_profil_disentuh(queries[3:]), [])
+
+    def test_update_profile_jam_kerja(self):
+        self.client.force_login(self.user)
+        # Session, user, profil, UPDATE profil, lalu dua query menaikkan versi data (dashboard_cache)
+        with self.assertNumQueries(6) as queries:
+            self.client.post('/accounts/profile/update/', {**DATA_PROFIL, 'durasi_slot': 30})
+        self.assertIn('SET "durasi_slot"', queries[3]['sql'])
+        self.assertEqual(Profile.objects.get(user=self.user).durasi_slot, 30)
+
+    def test_get_profile_dibuat_sekali(self):
+        user = User.objects.create_user('baru', 'baru@example.com', 'rahasia123')
+        profile = get_profile(user)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_profile(user), profile)
+        self.assertEqual(Profile.objects.filter(user=user).count(), 1)
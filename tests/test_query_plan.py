@@ -0,0 +1,105 @@
+# accounts/tests/test_query_plan.py
+import re
+from datetime import time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts import dashboard_cache
+from accounts.antrean import klaim_berikutnya
+from accounts.arsip import arsipkan
+from accounts.models import Klien, Konsultasi, KonsultasiArsip, StatistikHarian
+from accounts.statistik import hitung_ulang_hari
+
+# Tabel yang tumbuh bersama jumlah konsultasi; query ke tabel ini harus lewat index
+TABEL_BESAR = {model._meta.db_table for model in (Konsultasi, KonsultasiArsip, Klien, StatistikHarian)}
+SCAN_TABEL = re.compile(r'\bSCAN (\w+)')
+
+
+@override_settings(DASHBOARD_CACHE_TIMEOUT=0)
+class QueryPlanTests(TestCase):
+    """
+    EXPLAIN QUERY PLAN untuk SQL yang benar-benar dijalankan oleh view konsultan, pembaruan
+    StatistikHarian, antrean, dan arsip (ditangkap saat berjalan, bukan disalin dari views.py).
+    Gagal jika ada query yang membaca seluruh tabel besar atau mengurutkan tanpa index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        hari_ini = timezone.localdate()
+        for i in range(10):
+            Konsultasi.objects.create(
+                user=cls.user, nama=f'Klien {i}', email=f'klien{i}@example.com',
+                status='terjadwal' if i % 2 else 'selesai',
+                tanggal_janji=hari_ini + timedelta(days=i % 3), waktu_janji=time(9 + i),
+            )
+            Konsultasi.objects.create(nama=f'Publik {i}', email=f'publik{i}@example.com')
+
+    def setUp(self):
+        # Cache LocMem bertahan antar test, sedangkan pk user dan versi datanya bisa sama
+        dashboard_cache.get_cache().clear()
+        self.client.force_login(self.user)
+
+    def masalah_plan(self, sql, hasil_kecil=False):
+        """
+        Baris plan yang membaca seluruh tabel besar atau butuh sort tanpa index. Dengan
+        `hasil_kecil`, sort diizinkan karena WHERE sudah membatasi ke beberapa baris lewat index.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = [baris[-1] for baris in cursor.fetchall()]
+        # Mengurutkan hasil agregasi (GROUP BY) memang butuh sort, tapi jumlah barisnya kecil
+        berkelompok = ' GROUP BY ' in sql or hasil_kecil
+        return [
+            baris for baris in plan
+            if (match := SCAN_TABEL.match(baris)) and match.group(1) in TABEL_BESAR
+            or ('USE TEMP B-TREE FOR ORDER BY' in baris and not berkelompok)
+        ]
+
+    def periksa(self, nama, fungsi, hasil_kecil=False):
+        with CaptureQueriesContext(connection) as queries:
+            fungsi()
+        select = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and any(t in q['sql'] for t in TABEL_BESAR)]
+        self.assertTrue(select, f"{nama}: tidak ada query yang ditangkap")
+        for sql in select:
+            with self.subTest(nama=nama, sql=sql):
+                self.assertEqual(self.masalah_plan(sql, hasil_kecil), [])
+
+    def test_view_konsultan(self):
+        hari_ini = timezone.localdate().isoformat()
+        for nama, query_string in (
+            ('dashboard', ''),
+            ('clients', ''),
+            ('appointments', ''),
+            ('appointments', '?tanpa_tanggal=1'),
+            ('schedule', f'?dari={hari_ini}&sampai={hari_ini}'),
+            ('reports', ''),
+            ('pending_consultations', ''),
+        ):
+            self.periksa(nama + query_string, lambda: self.client.get(reverse(nama) + query_string))
+
+    def test_statistik_harian(self):
+        self.periksa('hitung_ulang_hari', lambda: hitung_ulang_hari(self.user.pk, timezone.localdate()))
+
+    def test_antrean(self):
+        self.periksa('klaim_berikutnya', lambda: klaim_berikutnya(self.user, 3))
+
+    def test_arsip(self):
+        self.periksa('arsipkan', lambda: arsipkan(umur_hari=0, batch_size=5))
+
+    def test_pencarian_admin_arsip(self):
+        arsipkan(umur_hari=0)
+        arsip = KonsultasiArsip.objects.order_by('pk').first()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'rahasia'))
+        url = reverse('admin:accounts_konsultasiarsip_changelist')
+        for q, diharapkan in ((arsip.email.upper(), [arsip.pk]), (str(arsip.pk), [arsip.pk]), ('Klien', [])):
+            with self.subTest(q=q):
+                response = self.client.get(url, {'q': q})
+                self.assertEqual([obj.pk for obj in response.context['cl'].result_list], diharapkan)
+                # Yang dicegah adalah SCAN tabel arsip; baris satu email/ID cukup diurutkan di memori
+                self.periksa(f'admin arsip ?q={q}', lambda: self.client.get(url, {'q': q}), hasil_kecil=True)
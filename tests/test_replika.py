@@ -0,0 +1,105 @@
+# accounts/tests/test_replika.py
+import copy
+import tempfile
+import unittest
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts import dashboard_cache
+from accounts.models import Konsultasi, VersiData
+from accounts.replika import COOKIE_LENGKET, salin_sqlite_ke_replika
+
+ALIAS_REPLIKA = 'replica'
+
+
+@override_settings(REPLIKA_DB_ALIAS=ALIAS_REPLIKA)
+class RouterReplikaTests(TransactionTestCase):
+    """
+    Router replika dengan dua file SQLite: database test sebagai primary dan salinannya
+    (salin_sqlite_ke_replika) sebagai replika. Setelah disalin, satu konsultasi lagi hanya
+    ditulis ke primary, sehingga jumlah di laporan menunjukkan database mana yang dibaca.
+    """
+
+    # Dihitung ulang di setUpClass, setelah alias replika ditambahkan; test runner sendiri
+    # hanya menyiapkan database test 'default'
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        if connections[DEFAULT_DB_ALIAS].vendor != 'sqlite':
+            raise unittest.SkipTest("Test replika membutuhkan SQLite.")
+        cls._direktori = tempfile.TemporaryDirectory()
+        replika = copy.deepcopy(connections.settings[DEFAULT_DB_ALIAS])
+        replika['NAME'] = str(Path(cls._direktori.name) / 'replika.sqlite3')
+        replika['OPTIONS'].pop('transaction_mode', None)
+        # connections.settings adalah dict settings.DATABASES yang sama
+        settings.DATABASES[ALIAS_REPLIKA] = replika
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[ALIAS_REPLIKA].close()
+        del connections[ALIAS_REPLIKA]
+        del settings.DATABASES[ALIAS_REPLIKA]
+        cls._direktori.cleanup()
+
+    def setUp(self):
+        self.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        for i in range(2):
+            Konsultasi.objects.create(user=self.user, nama=f'Klien {i}', email=f'klien{i}@example.com')
+        salin_sqlite_ke_replika()
+        # Replika tertinggal satu konsultasi dari primary
+        Konsultasi.objects.create(user=self.user, nama='Klien 2', email='klien2@example.com')
+        self.client.force_login(self.user)
+
+    def laporan(self, method='get'):
+        """Membuka laporan; mengembalikan (total konsultasi bulan ini, jumlah query di replika)."""
+        with CaptureQueriesContext(connections[ALIAS_REPLIKA]) as queries:
+            response = getattr(self.client, method)('/accounts/reports/')
+        self.assertEqual(response.status_code, 200)
+        return response.context['total_consultations_month'], len(queries)
+
+    def test_get_membaca_replika(self):
+        total, query_replika = self.laporan()
+        self.assertEqual(total, 2)
+        self.assertGreater(query_replika, 0)
+
+    def test_lengket_ke_primary_setelah_menulis(self):
+        response = self.client.post('/accounts/consultation/', {
+            'name': 'Pengunjung', 'email': 'pengunjung@example.com', 'message': 'Halo',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(COOKIE_LENGKET, response.cookies)
+
+        total, query_replika = self.laporan()
+        self.assertEqual(total, 3)
+        self.assertEqual(query_replika, 0)
+
+        # Setelah cookie kedaluwarsa, baca kembali ke replika
+        del self.client.cookies[COOKIE_LENGKET]
+        total, query_replika = self.laporan()
+        self.assertEqual(total, 2)
+        self.assertGreater(query_replika, 0)
+
+    def test_selain_get_memakai_primary(self):
+        total, query_replika = self.laporan(method='post')
+        self.assertEqual(total, 3)
+        self.assertEqual(query_replika, 0)
+
+    def test_etag_dari_versi_primary(self):
+        versi_replika = VersiData.objects.using(ALIAS_REPLIKA).get(user=self.user).versi
+        versi_primary = VersiData.objects.get(user=self.user).versi
+        self.assertGreater(versi_primary, versi_replika)
+
+        with CaptureQueriesContext(connections[ALIAS_REPLIKA]) as queries:
+            response = self.client.get('/accounts/reports/')
+        self.assertGreater(len(queries), 0)
+        self.assertEqual(
+            response.context['api_etag'], dashboard_cache.etag('reports', self.user.pk, versi=versi_primary),
+        )
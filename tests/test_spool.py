@@ -0,0 +1,96 @@
+# accounts/tests/test_spool.py
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts import spool_konsultasi
+from accounts.models import Konsultasi
+from accounts.pencarian import cari_konsultasi, fts_tersedia
+
+
+class KoneksiPutus:
+    """Koneksi spool yang gagal saat menghapus batch: proses berhenti setelah commit database utama."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, *args):
+        if sql.startswith('DELETE'):
+            raise RuntimeError("proses berhenti")
+        return self.conn.execute(sql, *args)
+
+
+class SpoolKonsultasiTests(TestCase):
+    """Formulir publik mode spool dan drain ke tabel Konsultasi."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = str(Path(tmp.name) / 'spool.sqlite3')
+        self.addCleanup(lambda: spool_konsultasi._local.connections.pop(self.path).close())
+        pengaturan = override_settings(KONSULTASI_INGEST_MODE='spool', KONSULTASI_SPOOL_PATH=self.path)
+        pengaturan.enable()
+        self.addCleanup(pengaturan.disable)
+
+    def kirim(self, nomor):
+        response = self.client.post('/accounts/consultation/', {
+            'name': f'Pengirim {nomor}',
+            'email': f'pengirim{nomor}@example.com',
+            'message': 'Ingin konsultasi karir.',
+        })
+        self.assertRedirects(response, '/accounts/consultation-success/', fetch_redirect_response=False)
+
+    def test_formulir_masuk_spool(self):
+        self.kirim(1)
+        self.assertEqual(spool_konsultasi.pending_count(), 1)
+        self.assertFalse(Konsultasi.objects.exists())
+
+    def test_drain_satu_insert_dengan_waktu_kirim(self):
+        dikirim = timezone.now() - timedelta(minutes=5)
+        with mock.patch('accounts.spool_konsultasi.timezone.now', return_value=dikirim):
+            self.kirim(1)
+            self.kirim(2)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(spool_konsultasi.drain(), 2)
+        # Satu INSERT berisi tanggal_dibuat asli, tanpa UPDATE tanggal_dibuat sesudahnya
+        tabel = Konsultasi._meta.db_table
+        insert = [q for q in queries if q['sql'].startswith(f'INSERT INTO "{tabel}"')]
+        update = [q for q in queries if q['sql'].startswith(f'UPDATE "{tabel}"') and 'tanggal_dibuat' in q['sql']]
+        self.assertEqual((len(insert), len(update)), (1, 0))
+
+        self.assertEqual(spool_konsultasi.pending_count(), 0)
+        self.assertEqual(
+            sorted(Konsultasi.objects.values_list('email', 'tanggal_dibuat')),
+            [('pengirim1@example.com', dikirim), ('pengirim2@example.com', dikirim)],
+        )
+        self.assertFalse(Konsultasi.objects.filter(kunci_spool__isnull=True).exists())
+        self.assertFalse(Konsultasi.objects.filter(klien__isnull=True).exists())
+        if fts_tersedia():
+            self.assertEqual(cari_konsultasi(Konsultasi.objects.all(), 'pengirim2').count(), 1)
+
+    def test_drain_ulang_setelah_berhenti_tidak_menggandakan(self):
+        for nomor in range(3):
+            self.kirim(nomor)
+
+        asli = spool_konsultasi._connect
+        with mock.patch(
+            'accounts.spool_konsultasi._connect', side_effect=lambda path=None: KoneksiPutus(asli(path)),
+        ):
+            with self.assertRaises(RuntimeError):
+                spool_konsultasi.drain()
+        # Database utama sudah commit, batch masih di spool
+        self.assertEqual(Konsultasi.objects.count(), 3)
+        self.assertEqual(spool_konsultasi.pending_count(), 3)
+
+        self.kirim(3)
+        self.assertEqual(spool_konsultasi.drain(), 1)
+        self.assertEqual(spool_konsultasi.pending_count(), 0)
+        self.assertEqual(Konsultasi.objects.count(), 4)
+        self.assertEqual(Konsultasi.objects.values('kunci_spool').distinct().count(), 4)
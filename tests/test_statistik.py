@@ -0,0 +1,116 @@
+# accounts/tests/test_statistik.py
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.antrean import klaim_konsultasi
+from accounts.arsip import arsipkan
+from accounts.models import Konsultasi, StatistikHarian
+from accounts.statistik import perbarui_statistik_konsultasi
+from accounts.transisi import ubah_status_banyak
+
+LAYANAN = 'Jenis Layanan: Konseling Karir\nPesan: Halo'
+
+
+class StatistikHarianTests(TestCase):
+    """
+    StatistikHarian yang diperbarui per perubahan (selisih) harus sama dengan hasil
+    `rebuild_statistik_harian`, yang menghitung semuanya dari awal.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        cls.lain = User.objects.create_user('lain', 'lain@example.com', 'rahasia')
+
+    def buat(self, **kwargs):
+        data = {'user': self.user, 'nama': 'Klien', 'email': 'klien@example.com', 'jenis_layanan': 'Konseling Karir'}
+        return Konsultasi.objects.create(**{**data, **kwargs})
+
+    def statistik(self):
+        return sorted(
+            StatistikHarian.objects.values(
+                'user_id', 'tanggal', 'total_dibuat', 'jumlah_pending', 'jumlah_terjadwal',
+                'jumlah_selesai', 'jumlah_dibatalkan', 'per_layanan',
+            ),
+            key=lambda row: (row['user_id'], row['tanggal']),
+        )
+
+    def assertSamaDenganHitungUlang(self):
+        bertahap = self.statistik()
+        call_command('rebuild_statistik_harian', stdout=StringIO())
+        self.assertEqual(bertahap, self.statistik())
+        return bertahap
+
+    def test_dibuat(self):
+        self.buat()
+        self.buat(status='terjadwal', jenis_layanan=None)
+        self.buat(user=None)
+        [row] = self.assertSamaDenganHitungUlang()
+        self.assertEqual((row['total_dibuat'], row['jumlah_pending'], row['jumlah_terjadwal']), (2, 1, 1))
+        self.assertEqual(row['per_layanan'], {'Konseling Karir': 1})
+
+    def test_diubah(self):
+        konsultasi = self.buat()
+        konsultasi = Konsultasi.objects.get(pk=konsultasi.pk)
+        konsultasi.jenis_layanan = 'Review CV'
+        konsultasi.nama = 'Klien Baru'
+        konsultasi.save()
+        [row] = self.assertSamaDenganHitungUlang()
+        self.assertEqual(row['per_layanan'], {'Review CV': 1})
+
+    def test_status_berubah(self):
+        konsultasi = self.buat()
+        konsultasi.status = 'terjadwal'
+        konsultasi.save()
+        konsultasi.status = 'selesai'
+        konsultasi.save()
+        [row] = self.assertSamaDenganHitungUlang()
+        self.assertEqual((row['jumlah_pending'], row['jumlah_terjadwal'], row['jumlah_selesai']), (0, 0, 1))
+
+    def test_dihapus(self):
+        tetap = self.buat()
+        Konsultasi.objects.get(pk=self.buat(status='selesai').pk).delete()
+        [row] = self.assertSamaDenganHitungUlang()
+        self.assertEqual((row['total_dibuat'], row['jumlah_selesai']), (1, 0))
+
+        tetap.delete()
+        self.assertEqual(self.assertSamaDenganHitungUlang(), [])
+
+    def test_dipindah_ke_user_lain(self):
+        konsultasi = self.buat()
+        self.buat()
+        konsultasi = Konsultasi.objects.get(pk=konsultasi.pk)
+        konsultasi.user = self.lain
+        konsultasi.save()
+        rows = self.assertSamaDenganHitungUlang()
+        self.assertEqual([(row['user_id'], row['total_dibuat']) for row in rows], [(self.user.pk, 1), (self.lain.pk, 1)])
+
+    def test_dimuat_sebagian_dihitung_ulang(self):
+        konsultasi = self.buat()
+        konsultasi = Konsultasi.objects.only('pk', 'user', 'tanggal_dibuat', 'email', 'klien').get(pk=konsultasi.pk)
+        konsultasi.status = 'dibatalkan'
+        konsultasi.save()
+        [row] = self.assertSamaDenganHitungUlang()
+        self.assertEqual((row['jumlah_pending'], row['jumlah_dibatalkan']), (0, 1))
+
+    def test_klaim_transisi_dan_arsip(self):
+        publik = self.buat(user=None, minat_karir=LAYANAN)
+        klaim_konsultasi(self.user, publik.pk)
+        ubah_status_banyak(self.user, [publik.pk], 'selesaikan')
+        self.assertSamaDenganHitungUlang()
+
+        # Arsip memindahkan baris tanpa mengubah ringkasan
+        sebelum = self.statistik()
+        arsipkan(umur_hari=0)
+        self.assertEqual(self.assertSamaDenganHitungUlang(), sebelum)
+
+    def test_perubahan_status_tanpa_membaca_konsultasi(self):
+        konsultasi = self.buat()
+        konsultasi.status = 'terjadwal'
+        with self.assertNumQueries(4) as queries:
+            perbarui_statistik_konsultasi(konsultasi)
+        # SAVEPOINT, SELECT baris StatistikHarian, UPDATE-nya, RELEASE SAVEPOINT
+        self.assertFalse([q for q in queries if Konsultasi._meta.db_table in q['sql']])
@@ -0,0 +1,83 @@
+# accounts/tests/test_transisi.py
+from datetime import date, time
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Konsultasi
+from accounts.transisi import BENTROK, BERHASIL, STATUS_TIDAK_VALID, TIDAK_DITEMUKAN, ubah_status_banyak
+
+TANGGAL = date(2030, 1, 7)
+
+
+class UbahStatusBanyakTests(TestCase):
+    """Hasil per id dari transisi status massal."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('konsultan', 'konsultan@example.com', 'rahasia')
+        cls.lain = User.objects.create_user('lain', 'lain@example.com', 'rahasia')
+
+    def buat(self, waktu=None, **kwargs):
+        data = {
+            'user': self.user, 'nama': 'Klien', 'email': 'klien@example.com',
+            'tanggal_janji': TANGGAL if waktu else None, 'waktu_janji': waktu,
+        }
+        return Konsultasi.objects.create(**{**data, **kwargs}).pk
+
+    def status(self, pk):
+        return Konsultasi.objects.values_list('status', flat=True).get(pk=pk)
+
+    def test_hasil_per_id(self):
+        pending = self.buat()
+        selesai = self.buat(status='selesai')
+        milik_lain = self.buat(user=self.lain)
+
+        hasil = ubah_status_banyak(self.user, [pending, selesai, milik_lain, 999999, pending], 'terima')
+
+        self.assertEqual(list(hasil), [pending, selesai, milik_lain, 999999])
+        self.assertEqual(hasil[pending], {'hasil': BERHASIL, 'nama': 'Klien', 'status': 'terjadwal'})
+        self.assertEqual(hasil[selesai], {'hasil': STATUS_TIDAK_VALID, 'nama': 'Klien', 'status': 'selesai'})
+        self.assertEqual(hasil[milik_lain], {'hasil': TIDAK_DITEMUKAN, 'nama': None, 'status': None})
+        self.assertEqual(hasil[999999]['hasil'], TIDAK_DITEMUKAN)
+        self.assertEqual(
+            [self.status(pk) for pk in (pending, selesai, milik_lain)], ['terjadwal', 'selesai', 'pending'],
+        )
+
+    def test_bentrok_dengan_jadwal_yang_ada(self):
+        self.buat(time(10, 0), status='terjadwal')
+        tumpang_tindih = self.buat(time(10, 30))
+        bersebelahan = self.buat(time(11, 0))
+
+        hasil = ubah_status_banyak(self.user, [tumpang_tindih, bersebelahan], 'terima')
+
+        self.assertEqual(hasil[tumpang_tindih], {'hasil': BENTROK, 'nama': 'Klien', 'status': 'pending'})
+        self.assertEqual(hasil[bersebelahan]['hasil'], BERHASIL)
+        self.assertEqual((self.status(tumpang_tindih), self.status(bersebelahan)), ('pending', 'terjadwal'))
+
+    def test_bentrok_antar_janji_dalam_permintaan(self):
+        pertama = self.buat(time(14, 0))
+        kedua = self.buat(time(14, 0), status='dibatalkan')
+
+        hasil = ubah_status_banyak(self.user, [pertama, kedua], 'terima')
+
+        self.assertEqual((hasil[pertama]['hasil'], hasil[kedua]['hasil']), (BERHASIL, BENTROK))
+        self.assertEqual((self.status(pertama), self.status(kedua)), ('terjadwal', 'dibatalkan'))
+
+    def test_status_tidak_menempati_slot_tidak_dicek_bentrok(self):
+        self.buat(time(9, 0), status='terjadwal')
+        lain = self.buat(time(9, 0))
+        self.assertEqual(ubah_status_banyak(self.user, [lain], 'batalkan')[lain]['hasil'], BERHASIL)
+
+    def test_jumlah_query_tidak_bergantung_jumlah_janji(self):
+        def jumlah_query(jumlah, jam_awal):
+            pks = [self.buat(time(jam_awal + i % 8, 0), email=f'klien{i}@example.com') for i in range(jumlah)]
+            with CaptureQueriesContext(connection) as queries:
+                ubah_status_banyak(self.user, pks, 'terima')
+            return len(queries)
+
+        # Jam berbeda per ukuran batch agar tidak saling bentrok
+        sedikit = jumlah_query(2, 0)
+        self.assertEqual(jumlah_query(8, 12), sedikit)
@@ -0,0 +1,31 @@
+# accounts/tests/utils.py
+import threading
+
+from django.db import connection
+
+
+def jalankan_bersamaan(fungsi, argumen):
+    """
+    Menjalankan fungsi(arg) untuk setiap arg di thread terpisah yang dilepas bersamaan.
+    Setiap thread memakai koneksi database sendiri; exception dari thread dilempar ulang.
+    """
+    mulai = threading.Barrier(len(argumen))
+    hasil, galat = {}, []
+
+    def kerja(arg):
+        try:
+            mulai.wait()
+            hasil[arg] = fungsi(arg)
+        except Exception as exc:
+            galat.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=kerja, args=(arg,)) for arg in argumen]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if galat:
+        raise galat[0]
+    return hasil
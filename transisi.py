@@ -0,0 +1,87 @@
+# accounts/transisi.py
+from django.db import connection, transaction
+
+from . import dashboard_cache
+from .ketersediaan import STATUS_MENEMPATI_SLOT, kunci_jadwal, saring_bentrok
+from .klien import hitung_ulang_klien
+from .models import Konsultasi
+from .statistik import selisih_statistik, terapkan_selisih
+
+# aksi: (status asal yang diizinkan, status tujuan)
+TRANSISI_STATUS = {
+    'terima': (('pending', 'dibatalkan'), 'terjadwal'),
+    'batalkan': (('pending', 'terjadwal'), 'dibatalkan'),
+    'selesaikan': (('terjadwal',), 'selesai'),
+}
+
+# Batas jumlah janji temu per permintaan transisi massal
+MAKS_TRANSISI_SEKALIGUS = 500
+
+# Hasil per id
+BERHASIL = 'berhasil'
+TIDAK_DITEMUKAN = 'tidak_ditemukan'
+STATUS_TIDAK_VALID = 'status_tidak_valid'
+BENTROK = 'bentrok'
+
+
+def ubah_status_banyak(user, pks, aksi):
+    """
+    Menerapkan transisi status `aksi` pada janji temu milik `user` dengan satu UPDATE
+    bersyarat di dalam satu transaksi. Janji yang akan dijadwalkan tetapi bentrok dengan
+    jadwal konsultan (atau dengan janji lain dalam permintaan yang sama) dilewati.
+    Mengembalikan dict {pk: {'hasil': ..., 'nama': ..., 'status': ...}} untuk setiap pk.
+
+    Jumlah query tetap, tidak bergantung pada jumlah pk: SELECT baris (terkunci), untuk
+    'terima' juga SELECT Profile dan jadwal di sekitar tanggal janji, UPDATE status, lalu
+    SELECT + UPDATE StatistikHarian dan SELECT + UPDATE (executemany) Klien.
+    """
+    status_asal, status_tujuan = TRANSISI_STATUS[aksi]
+    pks = list(dict.fromkeys(pks))[:MAKS_TRANSISI_SEKALIGUS]
+    if not pks:
+        return {}
+
+    bentrok = set()
+    with transaction.atomic():
+        if status_tujuan == STATUS_MENEMPATI_SLOT:
+            kunci_jadwal(user)
+        milik = Konsultasi.objects.filter(user=user, pk__in=pks)
+        if connection.features.has_select_for_update:
+            milik = milik.select_for_update()
+        baris = {
+            row['pk']: row
+            for row in milik.values(
+                'pk', 'nama', 'status', 'user_id', 'tanggal_dibuat', 'jenis_layanan',
+                'tanggal_janji', 'waktu_janji', 'klien_id',
+            )
+        }
+
+        valid = [pk for pk in pks if pk in baris and baris[pk]['status'] in status_asal]
+        if valid and status_tujuan == STATUS_MENEMPATI_SLOT:
+            valid, ditolak = saring_bentrok(user, [baris[pk] for pk in valid])
+            bentrok.update(ditolak)
+        if valid:
+            # Syarat status diulang di UPDATE agar tetap aman jika baris berubah sejak dibaca
+            Konsultasi.objects.filter(
+                user=user, pk__in=valid, status__in=status_asal
+            ).update(status=status_tujuan)
+
+            # QuerySet.update() tidak memicu sinyal; status hanya memengaruhi hitungan status di
+            # hari pembuatan dan status terakhir klien
+            terapkan_selisih(selisih_statistik(
+                (baris[pk], {**baris[pk], 'status': status_tujuan}) for pk in valid
+            ))
+            hitung_ulang_klien(baris[pk]['klien_id'] for pk in valid)
+            transaction.on_commit(lambda: dashboard_cache.invalidate(user.pk))
+
+    hasil = {}
+    for pk in pks:
+        row = baris.get(pk)
+        if row is None:
+            hasil[pk] = {'hasil': TIDAK_DITEMUKAN, 'nama': None, 'status': None}
+        elif pk in bentrok:
+            hasil[pk] = {'hasil': BENTROK, 'nama': row['nama'], 'status': row['status']}
+        elif row['status'] in status_asal:
+            hasil[pk] = {'hasil': BERHASIL, 'nama': row['nama'], 'status': status_tujuan}
+        else:
+            hasil[pk] = {'hasil': STATUS_TIDAK_VALID, 'nama': row['nama'], 'status': row['status']}
+    return hasil
@@ -1,9 +1,24 @@
 # konsultan_karir/urls.py
 from django.contrib import admin
 from django.urls import path, include # Pastikan 'include' diimpor
+from accounts import api as accounts_api, views as accounts_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    # Endpoint tambahan aplikasi accounts
+    path('accounts/dashboard/cache-stats/', accounts_views.dashboard_cache_stats, name='dashboard_cache_stats'),
+    path('accounts/performance/', accounts_views.performance_summary, name='performance_summary'),
+    path('accounts/appointments/bulk/', accounts_views.bulk_update_appointments, name='bulk_update_appointments'),
+    path('accounts/pending/claim-next/', accounts_views.claim_next_consultations, name='claim_next_consultations'),
+    path('accounts/search/', accounts_views.search_konsultasi, name='search_konsultasi'),
+    # Ekspor CSV/XLSX yang dialirkan (streaming)
+    path('accounts/export/konsultasi/', accounts_views.export_konsultasi, name='export_konsultasi'),
+    path('accounts/export/klien/', accounts_views.export_klien, name='export_klien'),
+    # API JSON baca-saja untuk data dashboard (mendukung ETag / If-None-Match)
+    path('accounts/api/dashboard/', accounts_api.dashboard_api, name='api_dashboard'),
+    path('accounts/api/reports/', accounts_api.reports_api, name='api_reports'),
+    path('accounts/api/appointments/', accounts_api.appointments_api, name='api_appointments'),
+    path('accounts/api/schedule/', accounts_api.schedule_api, name='api_schedule'),
     path('', include('accounts.urls')), # Ini akan mengarahkan semua URL dari accounts/urls.py untuk halaman beranda
     path('accounts/', include('accounts.urls')), # Ini akan mengarahkan semua URL dari accounts/urls.py dengan prefix /accounts/
     # Anda bisa menambahkan URL lain di sini jika ada aplikasi lain
@@ -0,0 +1,22 @@
+# konsultan_karir/urls_asgi.py
+from django.urls import include, path
+from accounts import views as accounts_views
+
+# Versi async dashboard, reports, dan halaman publik, pada path dan nama URL yang sama
+# dengan accounts/urls.py (yang dipasang di '' dan 'accounts/')
+view_async = [
+    path('', accounts_views.home_async, name='home'),
+    path('about/', accounts_views.about_async, name='about'),
+    path('contact/', accounts_views.contact_async, name='contact'),
+    path('career-services/', accounts_views.career_services_async, name='career_services'),
+    path('dashboard/', accounts_views.dashboard_async, name='dashboard'),
+    path('reports/', accounts_views.reports_async, name='reports'),
+]
+
+# URLconf yang dipakai konsultan_karir/asgi.py: view async didahulukan, URL lain sama
+# dengan konsultan_karir/urls.py. Deployment WSGI tetap memakai ROOT_URLCONF.
+urlpatterns = [
+    path('', include(view_async)),
+    path('accounts/', include(view_async)),
+    path('', include('konsultan_karir.urls')),
+]
@@ -1,11 +1,18 @@
 # accounts/views.py
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from datetime import datetime, timedelta
-from django.db.models import Count # Import Count untuk agregasi
-from collections import Counter # Untuk menghitung frekuensi item
+from django.contrib.admin.views.decorators import staff_member_required
+from django.conf import settings as django_settings # 'settings' sudah dipakai sebagai nama view
+from django.http import Http404, JsonResponse
+from django.utils.dateparse import parse_date
+from urllib.parse import urlencode
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Sum # Import Sum untuk agregasi
+from django.utils import timezone
 
 # Mengimpor SEMUA form yang dibutuhkan dari accounts.forms
 from .forms import (
@@ -17,9 +24,41 @@ from .forms import (
 )
 
 # Mengimpor model Konsultasi dan Profile
-from .models import Konsultasi, Profile
+from . import dashboard_cache, instrumentasi, spool_konsultasi
+from .cache_halaman import cache_halaman_publik
+from .ekspor import FORMAT_EKSPOR, KOLOM_KLIEN, KOLOM_KONSULTASI, response_ekspor
+from .antrean import MAKS_KLAIM_SEKALIGUS, antrean_pending, klaim_berikutnya, klaim_konsultasi
+from .models import Klien, Konsultasi, KonsultasiArsip, StatistikHarian, get_profile
+from .pagination import paginate_keyset
+from .pencarian import MAKS_HASIL, cari_konsultasi
+from .periode import Periode
+from .replika import alias_aktif, baca_dari_replika
+from .statistik import ringkasan_periode, ringkasan_status
+from .ketersediaan import cek_bentrok, kunci_jadwal, slot_kosong
+from .transisi import BENTROK, BERHASIL, TIDAK_DITEMUKAN, TRANSISI_STATUS, ubah_status_banyak
+
+# Jumlah klien per halaman di daftar klien
+CLIENTS_PAGE_SIZE = 50
+
+# Jumlah konsultasi publik per halaman di antrean pending
+PENDING_PAGE_SIZE = 50
+
+# Jumlah janji temu per halaman dan panjang default rentang tanggal (hari) di appointments/schedule
+APPOINTMENTS_PAGE_SIZE = 50
+APPOINTMENT_WINDOW_DAYS = 30
+
+# Urutan keyset janji temu dan kolom yang ditampilkan template
+APPOINTMENT_ORDER = ('tanggal_janji', 'waktu_janji', 'pk')
+APPOINTMENT_COLUMNS = ('pk', 'nama', 'tanggal_janji', 'waktu_janji', 'status')
+
+# Kolom urutan keyset untuk daftar klien; 'pk' menjadi pemecah seri
+CLIENT_SORT_FIELDS = {
+    'terbaru': ('-kontak_terakhir', '-pk'),
+    'terlama': ('kontak_terakhir', 'pk'),
+}
 
 # Tampilan untuk halaman beranda utama (landing page)
+@cache_halaman_publik
 def home(request):
     """
     Menampilkan halaman beranda.
@@ -35,8 +74,8 @@ def login_view(request):
         form = UserLoginForm(request, data=request.POST)
         if form.is_valid():
             username = form.cleaned_data.get('username')
-            password = form.cleaned_data.get('password')
-            user = authenticate(request, username=username, password=password)
+            # Form sudah menjalankan authenticate() saat validasi; jangan ulangi query dan hash password
+            user = form.get_user()
             if user is not None:
                 login(request, user)
                 messages.success(request, f"Selamat datang kembali, {username}!")
@@ -65,33 +104,36 @@ def dashboard(request):
     """
     Menampilkan dashboard konsultan dengan ringkasan data.
     """
-    # Contoh data dummy atau data yang bisa Anda ambil dari database
-    client_count = Konsultasi.objects.filter(user=request.user).values('email').distinct().count()
-    today = datetime.now().date()
-    today_appointments = Konsultasi.objects.filter(
-        user=request.user,
-        tanggal_janji=today,
-        status='terjadwal'
-    ).count()
-    new_consultations = Konsultasi.objects.filter(
-        user=request.user,
-        tanggal_dibuat__date=today,
-        status='pending'
-    ).count()
+    # Ringkasan di-cache per konsultan per versi data; versi naik saat Konsultasi miliknya berubah
+    versi = dashboard_cache.data_version(request.user.pk)
+    summary = dashboard_cache.get_dashboard_data(
+        request.user, lambda: _compute_dashboard_summary(request.user), versi=versi
+    )
+    return _render_dashboard(request, summary, versi)
 
-    # Contoh data untuk Janji Mendatang (Anda perlu menyesuaikannya dengan kebutuhan Anda)
-    upcoming_appointments = Konsultasi.objects.filter(
-        user=request.user,
-        tanggal_janji__gte=today, # Tanggal janji lebih besar atau sama dengan hari ini
-        status='terjadwal'
-    ).order_by('tanggal_janji', 'waktu_janji')[:5] # Ambil 5 janji mendatang
+# Versi async dashboard untuk deployment ASGI (lihat konsultan_karir/urls_asgi.py)
+@login_required
+async def dashboard_async(request):
+    """
+    Seperti dashboard, tetapi menunggu cache dan query tanpa menahan thread worker.
+    """
+    # request.user diganti dengan user yang sudah dimuat agar render tidak memuatnya lagi
+    request.user = user = await request.auser()
+    versi = await dashboard_cache.adata_version(user.pk)
+    summary = await dashboard_cache.aget_dashboard_data(
+        user, lambda: _acompute_dashboard_summary(user), versi=versi
+    )
+    # Template (dan request.user di dalamnya) dirender di thread sinkron
+    return await sync_to_async(_render_dashboard)(request, summary, versi)
 
+def _render_dashboard(request, summary, versi):
     # Contoh data aktivitas terkini (Anda perlu menyesuaikannya)
     # Ini masih dummy, Anda bisa membuat model ActivityLog untuk ini
+    now = timezone.now() # Aware, sama seperti tanggal_dibuat
     recent_activities = [
-        {'description': 'Konsultasi baru dari John Doe', 'time': datetime.now() - timedelta(minutes=30)},
-        {'description': 'Janji temu dengan Jane Smith dijadwalkan ulang', 'time': datetime.now() - timedelta(hours=2)},
-        {'description': 'Profil Anda diperbarui', 'time': datetime.now() - timedelta(days=1)},
+        {'description': 'Konsultasi baru dari John Doe', 'time': now - timedelta(minutes=30)},
+        {'description': 'Janji temu dengan Jane Smith dijadwalkan ulang', 'time': now - timedelta(hours=2)},
+        {'description': 'Profil Anda diperbarui', 'time': now - timedelta(days=1)},
     ]
 
     # Contoh rating rata-rata (jika Anda memiliki sistem rating)
@@ -99,46 +141,131 @@ def dashboard(request):
     avg_rating = 4.7
 
     context = {
-        'client_count': client_count,
-        'today_appointments': today_appointments,
-        'new_consultations': new_consultations,
+        **summary,
         'avg_rating': avg_rating,
-        'upcoming_appointments': upcoming_appointments,
         'recent_activities': recent_activities,
+        'api_etag': dashboard_cache.etag('dashboard', request.user.pk, versi=versi), # Polling api_dashboard dimulai dari versi ini
     }
     return render(request, 'accounts/dashboard.html', context)
 
+def _compute_dashboard_summary(user):
+    """
+    Menghitung angka ringkasan dan janji mendatang untuk dashboard konsultan.
+    """
+    klien, statistik, janji_hari_ini, janji_mendatang = _dashboard_querysets(user)
+    return {
+        'client_count': klien.count(),
+        'today_appointments': janji_hari_ini.count(),
+        'new_consultations': statistik.aggregate(n=Sum('jumlah_pending'))['n'] or 0,
+        # Janji mendatang dievaluasi menjadi list agar bisa disimpan di cache
+        'upcoming_appointments': list(janji_mendatang),
+    }
+
+async def _acompute_dashboard_summary(user):
+    """
+    Seperti _compute_dashboard_summary, lewat async ORM. Django menjalankan query async satu
+    per satu di thread sinkron request, jadi latensi satu request tetap jumlah semua query;
+    yang didapat hanya event loop yang bebas melayani request lain selama query berjalan.
+    """
+    klien, statistik, janji_hari_ini, janji_mendatang = _dashboard_querysets(user)
+    return {
+        'client_count': await klien.acount(),
+        'today_appointments': await janji_hari_ini.acount(),
+        'new_consultations': (await statistik.aaggregate(n=Sum('jumlah_pending')))['n'] or 0,
+        'upcoming_appointments': [obj async for obj in janji_mendatang],
+    }
+
+def _dashboard_querysets(user):
+    """
+    Queryset ringkasan dashboard: klien, statistik hari ini, janji hari ini, janji mendatang.
+    """
+    # Jumlah klien dibaca dari tabel Klien (index user+email), konsultasi baru hari ini
+    # dari ringkasan StatistikHarian
+    hari_ini = Periode.hari() # Hari ini menurut kalender lokal (settings.TIME_ZONE)
+    return (
+        Klien.objects.filter(user=user),
+        StatistikHarian.objects.filter(hari_ini.q_tanggal('tanggal'), user=user),
+        Konsultasi.objects.filter(
+            hari_ini.q_tanggal('tanggal_janji'),
+            user=user,
+            status='terjadwal'
+        ),
+        Konsultasi.objects.filter(
+            user=user,
+            tanggal_janji__gte=hari_ini.mulai, # Tanggal janji lebih besar atau sama dengan hari ini
+            status='terjadwal'
+        ).order_by('tanggal_janji', 'waktu_janji')[:5], # Ambil 5 janji mendatang
+    )
+
+# Statistik hit/miss cache dashboard (khusus staf)
+@staff_member_required
+def dashboard_cache_stats(request):
+    """
+    Menampilkan jumlah hit dan miss cache dashboard dalam format JSON.
+    """
+    return JsonResponse(dashboard_cache.cache_stats())
+
+# Ringkasan performa per view dari InstrumentasiMiddleware (khusus staf)
+@staff_member_required
+def performance_summary(request):
+    """
+    Menampilkan ringkasan request terakhir per view (waktu, query, render template,
+    ukuran respons, anggaran query) dari ring buffer proses ini. ?format=json untuk JSON.
+    """
+    ringkasan = instrumentasi.ringkasan()
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'views': ringkasan})
+    context = {
+        'ringkasan': ringkasan,
+        'ukuran_buffer': instrumentasi.get_buffer().maxlen,
+    }
+    return render(request, 'accounts/performance.html', context)
+
 # Tampilan untuk daftar klien (membutuhkan login)
 @login_required
+@baca_dari_replika
 def clients(request):
     """
-    Menampilkan daftar klien.
-    """
-    # Mengambil semua email unik yang terkait dengan user yang login
-    distinct_emails = Konsultasi.objects.filter(user=request.user).values_list('email', flat=True).distinct()
+    Menampilkan daftar klien dari tabel Klien: satu baris per email ternormalisasi, sama
+    dengan jumlah klien di dashboard dan isi ekspor klien. Dipaginasi dengan keyset
+    berdasarkan tanggal kontak terakhir.
+    """
+    # Urutan server-side: 'terbaru' (default) atau 'terlama'
+    sort = request.GET.get('sort', 'terbaru')
+    if sort not in CLIENT_SORT_FIELDS:
+        sort = 'terbaru'
+
+    # Konsultasi aktif terbaru klien, untuk nomor HP dan tombol Detail/Edit (index klien+tanggal_dibuat).
+    # Klien yang semua konsultasinya sudah diarsipkan tetap tampil, tanpa konsultasi aktif.
+    terbaru = Konsultasi.objects.filter(klien=OuterRef('pk')).order_by('-tanggal_dibuat', '-pk')
+    daftar_klien = Klien.objects.filter(user=request.user).only(
+        'pk', 'nama', 'email', 'status_terakhir', 'kontak_terakhir'
+    ).annotate(
+        konsultasi_pk=Subquery(terbaru.values('pk')[:1]),
+        no_hp=Subquery(terbaru.values('no_hp')[:1]),
+    )
+    page = paginate_keyset(
+        daftar_klien,
+        CLIENT_SORT_FIELDS[sort],
+        cursor=request.GET.get('cursor'),
+        page_size=CLIENTS_PAGE_SIZE,
+    )
 
     clients_list = []
-    for email in distinct_emails:
-        # Dapatkan konsultasi terbaru untuk email ini dan user yang login
-        latest_konsultasi = Konsultasi.objects.filter(
-            user=request.user,
-            email=email
-        ).order_by('-tanggal_dibuat').first() # Ambil yang terbaru
-
-        if latest_konsultasi:
-            clients_list.append({
-                'pk': latest_konsultasi.pk, # Tambahkan primary key di sini
-                'nama': latest_konsultasi.nama,
-                'email': latest_konsultasi.email,
-                'no_hp': latest_konsultasi.no_hp,
-                'jurusan': latest_konsultasi.jurusan,
-                'minat_karir': latest_konsultasi.minat_karir,
-                'terakhir_konsultasi': latest_konsultasi.tanggal_dibuat.strftime("%d %b %Y"),
-                'status_terakhir': latest_konsultasi.status,
-            })
+    for klien in page:
+        clients_list.append({
+            'pk': klien.konsultasi_pk, # Primary key konsultasi aktif terakhir klien ini (None jika diarsipkan)
+            'nama': klien.nama,
+            'email': klien.email,
+            'no_hp': klien.no_hp,
+            'terakhir_konsultasi': timezone.localtime(klien.kontak_terakhir).strftime("%d %b %Y"),
+            'status_terakhir': klien.status_terakhir,
+        })
 
     context = {
-        'clients': clients_list
+        'clients': clients_list,
+        'page': page,
+        'sort': sort,
     }
     return render(request, 'accounts/clients.html', context)
 
@@ -148,98 +275,235 @@ def clients(request):
 def appointments(request):
     """
     Menampilkan daftar janji temu.
+    Hanya janji dalam rentang tanggal yang dipilih (default: periode mendatang) yang diambil,
+    per halaman dengan keyset pagination pada (tanggal_janji, waktu_janji, pk).
+    """
+    context = _appointments_context(request)
+    context['api_etag'] = dashboard_cache.etag('appointments', request.user.pk, request.GET)
+    return render(request, 'accounts/appointments.html', context)
+
+def _appointments_context(request):
+    """
+    Data halaman janji temu; dipakai bersama oleh view HTML dan API JSON.
     """
-    # Mengambil semua janji temu untuk pengguna yang login, diurutkan berdasarkan tanggal dan waktu
-    all_appointments = Konsultasi.objects.filter(user=request.user).order_by('tanggal_janji', 'waktu_janji')
+    dari, sampai = _date_window(request)
+    tanpa_tanggal = request.GET.get('tanpa_tanggal') == '1'
+
+    # Mengambil janji temu untuk pengguna yang login, hanya kolom yang ditampilkan template
+    all_appointments = Konsultasi.objects.filter(user=request.user).only(*APPOINTMENT_COLUMNS)
+    if tanpa_tanggal:
+        all_appointments = all_appointments.filter(tanggal_janji__isnull=True)
+    else:
+        all_appointments = all_appointments.filter(Periode.antara(dari, sampai).q_tanggal('tanggal_janji'))
+
+    page = paginate_keyset(
+        all_appointments,
+        APPOINTMENT_ORDER,
+        cursor=request.GET.get('cursor'),
+        page_size=APPOINTMENTS_PAGE_SIZE,
+    )
+    return {
+        'appointments': page,
+        'page': page,
+        'dari': dari,
+        'sampai': sampai,
+        'tanpa_tanggal': tanpa_tanggal,
+        'filter_query': urlencode({'dari': dari, 'sampai': sampai, 'tanpa_tanggal': int(tanpa_tanggal)}),
+    }
+
+def _date_window(request):
+    """
+    Membaca rentang tanggal ?dari=...&sampai=... (YYYY-MM-DD) dari query string.
+    Default: hari ini sampai APPOINTMENT_WINDOW_DAYS hari ke depan.
+    """
+    def _parse(name):
+        try:
+            return parse_date(request.GET.get(name) or '')
+        except ValueError:
+            return None
+
+    dari = _parse('dari') or timezone.localdate()
+    sampai = _parse('sampai') or dari + timedelta(days=APPOINTMENT_WINDOW_DAYS)
+    if sampai < dari:
+        sampai = dari
+    return dari, sampai
+
+# Tampilan pencarian konsultasi milik konsultan (membutuhkan login)
+@login_required
+def search_konsultasi(request):
+    """
+    Mencari konsultasi milik pengguna berdasarkan nama, email, nomor HP,
+    minat karir, atau jurusan. Memakai indeks full-text dan mengembalikan
+    paling banyak MAKS_HASIL hasil paling relevan.
+    """
+    q = request.GET.get('q', '').strip()
+    hasil = []
+    if q:
+        hasil = cari_konsultasi(
+            Konsultasi.objects.filter(user=request.user), q
+        ).only('pk', 'nama', 'email', 'no_hp', 'jurusan', 'status', 'tanggal_janji', 'tanggal_dibuat')[:MAKS_HASIL]
     context = {
-        'appointments': all_appointments
+        'q': q,
+        'hasil': hasil,
+        'maks_hasil': MAKS_HASIL,
     }
-    return render(request, 'accounts/appointments.html', context)
+    return render(request, 'accounts/search.html', context)
+
+# Ekspor data konsultan ke CSV/XLSX (membutuhkan login)
+@login_required
+@baca_dari_replika
+def export_konsultasi(request):
+    """
+    Mengunduh konsultasi milik pengguna sebagai file CSV (default) atau XLSX (?format=xlsx).
+    Tanpa parameter tanggal semua konsultasi diekspor, termasuk yang sudah diarsipkan (setelah
+    konsultasi aktif); dengan ?dari/sampai/tanpa_tanggal hanya janji yang sama dengan yang
+    tampil di halaman appointments.
+    Isi file dialirkan per potongan, sehingga memori tetap konstan berapa pun jumlah barisnya.
+    """
+    # Isi respons dibaca setelah view selesai, jadi alias replika dipasang langsung di queryset
+    alias = alias_aktif()
+    rows = Konsultasi.objects.using(alias).filter(user=request.user)
+    if any(name in request.GET for name in ('dari', 'sampai', 'tanpa_tanggal')):
+        if request.GET.get('tanpa_tanggal') == '1':
+            rows = rows.filter(tanggal_janji__isnull=True)
+        else:
+            dari, sampai = _date_window(request)
+            rows = rows.filter(Periode.antara(dari, sampai).q_tanggal('tanggal_janji'))
+        rows = rows.order_by(*APPOINTMENT_ORDER)
+    else:
+        rows = [rows.order_by('pk'), KonsultasiArsip.objects.using(alias).filter(user=request.user).order_by('pk')]
+    return response_ekspor(rows, KOLOM_KONSULTASI, 'konsultasi', _format_ekspor(request))
+
+@login_required
+@baca_dari_replika
+def export_klien(request):
+    """
+    Mengunduh daftar klien pengguna dari tabel Klien (termasuk klien yang konsultasinya
+    sudah diarsipkan) sebagai CSV atau XLSX, urut dari kontak terakhir.
+    """
+    rows = Klien.objects.using(alias_aktif()).filter(user=request.user).order_by('-kontak_terakhir', '-pk')
+    return response_ekspor(rows, KOLOM_KLIEN, 'klien', _format_ekspor(request))
+
+def _format_ekspor(request):
+    format_ekspor = request.GET.get('format', 'csv')
+    return format_ekspor if format_ekspor in FORMAT_EKSPOR else 'csv'
 
 # Tampilan untuk laporan (membutuhkan login)
 @login_required
+@baca_dari_replika
 def reports(request):
     """
     Menampilkan laporan dan statistik.
     """
-    current_month = datetime.now().month
-    current_year = datetime.now().year
+    return _render_reports(request, _compute_reports(request.user))
 
-    # Total Konsultasi Bulan Ini
-    total_consultations_month = Konsultasi.objects.filter(
-        user=request.user,
-        tanggal_dibuat__month=current_month,
-        tanggal_dibuat__year=current_year
-    ).count()
+# Versi async reports untuk deployment ASGI (lihat konsultan_karir/urls_asgi.py)
+@login_required
+@baca_dari_replika
+async def reports_async(request):
+    """
+    Seperti reports, tetapi menunggu query tanpa menahan thread worker.
+    """
+    request.user = user = await request.auser()
+    context = await _acompute_reports(user)
+    return await sync_to_async(_render_reports)(request, context)
 
-    # Klien Baru Bulan Ini (berdasarkan email unik yang pertama kali muncul di bulan ini)
-    # Ini adalah contoh sederhana, mungkin perlu logika lebih kompleks untuk definisi "klien baru"
-    new_clients_month = Konsultasi.objects.filter(
-        user=request.user,
-        tanggal_dibuat__month=current_month,
-        tanggal_dibuat__year=current_year
-    ).values('email').distinct().count()
+def _render_reports(request, context):
+    context['api_etag'] = dashboard_cache.etag('reports', request.user.pk)
+    return render(request, 'accounts/reports.html', context)
 
-    # Layanan Paling Populer
-    # Ambil semua minat_karir untuk user yang login di bulan ini
-    all_minat_karir = Konsultasi.objects.filter(
-        user=request.user,
-        tanggal_dibuat__month=current_month,
-        tanggal_dibuat__year=current_year
-    ).values_list('minat_karir', flat=True)
+def _compute_reports(user):
+    """
+    Menghitung angka laporan bulan ini dan data grafik status; dipakai bersama
+    oleh view HTML dan API JSON.
+    """
+    # Angka laporan dibaca dari ringkasan StatistikHarian dan tabel Klien, bukan dari Konsultasi mentah
+    bulan_ini = Periode.bulan()
+    return _reports_context(
+        ringkasan_periode(user, bulan_ini),
+        # Klien Baru Bulan Ini (klien yang konsultasi pertamanya dengan Anda jatuh di bulan ini),
+        # dari index Klien user+kontak_pertama
+        Klien.objects.filter(bulan_ini.q_waktu('kontak_pertama'), user=user).count(),
+        ringkasan_status(user),
+    )
 
+async def _acompute_reports(user):
+    """
+    Seperti _compute_reports, lewat async ORM (lihat _acompute_dashboard_summary).
+    """
+    bulan_ini = Periode.bulan()
+    return _reports_context(
+        await sync_to_async(ringkasan_periode)(user, bulan_ini),
+        await Klien.objects.filter(bulan_ini.q_waktu('kontak_pertama'), user=user).acount(),
+        await sync_to_async(ringkasan_status)(user),
+    )
+
+def _reports_context(ringkasan, new_clients_month, consultation_status_data):
+    # Total Konsultasi Bulan Ini
+    total_consultations_month = ringkasan['total_dibuat']
+
+    # Layanan Paling Populer
     popular_service = "Tidak Ada Data"
-    if all_minat_karir:
-        # Ekstrak jenis layanan dari string minat_karir
-        service_types = []
-        for item in all_minat_karir:
-            if item and "Jenis Layanan:" in item:
-                service_name = item.split("Jenis Layanan:")[1].split("\n")[0].strip()
-                service_types.append(service_name)
-            elif item: # Jika tidak ada "Jenis Layanan:", gunakan seluruh minat_karir sebagai layanan
-                service_types.append(item.strip())
-
-        if service_types:
-            # Hitung frekuensi setiap jenis layanan
-            service_counts = Counter(service_types)
-            # Dapatkan layanan yang paling umum
-            popular_service = service_counts.most_common(1)[0][0]
+    if total_consultations_month:
+        if ringkasan['per_layanan']:
+            popular_service = min(ringkasan['per_layanan'].items(), key=lambda item: (-item[1], item[0]))[0]
         else:
             popular_service = "Tidak Ada Data Layanan"
 
-
     # Data untuk Grafik Contoh (Anda bisa menyesuaikan ini dengan data nyata)
     # Contoh: Jumlah konsultasi per status
-    consultation_status_data = Konsultasi.objects.filter(user=request.user).values('status').annotate(count=Count('status'))
-    
     # Format data untuk grafik (misalnya untuk Chart.js)
-    chart_labels = [item['status'].capitalize() for item in consultation_status_data]
-    chart_data = [item['count'] for item in consultation_status_data]
+    chart_labels = [status.capitalize() for status in consultation_status_data]
+    chart_data = list(consultation_status_data.values())
 
-    context = {
+    return {
         'total_consultations_month': total_consultations_month,
         'new_clients_month': new_clients_month,
         'popular_service': popular_service,
         'chart_labels': chart_labels, # Data untuk label grafik
         'chart_data': chart_data,   # Data untuk nilai grafik
     }
-    return render(request, 'accounts/reports.html', context)
 
 # Tampilan untuk jadwal (membutuhkan login)
 @login_required
 def schedule(request):
     """
     Menampilkan jadwal konsultan.
+    Janji terjadwal dalam rentang tanggal yang dipilih, per halaman dengan keyset pagination.
     """
-    # Anda bisa mengambil janji temu dari database di sini
-    # Untuk contoh, kita akan menampilkan semua janji temu yang terjadwal
-    scheduled_appointments = Konsultasi.objects.filter(user=request.user, status='terjadwal').order_by('tanggal_janji', 'waktu_janji')
-    context = {
-        'scheduled_appointments': scheduled_appointments
-    }
+    context = _schedule_context(request)
+    context['api_etag'] = dashboard_cache.etag('schedule', request.user.pk, request.GET)
     return render(request, 'accounts/schedule.html', context)
 
+def _schedule_context(request):
+    """
+    Data halaman jadwal; dipakai bersama oleh view HTML dan API JSON.
+    """
+    dari, sampai = _date_window(request)
+    scheduled_appointments = Konsultasi.objects.filter(
+        Periode.antara(dari, sampai).q_tanggal('tanggal_janji'),
+        user=request.user,
+        status='terjadwal',
+    ).only(*APPOINTMENT_COLUMNS, 'minat_karir')
+
+    page = paginate_keyset(
+        scheduled_appointments,
+        APPOINTMENT_ORDER,
+        cursor=request.GET.get('cursor'),
+        page_size=APPOINTMENTS_PAGE_SIZE,
+    )
+    return {
+        'scheduled_appointments': page,
+        'page': page,
+        'dari': dari,
+        'sampai': sampai,
+        'filter_query': urlencode({'dari': dari, 'sampai': sampai}),
+        # Slot kosong minggu ini (7 hari mulai dari tanggal awal rentang)
+        'slot_kosong': slot_kosong(request.user, dari, dari + timedelta(days=6)),
+    }
+
 # Tampilan untuk halaman tentang kami
+@cache_halaman_publik
 def about(request):
     """
     Menampilkan halaman tentang kami.
@@ -247,6 +511,7 @@ def about(request):
     return render(request, 'accounts/about.html')
 
 # Tampilan untuk halaman kontak
+@cache_halaman_publik
 def contact(request):
     """
     Menampilkan halaman kontak.
@@ -254,12 +519,32 @@ def contact(request):
     return render(request, 'accounts/contact.html')
 
 # Tampilan untuk halaman layanan karir
+@cache_halaman_publik
 def career_services_view(request):
     """
     Menampilkan halaman layanan karir yang tersedia.
     """
     return render(request, 'accounts/career_services.html')
 
+# Versi async halaman publik untuk deployment ASGI (lihat konsultan_karir/urls_asgi.py): cache hit
+# dilayani langsung di event loop. Template tetap dirender di thread sinkron karena navbar
+# bisa membaca request.user.
+@cache_halaman_publik
+async def home_async(request):
+    return await sync_to_async(render)(request, 'accounts/home.html')
+
+@cache_halaman_publik
+async def about_async(request):
+    return await sync_to_async(render)(request, 'accounts/about.html')
+
+@cache_halaman_publik
+async def contact_async(request):
+    return await sync_to_async(render)(request, 'accounts/contact.html')
+
+@cache_halaman_publik
+async def career_services_async(request):
+    return await sync_to_async(render)(request, 'accounts/career_services.html')
+
 # Tampilan untuk formulir konsultasi publik
 def consultation_form_view(request, service_name=None):
     """
@@ -274,18 +559,16 @@ def consultation_form_view(request, service_name=None):
     if request.method == 'POST':
         form = ConsultationForm(request.POST)
         if form.is_valid():
+            fields = _konsultasi_fields_from_form(form.cleaned_data)
+            if getattr(django_settings, 'KONSULTASI_INGEST_MODE', 'langsung') == 'spool':
+                # Mode throughput tinggi: simpan ke spool lokal, dipindahkan ke database
+                # oleh `manage.py drain_konsultasi_spool`. Halaman sukses sudah cukup
+                # sebagai konfirmasi, jadi tidak ada pesan yang ditulis ke storage.
+                spool_konsultasi.enqueue(fields)
+                return redirect('consultation_success')
+
             # Simpan data ke model Konsultasi
-            Konsultasi.objects.create(
-                user=None, # Karena ini konsultasi publik, tidak ada user yang login
-                nama=form.cleaned_data['name'],
-                email=form.cleaned_data['email'],
-                no_hp=form.cleaned_data['phone_number'],
-                # Gabungkan service_type dan message ke minat_karir
-                minat_karir=f"Jenis Layanan: {form.cleaned_data['service_type'] or 'Tidak Specified'}\nPesan: {form.cleaned_data['message']}",
-                tanggal_janji=form.cleaned_data['tanggal_janji'],
-                waktu_janji=form.cleaned_data['waktu_janji'],
-                status='pending' # Status awal selalu pending
-            )
+            Konsultasi.objects.create(**fields)
             messages.success(request, "Permintaan konsultasi Anda telah berhasil dikirim!")
             return redirect('consultation_success')
         else:
@@ -299,6 +582,23 @@ def consultation_form_view(request, service_name=None):
     }
     return render(request, 'accounts/consultation_form.html', context)
 
+def _konsultasi_fields_from_form(cleaned_data):
+    """
+    Mengubah data ConsultationForm yang valid menjadi field Konsultasi.
+    """
+    return {
+        'user': None, # Karena ini konsultasi publik, tidak ada user yang login
+        'nama': cleaned_data['name'],
+        'email': cleaned_data['email'],
+        'no_hp': cleaned_data['phone_number'],
+        'jenis_layanan': cleaned_data['service_type'] or None,
+        # Gabungkan service_type dan message ke minat_karir
+        'minat_karir': f"Jenis Layanan: {cleaned_data['service_type'] or 'Tidak Specified'}\nPesan: {cleaned_data['message']}",
+        'tanggal_janji': cleaned_data['tanggal_janji'],
+        'waktu_janji': cleaned_data['waktu_janji'],
+        'status': 'pending', # Status awal selalu pending
+    }
+
 # Tampilan untuk halaman sukses konsultasi
 def consultation_success_view(request):
     """
@@ -314,10 +614,8 @@ def create_konsultasi(request):
     """
     if request.method == 'POST':
         form = OriginalKonsultasiForm(request.POST)
-        if form.is_valid():
-            konsultasi = form.save(commit=False)
-            konsultasi.user = request.user # Kaitkan konsultasi dengan pengguna yang login
-            konsultasi.save()
+        if form.is_valid() and _simpan_tanpa_bentrok(request.user, form):
+            konsultasi = form.instance
             messages.success(request, "Konsultasi baru berhasil ditambahkan!")
             return redirect('detail_konsultasi', pk=konsultasi.pk)
         else:
@@ -326,6 +624,24 @@ def create_konsultasi(request):
         form = OriginalKonsultasiForm()
     return render(request, 'accounts/create_konsultasi.html', {'form': form})
 
+def _simpan_tanpa_bentrok(user, form):
+    """
+    Menyimpan KonsultasiForm milik `user` jika janji terjadwalnya tidak bentrok dengan
+    jadwal lain. Jika bentrok, menambahkan error ke field waktu_janji dan mengembalikan False.
+    """
+    data = form.cleaned_data
+    with transaction.atomic():
+        if data.get('status') == 'terjadwal':
+            kunci_jadwal(user)
+            bentrok = cek_bentrok(user, data.get('tanggal_janji'), data.get('waktu_janji'), kecuali_pk=form.instance.pk)
+            if bentrok is not None:
+                form.add_error('waktu_janji', f"Bentrok dengan janji temu lain pada {bentrok:%d %b %Y %H:%M}.")
+                return False
+        konsultasi = form.save(commit=False)
+        konsultasi.user = user # Kaitkan konsultasi dengan pengguna yang login
+        konsultasi.save()
+    return True
+
 # Tampilan untuk detail konsultasi (membutuhkan login)
 @login_required
 def detail_konsultasi(request, pk):
@@ -345,8 +661,7 @@ def update_konsultasi(request, pk):
     konsultasi = get_object_or_404(Konsultasi, pk=pk, user=request.user)
     if request.method == 'POST':
         form = OriginalKonsultasiForm(request.POST, instance=konsultasi)
-        if form.is_valid():
-            form.save()
+        if form.is_valid() and _simpan_tanpa_bentrok(request.user, form):
             messages.success(request, "Konsultasi berhasil diperbarui!")
             return redirect('detail_konsultasi', pk=konsultasi.pk)
         else:
@@ -383,7 +698,7 @@ def profile(request):
     Menampilkan halaman profil pengguna.
     """
     # Pastikan objek profil ada untuk pengguna saat ini
-    profile_obj, created = Profile.objects.get_or_create(user=request.user)
+    profile_obj = get_profile(request.user)
 
     context = {
         'user_profile': {
@@ -404,15 +719,20 @@ def update_profile(request):
     """
     Menangani pembaruan informasi profil pengguna.
     """
-    profile_obj, created = Profile.objects.get_or_create(user=request.user)
+    profile_obj = get_profile(request.user)
 
     if request.method == 'POST':
         user_form = UserUpdateForm(request.POST, instance=request.user)
         profile_form = ProfileForm(request.POST, instance=profile_obj)
 
         if user_form.is_valid() and profile_form.is_valid():
-            user_form.save()
-            profile_form.save()
+            # Hanya tulis field yang benar-benar berubah ke database
+            if user_form.has_changed():
+                user_form.save(commit=False).save(update_fields=user_form.changed_data)
+            if profile_form.has_changed():
+                profile_form.save(commit=False).save(update_fields=profile_form.changed_data)
+                # Jam kerja memengaruhi slot kosong di jadwal dan API
+                dashboard_cache.invalidate(request.user.pk)
             messages.success(request, "Profil Anda berhasil diperbarui!")
             return redirect('profile')
         else:
@@ -431,11 +751,18 @@ def update_profile(request):
 def pending_consultations(request):
     """
     Menampilkan daftar konsultasi publik yang belum ditugaskan (user=None)
-    dan berstatus 'pending'.
-    """
-    pending_list = Konsultasi.objects.filter(user__isnull=True, status='pending').order_by('tanggal_dibuat')
+    dan berstatus 'pending', per halaman dengan keyset pagination.
+    """
+    page = paginate_keyset(
+        antrean_pending(),
+        ('tanggal_dibuat', 'pk'),
+        cursor=request.GET.get('cursor'),
+        page_size=PENDING_PAGE_SIZE,
+    )
     context = {
-        'pending_consultations': pending_list
+        'pending_consultations': page,
+        'page': page,
+        'max_claim': MAKS_KLAIM_SEKALIGUS,
     }
     return render(request, 'accounts/pending_consultations.html', context)
 
@@ -444,31 +771,68 @@ def assign_consultation(request, pk):
     """
     Menugaskan konsultasi publik tertentu kepada konsultan yang sedang login
     dan mengubah statusnya menjadi 'terjadwal'.
+    Klaim dilakukan dengan UPDATE bersyarat sehingga aman dari klaim ganda.
     """
-    konsultasi = get_object_or_404(Konsultasi, pk=pk, user__isnull=True, status='pending')
     if request.method == 'POST':
-        konsultasi.user = request.user
-        konsultasi.status = 'terjadwal'
-        konsultasi.save()
+        konsultasi = klaim_konsultasi(request.user, pk)
+        if konsultasi is None:
+            konsultasi = get_object_or_404(Konsultasi, pk=pk) # 404 jika konsultasi memang tidak ada
+            if konsultasi.user_id is None and konsultasi.status == 'pending':
+                # Masih tersedia, berarti ditolak karena bentrok dengan jadwal konsultan
+                messages.warning(request, f"Konsultasi dari {konsultasi.nama} bentrok dengan janji temu lain di jadwal Anda.")
+            else:
+                messages.warning(request, "Konsultasi ini sudah diambil oleh konsultan lain atau tidak lagi pending.")
+            return redirect('pending_consultations')
         messages.success(request, f"Konsultasi dari {konsultasi.nama} berhasil ditugaskan kepada Anda dan dijadwalkan!")
         return redirect('pending_consultations') # Kembali ke daftar pending
     # Jika bukan POST request, mungkin redirect atau tampilkan error
     messages.error(request, "Metode tidak diizinkan untuk penugasan konsultasi.")
     return redirect('pending_consultations') # Atau ke halaman detail konsultasi jika ada
 
+@login_required
+def claim_next_consultations(request):
+    """
+    Mengambil N konsultasi publik terlama dari antrean sekaligus (POST field 'jumlah').
+    Mengembalikan JSON jika diminta dengan header Accept: application/json.
+    """
+    if request.method != 'POST':
+        messages.error(request, "Metode tidak diizinkan untuk pengambilan konsultasi.")
+        return redirect('pending_consultations')
+
+    try:
+        jumlah = int(request.POST.get('jumlah', 1))
+    except (TypeError, ValueError):
+        jumlah = 1
+    klaim = klaim_berikutnya(request.user, jumlah)
+
+    if request.headers.get('Accept', '').startswith('application/json'):
+        return JsonResponse({
+            'claimed': [{'pk': konsultasi.pk, 'nama': konsultasi.nama} for konsultasi in klaim],
+        })
+
+    if klaim:
+        messages.success(request, f"{len(klaim)} konsultasi berhasil ditugaskan kepada Anda dan dijadwalkan!")
+    else:
+        messages.info(request, "Tidak ada konsultasi pending yang bisa diambil saat ini.")
+    return redirect('pending_consultations')
+
 # Tampilan untuk membatalkan janji temu (membutuhkan login)
 @login_required
 def cancel_appointment(request, pk):
     """
     Menangani pembatalan janji temu tertentu.
     """
-    konsultasi = get_object_or_404(Konsultasi, pk=pk, user=request.user)
     if request.method == 'POST':
-        konsultasi.status = 'dibatalkan' # Ubah status menjadi dibatalkan
-        konsultasi.save()
-        messages.success(request, f"Janji temu dengan {konsultasi.nama} berhasil dibatalkan.")
+        hasil = ubah_status_banyak(request.user, [pk], 'batalkan')[pk]
+        if hasil['hasil'] == TIDAK_DITEMUKAN:
+            raise Http404("Konsultasi tidak ditemukan.")
+        if hasil['hasil'] == BERHASIL:
+            messages.success(request, f"Janji temu dengan {hasil['nama']} berhasil dibatalkan.")
+        else:
+            messages.warning(request, "Janji temu ini tidak dapat dibatalkan karena statusnya sudah 'selesai' atau 'dibatalkan'.")
         return redirect('appointments') # Kembali ke daftar janji temu
     # Jika bukan POST request, mungkin redirect atau tampilkan error
+    get_object_or_404(Konsultasi, pk=pk, user=request.user)
     messages.error(request, "Metode tidak diizinkan untuk pembatalan janji temu.")
     return redirect('appointments')
 
@@ -479,18 +843,62 @@ def accept_appointment(request, pk):
     Menangani penerimaan/persetujuan janji temu tertentu.
     Mengubah status menjadi 'terjadwal'.
     """
-    # Hanya izinkan menerima janji temu yang masih 'pending' atau 'dibatalkan' (jika ingin bisa diaktifkan kembali)
-    # Sesuaikan query sesuai logika bisnis Anda
-    konsultasi = get_object_or_404(Konsultasi, pk=pk, user=request.user)
+    # Hanya izinkan menerima janji temu yang masih 'pending' atau 'dibatalkan' (lihat TRANSISI_STATUS)
     if request.method == 'POST':
-        # Pastikan hanya status tertentu yang bisa diterima
-        if konsultasi.status == 'pending' or konsultasi.status == 'dibatalkan':
-            konsultasi.status = 'terjadwal' # Ubah status menjadi terjadwal
-            konsultasi.save()
-            messages.success(request, f"Janji temu dengan {konsultasi.nama} berhasil diterima dan dijadwalkan!")
-            return redirect('appointments') # Kembali ke daftar janji temu
+        hasil = ubah_status_banyak(request.user, [pk], 'terima')[pk]
+        if hasil['hasil'] == TIDAK_DITEMUKAN:
+            raise Http404("Konsultasi tidak ditemukan.")
+        if hasil['hasil'] == BERHASIL:
+            messages.success(request, f"Janji temu dengan {hasil['nama']} berhasil diterima dan dijadwalkan!")
+        elif hasil['hasil'] == BENTROK:
+            messages.warning(request, f"Janji temu dengan {hasil['nama']} bentrok dengan janji temu lain yang sudah terjadwal.")
         else:
             messages.warning(request, "Janji temu ini tidak dapat diterima karena statusnya bukan 'pending' atau 'dibatalkan'.")
-            return redirect('appointments')
+        return redirect('appointments') # Kembali ke daftar janji temu
+    get_object_or_404(Konsultasi, pk=pk, user=request.user)
     messages.error(request, "Metode tidak diizinkan untuk penerimaan janji temu.")
     return redirect('appointments')
+
+# Tampilan untuk mengubah status banyak janji temu sekaligus (membutuhkan login)
+@login_required
+def bulk_update_appointments(request):
+    """
+    Menerapkan satu aksi ('terima', 'batalkan', 'selesaikan') pada banyak janji temu
+    (POST field 'aksi' dan 'pks') dalam satu transaksi.
+    Mengembalikan hasil per id sebagai JSON jika diminta dengan header Accept: application/json.
+    """
+    if request.method != 'POST':
+        messages.error(request, "Metode tidak diizinkan untuk perubahan status massal.")
+        return redirect('appointments')
+
+    aksi = request.POST.get('aksi')
+    pks = []
+    for value in request.POST.getlist('pks'):
+        try:
+            pks.append(int(value))
+        except ValueError:
+            continue
+    wants_json = request.headers.get('Accept', '').startswith('application/json')
+
+    if aksi not in TRANSISI_STATUS:
+        if wants_json:
+            return JsonResponse({'error': "Aksi tidak dikenal."}, status=400)
+        messages.error(request, "Aksi tidak dikenal.")
+        return redirect('appointments')
+
+    hasil = ubah_status_banyak(request.user, pks, aksi)
+    if wants_json:
+        return JsonResponse({'aksi': aksi, 'results': {str(pk): row for pk, row in hasil.items()}})
+
+    berhasil = sum(1 for row in hasil.values() if row['hasil'] == BERHASIL)
+    bentrok = sum(1 for row in hasil.values() if row['hasil'] == BENTROK)
+    gagal = len(hasil) - berhasil - bentrok
+    if berhasil:
+        messages.success(request, f"{berhasil} janji temu berhasil diperbarui.")
+    if bentrok:
+        messages.warning(request, f"{bentrok} janji temu dilewati karena bentrok dengan jadwal Anda.")
+    if gagal:
+        messages.warning(request, f"{gagal} janji temu dilewati karena tidak ditemukan atau statusnya tidak sesuai.")
+    if not hasil:
+        messages.info(request, "Tidak ada janji temu yang dipilih.")
+    return redirect('appointments')